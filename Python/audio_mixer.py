@@ -0,0 +1,154 @@
+"""
+Audio Mixer Module
+Streams the voice WAVs into the master audio track in fixed-size blocks.
+Memory use depends on the block size, not on the program length.
+"""
+
+import math
+import time
+import numpy as np
+import soundfile as sf
+
+class _ClipReader:
+    """Reads one voice file block by block, resampled to the mixer rate."""
+
+    def __init__(self, path, start_frame, out_rate):
+        self.file = sf.SoundFile(path)
+        self.src_rate = self.file.samplerate
+        self.channels = self.file.channels
+        self.start_frame = start_frame
+        self.resample = self.src_rate != out_rate
+        self.ratio = self.src_rate / out_rate
+        self.length = int(math.ceil(self.file.frames / self.ratio))
+        self.end_frame = start_frame + self.length
+
+    def read(self, k0, k1):
+        """Returns output frames [k0, k1) relative to the clip start as float32 (n, channels)."""
+        if not self.resample:
+            # Same rate: plain block read
+            self.file.seek(k0)
+            return self.file.read(k1 - k0, dtype='float32', always_2d=True)
+
+        # Different rate: linear interpolation over the source window for this block
+        pos = np.arange(k0, k1, dtype=np.float64) * self.ratio
+        s0 = int(pos[0])
+        s1 = min(self.file.frames, int(pos[-1]) + 2)
+        if s1 <= s0:
+            return np.zeros((k1 - k0, self.channels), dtype=np.float32)
+        self.file.seek(s0)
+        src = self.file.read(s1 - s0, dtype='float32', always_2d=True)
+        pos -= s0
+        grid = np.arange(len(src), dtype=np.float64)
+        out = np.empty((k1 - k0, self.channels), dtype=np.float32)
+        for c in range(self.channels):
+            out[:, c] = np.interp(pos, grid, src[:, c], right=0.0)
+        return out
+
+    def close(self):
+        self.file.close()
+
+def _match_channels(data, channels):
+    """Up/down-mixes a block to the output channel count."""
+    if data.shape[1] == channels:
+        return data
+    if data.shape[1] == 1:
+        return np.repeat(data, channels, axis=1)
+    if channels == 1:
+        return data.mean(axis=1, keepdims=True)
+    return data[:, :channels]
+
+class MasterAudioMixer:
+    def __init__(self, samplerate=44100, channels=None, block_frames=65536):
+        """
+        Initialize the mixer.
+
+        Args:
+            samplerate (int): Output sample rate. Clips at other rates are resampled on the fly.
+            channels (int): Output channels (default: the widest clip).
+            block_frames (int): Frames mixed per block (bounds memory use).
+        """
+        self.samplerate = samplerate
+        self.channels = channels
+        self._auto_channels = channels is None
+        self.block_frames = block_frames
+        self.clips = [] # (start, path, duration)
+
+    def add(self, path, start, voice=None):
+        """
+        Schedules a voice file at `start` seconds. Returns its duration.
+
+        Args:
+            voice (dict): Resolved {duration, channels} from a compiled scenario
+                (skips reading the file header).
+        """
+        if voice is None:
+            info = sf.info(path)
+            voice = {"duration": info.frames / info.samplerate, "channels": info.channels}
+        duration = voice["duration"]
+        self.clips.append((start, path, duration))
+        if self._auto_channels:
+            self.channels = max(self.channels or 1, min(2, voice["channels"]))
+        return duration
+
+    def blocks(self, total_duration):
+        """
+        Yields the mixed program as float32 (n, channels) blocks.
+
+        The yielded array is reused for the next block; copy it if it must outlive the iteration.
+        """
+        channels = self.channels or 1
+        total_frames = int(round(total_duration * self.samplerate))
+        pending = sorted(self.clips, key=lambda c: c[0])
+        next_clip = 0
+        active = []
+        buf = np.zeros((self.block_frames, channels), dtype=np.float32)
+
+        for block_start in range(0, total_frames, self.block_frames):
+            block_end = min(block_start + self.block_frames, total_frames)
+            n = block_end - block_start
+            out = buf[:n]
+            out.fill(0.0)
+
+            # Open clips that begin before the end of this block
+            while next_clip < len(pending):
+                start, path, _ = pending[next_clip]
+                start_frame = int(round(start * self.samplerate))
+                if start_frame >= block_end:
+                    break
+                active.append(_ClipReader(path, start_frame, self.samplerate))
+                next_clip += 1
+
+            for reader in active:
+                lo = max(block_start, reader.start_frame)
+                hi = min(block_end, reader.end_frame)
+                if hi <= lo:
+                    continue
+                data = reader.read(lo - reader.start_frame, hi - reader.start_frame)
+                data = _match_channels(data, channels)
+                out[lo - block_start:lo - block_start + len(data)] += data
+
+            # Close clips that are fully mixed
+            still_active = []
+            for reader in active:
+                if reader.end_frame <= block_end:
+                    reader.close()
+                else:
+                    still_active.append(reader)
+            active = still_active
+
+            np.clip(out, -1.0, 1.0, out=out)
+            yield out
+
+        for reader in active:
+            reader.close()
+
+    def write(self, out_path, total_duration, subtype='PCM_16'):
+        """Mixes the program into a WAV file."""
+        t0 = time.time()
+        with sf.SoundFile(out_path, 'w', samplerate=self.samplerate, channels=self.channels or 1, subtype=subtype) as f:
+            for block in self.blocks(total_duration):
+                f.write(block)
+        elapsed = time.time() - t0
+        speed = total_duration / elapsed if elapsed > 0 else float('inf')
+        print(f"Mixed {len(self.clips)} clips ({total_duration:.1f}s) in {elapsed:.2f}s ({speed:.0f}x realtime)")
+        return out_path
@@ -0,0 +1,214 @@
+"""
+Batch Render Module
+Runs a manifest of compositor jobs unattended: bounded concurrency (CPU and
+encoder slots), a private workspace per job, retries and a summary report.
+
+The encode runs inside each compositor process and cannot be gated on its own,
+so a job holds its encoder slot for its whole run: at most
+min(--max-jobs, --encoder-slots) jobs run at once, and the cores are split
+between those. Software encoders have no session limit, so the slot cap is only
+applied by default when a job encodes on a hardware backend.
+
+Manifest (JSON):
+    {
+      "defaults": {"args": ["--segmented"]},
+      "jobs": [
+        {"id": "ep01", "scenario": "ep01/scenario.json", "obs_video": "ep01.mov", "output": "out/ep01.mp4"},
+        {"scenario": "ep02/scenario.json", "obs_video": "ep02.mov", "output": "out/ep02.mp4", "args": ["--audio-offset", "0.2"]}
+      ]
+    }
+
+Usage:
+    python batch_render.py manifest.json --max-jobs 4 [--encoder-slots 2]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from imageio_ffmpeg import get_ffmpeg_exe
+
+from encoder_backends import DEFAULT_QUALITY_TARGET, is_hardware_encoder, select_encoder
+
+COMPOSITOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compositor.py")
+
+# Cores a single compositor encode keeps busy; used for the default concurrency
+CORES_PER_JOB = 4
+
+# Concurrent sessions assumed for hardware encoders (consumer NVENC and the like)
+HARDWARE_ENCODER_SLOTS = 2
+
+# Calibration bitrate of compositor.py (same value, so its cached encoder choice is reused)
+VIDEO_BITRATE = "8000k"
+
+def load_manifest(path):
+    """Loads a manifest and resolves job paths relative to it."""
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    default_args = manifest.get("defaults", {}).get("args", [])
+
+    jobs = []
+    for i, job in enumerate(manifest.get("jobs", [])):
+        output = os.path.join(base_dir, job["output"])
+        jobs.append({
+            "id": job.get("id") or f"{i + 1:03d}_{os.path.splitext(os.path.basename(output))[0]}",
+            "scenario": os.path.join(base_dir, job["scenario"]),
+            "obs_video": os.path.join(base_dir, job["obs_video"]),
+            "output": output,
+            "args": default_args + job.get("args", []),
+        })
+    return jobs
+
+def _arg_value(args, flag, default=None):
+    """Value following `flag` in a compositor argument list (last occurrence wins)."""
+    value = default
+    for i, arg in enumerate(args[:-1]):
+        if arg == flag:
+            value = args[i + 1]
+    return value
+
+def job_encoder(job, ffmpeg_exe):
+    """
+    The video encoder a job's compositor run will use.
+
+    Mirrors compositor.py: --proxy renders with libx264, "--encoder auto" (the
+    default) resolves to the cached calibration choice of this host.
+    """
+    args = job["args"]
+    if "--proxy" in args:
+        return "libx264"
+    encoder = _arg_value(args, "--encoder", "auto")
+    if encoder == "auto":
+        quality_target = float(_arg_value(args, "--quality-target", DEFAULT_QUALITY_TARGET))
+        encoder = select_encoder(ffmpeg_exe, quality_target, VIDEO_BITRATE, recalibrate="--recalibrate-encoder" in args)
+    return encoder
+
+def default_encoder_slots(jobs, ffmpeg_exe):
+    """
+    Encoder slot cap when --encoder-slots is not given: HARDWARE_ENCODER_SLOTS if
+    any job encodes on a hardware backend, otherwise 0 (no cap).
+    """
+    hardware = sorted({encoder for encoder in (job_encoder(job, ffmpeg_exe) for job in jobs) if is_hardware_encoder(encoder)})
+    if hardware:
+        print(f"[Batch] Hardware encoder ({', '.join(hardware)}): {HARDWARE_ENCODER_SLOTS} encoder slots")
+        return HARDWARE_ENCODER_SLOTS
+    return 0
+
+class BatchScheduler:
+    def __init__(self, jobs, work_dir, max_jobs, encoder_slots, retries=1, retry_delay=10.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            jobs (list): Jobs from load_manifest().
+            work_dir (str): Holds one private workspace, log and report per job.
+            max_jobs (int): Concurrent compositor processes.
+            encoder_slots (int): Concurrent encodes allowed (hardware encoders have session
+                limits); caps the concurrent jobs, 0 for no cap.
+            retries (int): Extra attempts for a failed job.
+        """
+        self.jobs = jobs
+        self.work_dir = work_dir
+        self.max_jobs = max_jobs
+        self.encoder_slots = encoder_slots
+        # Each job encodes somewhere inside its run, so it needs a slot throughout
+        self.concurrency = max(1, min(max_jobs, encoder_slots) if encoder_slots else max_jobs)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        # Split the cores between concurrent jobs instead of oversubscribing
+        self.threads_per_job = max(1, (os.cpu_count() or 1) // self.concurrency)
+        self._print_lock = threading.Lock()
+
+    def _log(self, message):
+        with self._print_lock:
+            print(f"[Batch] {message}", flush=True)
+
+    def _build_cmd(self, job, job_dir):
+        return [
+            sys.executable, COMPOSITOR,
+            job["scenario"], job["obs_video"],
+            "--output", job["output"],
+            "--workspace-dir", os.path.join(job_dir, "workspace"),
+            "--report", os.path.join(job_dir, "report.json"),
+            "--jobs", str(self.threads_per_job),
+            *job["args"],
+        ]
+
+    def run_job(self, job):
+        """Runs one job with retries. Returns its summary entry."""
+        job_dir = os.path.join(self.work_dir, job["id"])
+        os.makedirs(job_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(job["output"]) or ".", exist_ok=True)
+        cmd = self._build_cmd(job, job_dir)
+        log_path = os.path.join(job_dir, "render.log")
+
+        result = {"id": job["id"], "output": job["output"], "status": "failed", "attempts": 0}
+        t0 = time.time()
+        for attempt in range(1, self.retries + 2):
+            result["attempts"] = attempt
+            self._log(f"{job['id']}: start (attempt {attempt})")
+            with open(log_path, 'a', encoding='utf-8') as log:
+                log.write(f"\n=== attempt {attempt}: {' '.join(cmd)}\n")
+                log.flush()
+                proc = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT)
+
+            if proc.returncode == 0 and os.path.exists(job["output"]):
+                result["status"] = "ok"
+                break
+            self._log(f"{job['id']}: attempt {attempt} failed (exit {proc.returncode}), see {log_path}")
+            if attempt <= self.retries:
+                time.sleep(self.retry_delay)
+
+        result["wall_time"] = time.time() - t0
+        report_path = os.path.join(job_dir, "report.json")
+        if os.path.exists(report_path):
+            with open(report_path, 'r', encoding='utf-8') as f:
+                result["report"] = json.load(f)
+        self._log(f"{job['id']}: {result['status']} in {result['wall_time']:.0f}s")
+        return result
+
+    def run(self):
+        """Runs all jobs and returns the summary."""
+        limit = " (encoder slots)" if self.concurrency < self.max_jobs else ""
+        self._log(f"{len(self.jobs)} jobs, {self.concurrency} concurrent{limit}, {self.threads_per_job} threads per job")
+        t0 = time.time()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            results = list(pool.map(self.run_job, self.jobs))
+        return {
+            "wall_time": time.time() - t0,
+            "ok": sum(1 for r in results if r["status"] == "ok"),
+            "failed": sum(1 for r in results if r["status"] != "ok"),
+            "jobs": results,
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Ghostless Batch Renderer")
+    parser.add_argument("manifest", help="Path to the batch manifest (JSON)")
+    parser.add_argument("--work-dir", default="batch_work", help="Per-job workspaces, logs and reports")
+    parser.add_argument("--max-jobs", default=max(1, (os.cpu_count() or 1) // CORES_PER_JOB), type=int, help="Concurrent jobs (default: cores / 4)")
+    parser.add_argument("--encoder-slots", default=None, type=int,
+                        help=f"Concurrent encodes (hardware encoder session limit); also caps --max-jobs, 0: no cap "
+                             f"(default: {HARDWARE_ENCODER_SLOTS} if a job uses a hardware encoder, otherwise no cap)")
+    parser.add_argument("--retries", default=1, type=int, help="Retries for a failed job")
+    parser.add_argument("--summary", default="batch_summary.json", help="Summary output path")
+    args = parser.parse_args()
+
+    jobs = load_manifest(args.manifest)
+    encoder_slots = args.encoder_slots
+    if encoder_slots is None:
+        encoder_slots = default_encoder_slots(jobs, get_ffmpeg_exe())
+    scheduler = BatchScheduler(jobs, os.path.abspath(args.work_dir), args.max_jobs, encoder_slots, args.retries)
+    summary = scheduler.run()
+
+    with open(args.summary, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Batch finished: {summary['ok']} ok, {summary['failed']} failed in {summary['wall_time']:.0f}s. Summary: {args.summary}")
+    sys.exit(1 if summary["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+"""
+Benchmark Module
+Builds synthetic scenarios (N scenes of speech-like voice, slides, a generated
+green-screen recording and its recording_log.json) and times the compositor on
+them: wall time per stage, throughput and peak RSS, written to a JSON results file.
+
+Usage:
+    python benchmark.py run --scenes 20 --results bench.json
+    python benchmark.py compare HEAD~1 HEAD --scenes 20
+    python benchmark.py compare bench_before.json bench_after.json
+"""
+
+import os
+import sys
+import json
+import time
+import re
+import shlex
+import socket
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+import soundfile as sf
+from imageio_ffmpeg import get_ffmpeg_exe
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "prototype"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+from generate_assets import generate_voice_set
+from generate_slides import create_slides
+from generate_real_scenario import generate_scenario
+from audio_mixer import MasterAudioMixer
+from sync_estimator import estimate_sync
+
+COMPOSITOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compositor.py")
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ghostless", "bench")
+
+# Bump when the generated dataset changes (forces regeneration of cached datasets)
+DATASET_VERSION = 1
+
+# Arguments every case gets: a fixed encoder keeps calibration out of the timings
+BASE_ARGS = ["--encoder", "libx264"]
+
+DEFAULT_CASES = {
+    "single": [],
+    "pipe_io": ["--pipe-io"],
+    "segmented": ["--segmented"],
+    "proxy": ["--proxy"],
+}
+
+# Scene pacing of SceneDirector: audio starts 0.5s after the slide, 0.2s pause after it
+SLIDE_LEAD = 0.5
+SCENE_GAP = 0.2
+
+# Largest error accepted when --auto-sync re-measures a dataset's --audio-delay (s)
+SYNC_TOLERANCE = 0.010
+
+def write_recording_log(assets_dir, scenario, start=1.0):
+    """
+    Writes the recording_log.json a live run of the scenario would produce.
+
+    Returns:
+        tuple: (audio_events, total_duration) with audio_events as (start, wav_path).
+    """
+    voice_dir = os.path.join(assets_dir, "voice")
+    events, audio_events = [], []
+    t = start
+    for scene in scenario["scenes"]:
+        wav = os.path.join(voice_dir, scene["voice_file"])
+        duration = sf.info(wav).duration
+        events.append({"type": "slide", "file": scene["image_file"], "time": round(t, 3)})
+        events.append({"type": "audio", "file": scene["voice_file"], "time": round(t + SLIDE_LEAD, 3)})
+        audio_events.append((round(t + SLIDE_LEAD, 3), wav))
+        t += SLIDE_LEAD + duration + SCENE_GAP
+    with open(os.path.join(assets_dir, "recording_log.json"), 'w', encoding='utf-8') as f:
+        json.dump({"start_time": 0, "events": events}, f, indent=2)
+    return audio_events, t + 2.0
+
+def render_green_screen(ffmpeg_exe, out_path, audio_events, duration, height=1080, fps=60, audio_delay=0.0, work_dir=None):
+    """
+    Renders a stand-in OBS recording: a moving test pattern "character" on a
+    green background, with the scenario's voice track (optionally delayed).
+    """
+    width = int(round(height * 16 / 9 / 2)) * 2
+    mix_path = os.path.join(work_dir or os.path.dirname(out_path), "obs_audio.wav")
+    mixer = MasterAudioMixer(samplerate=48000)
+    for start, path in audio_events:
+        mixer.add(path, start)
+    mixer.write(mix_path, duration)
+
+    cmd = [
+        ffmpeg_exe, "-y", "-v", "error",
+        "-f", "lavfi", "-i", f"color=c=0x00FF00:s={width}x{height}:r={fps}:d={duration:.3f}",
+        "-f", "lavfi", "-i", f"testsrc2=s={width // 4}x{height * 2 // 3}:r={fps}",
+        "-itsoffset", f"{audio_delay:.3f}", "-i", mix_path,
+        "-filter_complex", "[0:v][1:v]overlay=(W-w)/2+(W/8)*sin(t/2):(H-h)/2:shortest=1[v]",
+        "-map", "[v]", "-map", "2:a",
+        # Roughly what OBS writes: H.264 at a high bitrate, AAC audio
+        "-c:v", "libx264", "-preset", "ultrafast", "-crf", "18", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-b:a", "160k",
+        "-t", f"{duration:.3f}",
+        out_path
+    ]
+    subprocess.run(cmd, check=True)
+    os.remove(mix_path)
+    return out_path
+
+def check_audio_delay(dataset):
+    """
+    Verifies that the sync estimator recovers the audio delay a dataset was built with.
+
+    Returns:
+        dict: expected, measured and error (s); raises RuntimeError beyond SYNC_TOLERANCE.
+    """
+    assets_dir = os.path.dirname(dataset["scenario"])
+    with open(os.path.join(assets_dir, "recording_log.json"), 'r', encoding='utf-8') as f:
+        events = json.load(f)["events"]
+    audio_events = [(e["time"], os.path.join(assets_dir, "voice", e["file"])) for e in events if e["type"] == "audio"]
+    expected = dataset["params"]["audio_delay"]
+    measured = estimate_sync(get_ffmpeg_exe(), dataset["obs_video"], audio_events, dataset["duration"])["offset"]
+    check = {"expected": expected, "measured": measured, "error": measured - expected}
+    if abs(check["error"]) > SYNC_TOLERANCE:
+        raise RuntimeError(f"Sync estimator measured {measured:.3f}s on a dataset delayed by {expected:.3f}s")
+    print(f"[Bench] Audio delay {expected:.3f}s recovered by the sync estimator ({check['error'] * 1000:+.1f} ms)")
+    return check
+
+def build_dataset(data_dir, scenes, seed=0, min_voice=2.0, max_voice=8.0, obs_height=1080, obs_fps=60, audio_delay=0.0):
+    """
+    Generates (or reuses) a synthetic scenario with `scenes` scenes.
+
+    Returns:
+        dict: Dataset description with scenario and obs_video paths.
+    """
+    params = {
+        "version": DATASET_VERSION, "scenes": scenes, "seed": seed,
+        "min_voice": min_voice, "max_voice": max_voice,
+        "obs_height": obs_height, "obs_fps": obs_fps, "audio_delay": audio_delay,
+    }
+    name = f"s{scenes}_seed{seed}_{obs_height}p{obs_fps}" + (f"_d{audio_delay:g}" if audio_delay else "")
+    root = os.path.join(data_dir, name)
+    meta_path = os.path.join(root, "dataset.json")
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            dataset = json.load(f)
+        if dataset["params"] == params:
+            print(f"[Bench] Using dataset {root}")
+            if audio_delay and "sync_check" not in dataset:
+                dataset["sync_check"] = check_audio_delay(dataset)
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(dataset, f, indent=2)
+            return dataset
+    shutil.rmtree(root, ignore_errors=True)
+
+    print(f"[Bench] Generating dataset {root} ({scenes} scenes)...")
+    assets_dir = os.path.join(root, "assets")
+    generate_voice_set(os.path.join(assets_dir, "voice"), scenes, min_voice, max_voice, seed)
+    create_slides(os.path.join(assets_dir, "images"), scenes, quiet=True)
+    lines = [f"Benchmark scene {i + 1}" for i in range(scenes)]
+    scenario = generate_scenario(assets_dir, "Benchmark", lines=lines, seed=seed)
+    audio_events, duration = write_recording_log(assets_dir, scenario)
+
+    obs_video = os.path.join(root, "obs.mp4")
+    render_green_screen(get_ffmpeg_exe(), obs_video, audio_events, duration, obs_height, obs_fps, audio_delay)
+
+    dataset = {
+        "params": params,
+        "scenario": os.path.join(assets_dir, "scenario.json"),
+        "obs_video": obs_video,
+        "duration": duration,
+    }
+    if audio_delay:
+        # The delayed track must actually test --auto-sync
+        dataset["sync_check"] = check_audio_delay(dataset)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(dataset, f, indent=2)
+    return dataset
+
+def _wait_peak_rss(proc):
+    """
+    Waits for the process and returns (returncode, peak_rss_bytes).
+
+    The peak is the largest resident set of the process or any descendant it
+    waited for (i.e. the compositor or one of its FFmpeg children); None where
+    wait4 is unavailable (Windows).
+    """
+    if not hasattr(os, "wait4"):
+        return proc.wait(), None
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return proc.returncode, usage.ru_maxrss * scale
+
+def supported_flags(compositor):
+    """
+    Options the compositor at `compositor` accepts (parsed from its --help).
+
+    Returns:
+        set: Option strings, or None when --help cannot be run (all options are passed then).
+    """
+    proc = subprocess.run([sys.executable, compositor, "--help"], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+    return set(re.findall(r"(?<![\w-])--[a-z][\w-]*", proc.stdout))
+
+def filter_args(args, flags):
+    """Drops the options missing from `flags` (with their values) from an argument list."""
+    if flags is None:
+        return list(args), []
+    kept, dropped = [], []
+    skipping = False
+    for arg in args:
+        if arg.startswith("--"):
+            skipping = arg.split("=", 1)[0] not in flags
+        (dropped if skipping else kept).append(arg)
+    return kept, dropped
+
+def run_case(compositor, dataset, name, case_args, work_dir, repeat=1, flags=None):
+    """
+    Runs one compositor configuration `repeat` times.
+
+    Args:
+        flags (set): Options this compositor supports (see supported_flags); the
+            base arguments it lacks are left out, and a case that needs a missing
+            option is reported as unsupported instead of failing.
+
+    Returns:
+        dict: Per-run measurements and medians (wall time, stages, throughput, peak RSS).
+    """
+    _, missing = filter_args(case_args, flags)
+    if missing:
+        print(f"[Bench] {name} skipped: this revision has no {' '.join(a for a in missing if a.startswith('--'))}")
+        return {"args": case_args, "status": "unsupported", "runs": []}
+
+    case_dir = os.path.join(work_dir, name)
+    os.makedirs(case_dir, exist_ok=True)
+    output = os.path.join(case_dir, "output.mp4")
+    report_path = os.path.join(case_dir, "report.json")
+    # Older revisions lack some of these (e.g. --encoder, --report)
+    base_args, _ = filter_args(["--report", report_path, *BASE_ARGS], flags)
+    cmd = [
+        sys.executable, compositor, dataset["scenario"], dataset["obs_video"],
+        "--output", output, *base_args, *case_args,
+    ]
+
+    runs = []
+    for i in range(repeat):
+        if os.path.exists(report_path): os.remove(report_path)
+        print(f"[Bench] {name} run {i + 1}/{repeat}: {' '.join(case_args) or '(defaults)'}", flush=True)
+        t0 = time.perf_counter()
+        with open(os.path.join(case_dir, "render.log"), 'w', encoding='utf-8') as log:
+            proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+            returncode, peak_rss = _wait_peak_rss(proc)
+        wall = time.perf_counter() - t0
+
+        run = {"status": "ok" if returncode == 0 else "failed", "wall_time": wall, "peak_rss_mb": peak_rss / 1024**2 if peak_rss else None}
+        if returncode == 0:
+            run["stages"] = {}
+            if os.path.exists(report_path): # Older revisions have no --report
+                with open(report_path, 'r', encoding='utf-8') as f:
+                    run["stages"] = json.load(f).get("stages", {})
+            run["throughput"] = dataset["duration"] / wall # Seconds of video per second
+            run["output_bytes"] = os.path.getsize(output) if os.path.exists(output) else None
+        else:
+            print(f"[Bench] {name} failed (exit {returncode}), see {os.path.join(case_dir, 'render.log')}")
+        runs.append(run)
+
+    ok = [r for r in runs if r["status"] == "ok"]
+    result = {"args": case_args, "status": "ok" if ok else "failed", "runs": runs}
+    if ok:
+        stage_names = sorted({s for r in ok for s in r["stages"]})
+        result["wall_time"] = statistics.median(r["wall_time"] for r in ok)
+        result["throughput"] = statistics.median(r["throughput"] for r in ok)
+        result["stages"] = {s: statistics.median(r["stages"].get(s, 0.0) for r in ok) for s in stage_names}
+        peaks = [r["peak_rss_mb"] for r in ok if r["peak_rss_mb"] is not None]
+        result["peak_rss_mb"] = max(peaks) if peaks else None
+    return result
+
+def _git(repo_dir, *args):
+    return subprocess.run(["git", "-C", repo_dir, *args], capture_output=True, text=True, check=True).stdout.strip()
+
+def _commit_of(compositor):
+    try:
+        repo = os.path.dirname(compositor)
+        dirty = bool(_git(repo, "status", "--porcelain", "--untracked-files=no"))
+        return _git(repo, "rev-parse", "HEAD") + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(dataset, cases, repeat=1, compositor=COMPOSITOR, work_dir=None, commit=None):
+    """Runs all cases against a dataset and returns the results document."""
+    work_dir = work_dir or tempfile.mkdtemp(prefix="ghostless_bench_")
+    results = {
+        "commit": commit or _commit_of(compositor),
+        "host": socket.gethostname(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "ffmpeg": get_ffmpeg_exe(),
+        "started_at": time.time(),
+        "dataset": {"params": dataset["params"], "duration": dataset["duration"], "sync_check": dataset.get("sync_check")},
+        "repeat": repeat,
+        "cases": {},
+    }
+    flags = supported_flags(compositor)
+    try:
+        for name, case_args in cases.items():
+            results["cases"][name] = run_case(compositor, dataset, name, case_args, work_dir, repeat, flags)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def benchmark_revision(rev, dataset, cases, repeat=1):
+    """Benchmarks the compositor of a git revision (checked out into a temporary worktree)."""
+    repo = _git(os.path.dirname(COMPOSITOR), "rev-parse", "--show-toplevel")
+    commit = _git(repo, "rev-parse", rev)
+    worktree = tempfile.mkdtemp(prefix="ghostless_rev_")
+    _git(repo, "worktree", "add", "--detach", worktree, commit)
+    try:
+        compositor = os.path.join(worktree, os.path.relpath(COMPOSITOR, repo))
+        return run_benchmark(dataset, cases, repeat, compositor=compositor, commit=commit)
+    finally:
+        _git(repo, "worktree", "remove", "--force", worktree)
+
+def print_comparison(base, head):
+    """Prints a per-case table of two results documents (median wall time, throughput, peak RSS)."""
+    print(f"\nbase: {base.get('commit')}\nhead: {head.get('commit')}\n")
+    print(f"{'case':<14}{'base s':>10}{'head s':>10}{'change':>9}{'base x':>9}{'head x':>9}{'base MB':>10}{'head MB':>10}")
+    def fmt(value, spec):
+        return "-" if value is None else f"{value:{spec}}"
+    for name in list(dict.fromkeys([*base["cases"], *head["cases"]])):
+        a = base["cases"].get(name, {})
+        b = head["cases"].get(name, {})
+        change = None
+        if a.get("wall_time") and b.get("wall_time"):
+            change = (b["wall_time"] / a["wall_time"] - 1.0) * 100
+        print(f"{name:<14}{fmt(a.get('wall_time'), '.1f'):>10}{fmt(b.get('wall_time'), '.1f'):>10}"
+              f"{fmt(change, '+.1f') + ('%' if change is not None else ''):>9}"
+              f"{fmt(a.get('throughput'), '.2f'):>9}{fmt(b.get('throughput'), '.2f'):>9}"
+              f"{fmt(a.get('peak_rss_mb'), '.0f'):>10}{fmt(b.get('peak_rss_mb'), '.0f'):>10}")
+
+def _parse_cases(args):
+    cases = {}
+    for name in args.cases.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in DEFAULT_CASES:
+            raise SystemExit(f"Unknown case: {name} (available: {', '.join(DEFAULT_CASES)})")
+        cases[name] = DEFAULT_CASES[name]
+    for spec in args.case:
+        name, _, extra = spec.partition("=")
+        cases[name] = shlex.split(extra)
+    return cases
+
+def _write_results(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Ghostless Compositor Benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def dataset_args(p):
+        p.add_argument("--scenes", default=10, type=int, help="Number of synthetic scenes")
+        p.add_argument("--seed", default=0, type=int, help="Seed for voice durations and motion tags")
+        p.add_argument("--min-voice", default=2.0, type=float, help="Shortest voice clip (s)")
+        p.add_argument("--max-voice", default=8.0, type=float, help="Longest voice clip (s)")
+        p.add_argument("--obs-height", default=1080, type=int, help="Height of the generated green-screen recording")
+        p.add_argument("--obs-fps", default=60, type=int, help="Frame rate of the generated green-screen recording")
+        p.add_argument("--audio-delay", default=0.0, type=float, help="Delay of the recording's audio track (exercises --auto-sync; checked with the sync estimator on generation)")
+        p.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Where generated datasets are cached")
+
+    def case_args(p):
+        p.add_argument("--cases", default=",".join(DEFAULT_CASES), help=f"Comma-separated built-in cases ({', '.join(DEFAULT_CASES)})")
+        p.add_argument("--case", action="append", default=[], metavar="NAME=ARGS", help="Extra case with compositor arguments, e.g. prekey=\"--prekey --segmented\"")
+        p.add_argument("--repeat", default=1, type=int, help="Runs per case (medians are reported)")
+
+    p_gen = sub.add_parser("generate", help="Generate a synthetic dataset")
+    dataset_args(p_gen)
+
+    p_run = sub.add_parser("run", help="Benchmark the compositor in this tree")
+    dataset_args(p_run)
+    case_args(p_run)
+    p_run.add_argument("--results", default="bench_results.json", help="Results output path")
+
+    p_cmp = sub.add_parser("compare", help="Compare two git revisions (or two results files)")
+    p_cmp.add_argument("base", help="Base git revision or results file")
+    p_cmp.add_argument("head", nargs="?", default=None, help="Head git revision or results file (default: this tree)")
+    dataset_args(p_cmp)
+    case_args(p_cmp)
+    p_cmp.add_argument("--results-dir", default=".", help="Where the per-revision results are saved")
+    args = parser.parse_args()
+
+    load_dataset = lambda: build_dataset(
+        args.data_dir, args.scenes, args.seed, args.min_voice, args.max_voice,
+        args.obs_height, args.obs_fps, args.audio_delay)
+
+    if args.command == "generate":
+        dataset = load_dataset()
+        print(f"Scenario: {dataset['scenario']}\nOBS video: {dataset['obs_video']} ({dataset['duration']:.1f}s)")
+        return
+
+    if args.command == "run":
+        results = run_benchmark(load_dataset(), _parse_cases(args), args.repeat)
+        _write_results(results, args.results)
+        for name, case in results["cases"].items():
+            print(f"{name:<14}{case['status']:<8}" + (f"{case['wall_time']:.1f}s  {case['throughput']:.2f}x realtime" if case["status"] == "ok" else ""))
+        return
+
+    # compare: each side is a results file or a git revision benchmarked on the same dataset
+    dataset, cases = None, _parse_cases(args)
+    sides = []
+    for ref in (args.base, args.head):
+        if ref and os.path.isfile(ref):
+            with open(ref, 'r', encoding='utf-8') as f:
+                sides.append(json.load(f))
+            continue
+        dataset = dataset or load_dataset()
+        if ref is None:
+            results = run_benchmark(dataset, cases, args.repeat)
+            label = "worktree"
+        else:
+            results = benchmark_revision(ref, dataset, cases, args.repeat)
+            label = results["commit"][:10]
+        _write_results(results, os.path.join(args.results_dir, f"bench_{label}.json"))
+        sides.append(results)
+    print_comparison(*sides)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Chroma Preview Module
+Samples a few frames from the OBS recording, keys them over a grid of
+similarity/blend values with NumPy and writes a contact sheet plus a spill/hole
+metric per setting. Used to tune --similarity/--blend without full renders.
+
+Usage:
+    python compositor.py preview recording.mov --similarity 0.1 0.13 0.16 --blend 0.1 0.2
+"""
+
+import os
+import json
+import argparse
+import subprocess
+import numpy as np
+from PIL import Image, ImageDraw
+from imageio_ffmpeg import get_ffmpeg_exe
+
+from media_probe import get_video_duration
+
+KEY_COLOR = (0, 255, 0) # 0x00FF00, same as the compositor
+
+def grab_frame(ffmpeg_exe, path, t, height):
+    """Decodes a single frame at `t` seconds (fast input seek) as an RGB uint8 array."""
+    cmd = [
+        ffmpeg_exe, "-v", "error",
+        "-ss", f"{t:.3f}", "-i", path,
+        "-frames:v", "1",
+        "-vf", f"scale=-2:{height}",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-"
+    ]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    width = len(raw) // (3 * height)
+    return np.frombuffer(raw, dtype=np.uint8)[:width * height * 3].reshape(height, width, 3)
+
+def _rgb_to_uv(rgb):
+    """BT.601 limited-range chroma (what FFmpeg's chromakey sees for OBS YUV output)."""
+    rgb = rgb.astype(np.float32)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    u = 128.0 - 0.148 * r - 0.291 * g + 0.439 * b
+    v = 128.0 + 0.439 * r - 0.368 * g - 0.071 * b
+    return u, v
+
+def key_distance(frames):
+    """
+    Returns the per-pixel chroma distance to the key color, as FFmpeg's chromakey computes it.
+
+    chromakey averages the normalized UV distance over a 3x3 neighbourhood.
+
+    Args:
+        frames (np.ndarray): (N, H, W, 3) uint8.
+    """
+    u, v = _rgb_to_uv(frames)
+    ku, kv = _rgb_to_uv(np.array(KEY_COLOR, dtype=np.uint8))
+    d = np.sqrt(((u - ku) ** 2 + (v - kv) ** 2) / (255.0 * 255.0 * 2))
+
+    # 3x3 box mean (edge-padded)
+    p = np.pad(d, ((0, 0), (1, 1), (1, 1)), mode='edge')
+    h, w = d.shape[1:]
+    acc = np.zeros_like(d)
+    for dy in range(3):
+        for dx in range(3):
+            acc += p[:, dy:dy + h, dx:dx + w]
+    return acc / 9.0
+
+def key_alpha(distance, similarity, blend):
+    """Returns the alpha matte (0 = keyed out, 1 = opaque) for one setting."""
+    if blend > 0.0001:
+        return np.clip((distance - similarity) / blend, 0.0, 1.0)
+    return (distance > similarity).astype(np.float32)
+
+def classify_pixels(frames):
+    """
+    Rough ground truth for the metrics: clearly green-screen vs clearly subject pixels.
+
+    Returns:
+        tuple: (screen_mask, subject_mask) boolean arrays of shape (N, H, W).
+    """
+    rgb = frames.astype(np.int16)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    other = np.maximum(r, b)
+    screen = (g > 60) & (g * 4 > other * 5) # G at least 25% above R and B
+    subject = g <= other
+    return screen, subject
+
+def _checkerboard(h, w, size=16):
+    yy, xx = np.mgrid[0:h, 0:w]
+    board = (((yy // size) + (xx // size)) % 2).astype(np.float32)
+    return (board * 60 + 100)[..., None] # Two greys
+
+def render_contact_sheet(frames, results, out_path):
+    """One row per setting, one column per sampled frame, composited over a checkerboard."""
+    n, h, w, _ = frames.shape
+    label_h = 22
+    sheet = Image.new('RGB', (w * n, (h + label_h) * len(results)), (20, 20, 20))
+    draw = ImageDraw.Draw(sheet)
+    bg = _checkerboard(h, w)
+    for row, res in enumerate(results):
+        y = row * (h + label_h)
+        draw.text(
+            (6, y + 4),
+            f"similarity={res['similarity']:.3f} blend={res['blend']:.3f}  spill={res['spill']:.4f} hole={res['hole']:.4f}",
+            fill=(255, 255, 255)
+        )
+        alpha = res.pop("_alpha")
+        comp = frames.astype(np.float32) * alpha[..., None] + bg * (1.0 - alpha[..., None])
+        for col in range(n):
+            tile = Image.fromarray(comp[col].astype(np.uint8))
+            sheet.paste(tile, (col * w, y + label_h))
+    sheet.save(out_path)
+
+def run_preview(obs_video, similarities, blends, num_frames=6, height=360, output="chroma_preview.png"):
+    """
+    Samples frames, evaluates the parameter grid and writes the contact sheet and metrics.
+
+    Returns:
+        list: One dict per setting with similarity, blend, spill and hole (sorted best first).
+    """
+    ffmpeg_exe = get_ffmpeg_exe()
+    duration = get_video_duration(ffmpeg_exe, obs_video)
+    # Evenly spaced, away from the very start/end
+    times = [duration * (i + 1) / (num_frames + 1) for i in range(num_frames)]
+    print(f"[Preview] Sampling {num_frames} frames from {obs_video} ({duration:.1f}s)...")
+    frames = np.stack([grab_frame(ffmpeg_exe, obs_video, t, height) for t in times])
+
+    distance = key_distance(frames)
+    screen, subject = classify_pixels(frames)
+
+    results = []
+    for similarity in similarities:
+        for blend in blends:
+            alpha = key_alpha(distance, similarity, blend)
+            # spill: green screen left visible, hole: subject keyed out
+            spill = float(alpha[screen].mean()) if screen.any() else 0.0
+            hole = float(1.0 - alpha[subject].mean()) if subject.any() else 0.0
+            results.append({"similarity": similarity, "blend": blend, "spill": spill, "hole": hole, "_alpha": alpha})
+
+    render_contact_sheet(frames, results, output)
+    results.sort(key=lambda r: r["spill"] + r["hole"])
+
+    metrics_path = os.path.splitext(output)[0] + ".json"
+    with open(metrics_path, 'w', encoding='utf-8') as f:
+        json.dump({"source": obs_video, "times": times, "results": results}, f, indent=2)
+
+    print(f"{'similarity':>10} {'blend':>6} {'spill':>8} {'hole':>8}")
+    for r in results:
+        print(f"{r['similarity']:>10.3f} {r['blend']:>6.3f} {r['spill']:>8.4f} {r['hole']:>8.4f}")
+    best = results[0]
+    print(f"[Preview] Best: --similarity {best['similarity']} --blend {best['blend']}")
+    print(f"[Preview] Contact sheet: {output}, metrics: {metrics_path}")
+    return results
+
+def preview_main(argv=None):
+    parser = argparse.ArgumentParser(prog="compositor.py preview", description="Chroma key tuning preview")
+    parser.add_argument("obs_video", help="Path to the OBS recording (.mov/.mp4)")
+    parser.add_argument("--similarity", nargs="+", type=float, default=[0.08, 0.10, 0.13, 0.16, 0.20], help="Similarity values to try")
+    parser.add_argument("--blend", nargs="+", type=float, default=[0.1, 0.2, 0.3], help="Blend values to try")
+    parser.add_argument("--frames", default=6, type=int, help="Number of frames to sample")
+    parser.add_argument("--height", default=360, type=int, help="Preview frame height")
+    parser.add_argument("--output", default="chroma_preview.png", help="Contact sheet filename (metrics go next to it as .json)")
+    args = parser.parse_args(argv)
+    run_preview(args.obs_video, args.similarity, args.blend, args.frames, args.height, args.output)
+
+if __name__ == "__main__":
+    preview_main()
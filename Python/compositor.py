@@ -7,64 +7,86 @@ import os
 import sys
 import json
 import argparse
-import soundfile as sf
-from moviepy import *
-
-def get_audio_duration(path):
-    f = sf.SoundFile(path)
-    return len(f) / f.samplerate
-
-import os
-import sys
-import json
-import argparse
+import shutil
 import subprocess
 import soundfile as sf
 # Use imageio_ffmpeg to ensure we have a valid ffmpeg path
 from imageio_ffmpeg import get_ffmpeg_exe
-from moviepy import *
+
+from audio_mixer import MasterAudioMixer
+from render_cache import RenderCache
+from keyed_intermediate import build_key_filter, ensure_keyed_intermediate
+from encoder_backends import ENCODER_BACKENDS, DEFAULT_QUALITY_TARGET, select_encoder
+from segmented_render import render_segmented
+from output_profiles import OUTPUT_PROFILES, build_split_graph, resolve_outputs
+from ffmpeg_runner import AudioPipe, concat_file_line, create_workspace, print_progress, run_ffmpeg
+from render_report import StageTimer
+from sync_estimator import estimate_sync
+from recording_stitch import load_recordings, recording_start, resolve_recording_files, stitch_recordings
+from proxy_render import PROXY_CODEC_ARGS, PROXY_DECODE_ARGS, PROXY_FPS, PROXY_HEIGHT, PROXY_SCALER, overlay_filter, write_overlay
+
+# Output frame rate of the composite (OBS records at 60fps, we downsample)
+FPS = 30
+
+# Default location of the render cache (keyed intermediates, segments)
+DEFAULT_PREKEY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ghostless", "prekey")
+
+# Video bitrate used for encoder calibration (per-output bitrates live in OUTPUT_PROFILES)
+VIDEO_BITRATE = "8000k" # Increased bitrate slightly
 
 def get_audio_duration(path):
     f = sf.SoundFile(path)
     return len(f) / f.samplerate
 
-def main():
-    parser = argparse.ArgumentParser(description="Ghostless Compositor (Hybrid)")
-    parser.add_argument("scenario", help="Path to scenario.json")
-    parser.add_argument("obs_video", help="Path to the OBS recording (.mov/.mp4)")
-    parser.add_argument("--similarity", default=0.13, type=float, help="Chroma Key similarity (0.0-1.0)")
-    parser.add_argument("--blend", default=0.2, type=float, help="Chroma Key blend (0.0-1.0)")
-    parser.add_argument("--audio-offset", default=0.0, type=float, help="Audio sync offset in seconds (e.g. 0.2 to delay audio)")
-    parser.add_argument("--output", default="final_output.mp4", help="Output filename")
-    parser.add_argument("--keep-temp", action="store_true", help="Keep temporary background file")
-    args = parser.parse_args()
+def voice_manifest(scenario, assets_dir):
+    """Resolved voice info ({duration, samplerate, channels, ...}) by path, from a compiled scenario."""
+    voice_dir = os.path.join(assets_dir, "voice")
+    return {os.path.join(voice_dir, scene["voice_file"]): scene["voice"]
+            for scene in scenario.get("scenes", []) if "voice" in scene}
 
-    # Load Scenario
-    with open(args.scenario, 'r', encoding='utf-8') as f:
-        scenario = json.load(f)
+def build_timeline(scenario, assets_dir, audio_offset=0.0, drift=0.0, shifts=None):
+    """
+    Reconstructs the slide/audio timeline for a scenario.
 
-    assets_dir = os.path.dirname(os.path.abspath(args.scenario))
+    Uses recording_log.json next to the scenario when present, otherwise estimates
+    the timing from the WAV durations (taken from the manifest of a compiled
+    scenario, see prototype/scenario_compiler.py). Logged times are moved onto the
+    OBS file's time (the recording starts before T=0 of the log, see
+    recording_stitch.recording_start), as in the live compositor. Logged audio starts are shifted by
+    `audio_offset + drift * time` (drift in seconds per second, see sync_estimator).
+    `shifts` (recording index -> seconds, see recording_stitch) moves the events of a
+    session recorded in several files onto the stitched recording.
+
+    Returns:
+        tuple: (slide_events, audio_events, total_duration) where slide_events is a
+        list of (time, image_path) and audio_events a list of (start, wav_path).
+    """
     voice_dir = os.path.join(assets_dir, "voice")
     images_dir = os.path.join(assets_dir, "images")
+    manifest = voice_manifest(scenario, assets_dir)
+
+    def voice_duration(path):
+        return manifest[path]["duration"] if path in manifest else get_audio_duration(path)
 
-    # --- Step 1: Prepare Assets (Speed Optimized) ---
-    print("[Step 1] Preparing Assets...")
-    
     # Try to load recording_log.json for precise timing
     log_path = os.path.join(assets_dir, "recording_log.json")
     event_log = None
+    origin = 0.0 # Log time of the recording's first frame
     if os.path.exists(log_path):
         with open(log_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
             event_log = data.get("events", [])
+            origin = recording_start(data) or 0.0
             print(f"Loaded Recording Log from {log_path} ({len(event_log)} events)")
 
     # Lists for reconstruction
-    audio_clips = []
+    audio_events = [] # (start, file)
     slide_events = [] # (time, file)
-    
+
     if event_log:
         # Reconstruct from Log
+        for event in event_log:
+            event["time"] += (shifts or {}).get(event.get("recording", 0), 0.0) - origin
         event_log.sort(key=lambda x: x["time"])
         for event in event_log:
             if event["type"] == "slide":
@@ -72,16 +94,16 @@ def main():
             elif event["type"] == "audio":
                 p = os.path.join(voice_dir, event["file"])
                 if os.path.exists(p):
-                    audio_start = event["time"] + args.audio_offset
-                    audio_clips.append(AudioFileClip(p).with_start(audio_start))
-        
+                    audio_start = event["time"] + audio_offset + drift * event["time"]
+                    audio_events.append((audio_start, p))
+
         # Calculate End Time
-        if audio_clips:
-             last_audio = audio_clips[-1]
-             total_duration = last_audio.start + last_audio.duration + 2.0
+        if audio_events:
+             last_start, last_path = audio_events[-1]
+             total_duration = last_start + voice_duration(last_path) + 2.0
         else:
              total_duration = slide_events[-1][0] + 10.0 if slide_events else 10.0
-             
+
     else:
         # Fallback estimation
         print("Warning: Log missing. Using estimation.")
@@ -91,128 +113,335 @@ def main():
             # Audio
             voice_file = scene.get("voice_file")
             voice_path = os.path.join(voice_dir, voice_file)
-            duration = get_audio_duration(voice_path) if os.path.exists(voice_path) else 5.0
-            
+            duration = voice_duration(voice_path) if os.path.exists(voice_path) else 5.0
+
             p = os.path.join(voice_dir, voice_file)
             if os.path.exists(p):
-                 audio_clips.append(AudioFileClip(p).with_start(current_time + 0.5))
-            
+                 audio_events.append((current_time + 0.5, p))
+
             # Slide
             image_file = scene.get("image_file")
             p = os.path.join(images_dir, image_file)
             slide_events.append((current_time, p))
-            
+
             step = 0.5 + duration + 0.2
             current_time += step
         total_duration = current_time + 2.0
 
-    # 1. Generate Master Audio (using MoviePy Audio - this is fast)
-    print("Generating Master Audio...")
-    temp_audio = "temp_master_audio.wav"
-    final_audio = CompositeAudioClip(audio_clips)
-    # Write audio file (WAV is faster and avoids codec issues)
-    final_audio.write_audiofile(temp_audio, fps=44100, logger=None)
-    
-    # 2. Generate Slides Concat File (for FFmpeg)
+    return slide_events, audio_events, total_duration
+
+def ensure_black_image(path):
+    """Creates the fallback black background used for gaps and missing slides."""
+    if not os.path.exists(path):
+         from PIL import Image
+         Image.new('RGB', (1920, 1080), (0,0,0)).save(path)
+    return path
+
+def build_slides_concat(slide_events, total_duration, black_img):
+    """
+    Returns an FFmpeg concat list (text) that holds each slide until the next one.
+
+    Entries are explicit file: URLs; when the list is read from stdin, plain paths
+    would be resolved against the pipe: URL and fail to open.
+    """
+    lines = []
+    # Ensure we cover from 0.0 to end
+    # FFmpeg concat: file, duration
+    # We need relative durations.
+
+    # Add initial black/delay if first slide isn't at 0
+    current_head = 0.0
+
+    sorted_slides = sorted(slide_events, key=lambda x: x[0])
+
+    for i, (t, img_path) in enumerate(sorted_slides):
+        if not os.path.exists(img_path):
+            img_path = black_img
+
+        # Gap before this slide?
+        if t > current_head:
+            gap = t - current_head
+            lines.append(concat_file_line(black_img))
+            lines.append(f"duration {gap:.3f}")
+            current_head = t
+
+        # Duration of this slide is until next slide or total_duration
+        if i < len(sorted_slides) - 1:
+            next_t = sorted_slides[i+1][0]
+            duration = next_t - t
+        else:
+            duration = total_duration - t
+
+        # Sanity check
+        if duration < 0: duration = 0.1
+
+        lines.append(concat_file_line(img_path))
+        lines.append(f"duration {duration:.3f}")
+        current_head += duration
+
+    # "Due to a quirk, the last image has to be specified twice" - some docs say.
+    # Duplicate the last image so the stream closes safely; -t on output trims it.
+    if sorted_slides:
+        last_img = sorted_slides[-1][1] if os.path.exists(sorted_slides[-1][1]) else black_img
+        lines.append(concat_file_line(last_img))
+    return "\n".join(lines) + "\n"
+
+def build_composite_filter(bg_input, obs_input, similarity, blend, prekeyed=False, fps=FPS, height=None, scaler="lanczos", post_filter=None):
+    """
+    Returns the filter graph that keys the OBS video and overlays it on the slides.
+
+    With prekeyed=True the OBS input is an already scaled and keyed intermediate
+    and is overlaid as-is (only resampled when a proxy size/rate is requested).
+    `height` shrinks the whole composite (proxy renders); None keeps 1080p.
+    `post_filter` is appended to the composite (e.g. the proxy overlay).
+
+    Scale OBS video to 1080p height (preserve aspect ratio), set fps to 30, chromakey, then overlay centered
+    scale=-1:1080 -> Keep AR, height 1080
+    flags=lanczos -> Better scaling quality
+    fps=30 -> Smooth downsample from 60fps
+    overlay=(W-w)/2:(H-h)/2 -> Center the character
+    """
+    if prekeyed:
+        resample = f"fps={fps},scale=-1:{height}:flags={scaler}" if height else "null"
+        fg_chain = f"[{obs_input}:v]{resample}[vt];"
+    else:
+        fg_chain = f"[{obs_input}:v]{build_key_filter(similarity, blend, fps, height or 1080, scaler)}[vt];"
+    bg_chain = f"fps={fps}" + (f",scale=-2:{height}:flags={scaler}" if height else "")
+    post = f",{post_filter}" if post_filter else ""
+    return fg_chain + f"[{bg_input}:v]{bg_chain}[bg];[bg][vt]overlay=(W-w)/2:(H-h)/2{post}[v]"
+
+def main():
+    # Subcommand: chroma key tuning preview (compositor.py preview <obs_video> ...)
+    if len(sys.argv) > 1 and sys.argv[1] == "preview":
+        from chroma_preview import preview_main
+        return preview_main(sys.argv[2:])
+
+    parser = argparse.ArgumentParser(description="Ghostless Compositor (Hybrid)")
+    parser.add_argument("scenario", help="Path to scenario.json")
+    parser.add_argument("obs_video", nargs="+", help="Path to the OBS recording (.mov/.mp4); for a session recorded in blocks or resumed, all of its recordings in order (stitched without re-encoding)")
+    parser.add_argument("--similarity", default=0.13, type=float, help="Chroma Key similarity (0.0-1.0)")
+    parser.add_argument("--blend", default=0.2, type=float, help="Chroma Key blend (0.0-1.0)")
+    parser.add_argument("--audio-offset", default=0.0, type=float, help="Audio sync offset in seconds (e.g. 0.2 to delay audio)")
+    parser.add_argument("--auto-sync", action="store_true", help="Measure the audio offset against the OBS audio track (FFT cross-correlation) and apply it")
+    parser.add_argument("--sync-drift", action="store_true", help="With --auto-sync, also measure per-window offsets and correct linear drift")
+    parser.add_argument("--sync-window", default=60.0, type=float, help="Window length in seconds for --sync-drift")
+    parser.add_argument("--output", default="final_output.mp4", help="Output filename")
+    parser.add_argument("--profiles", default="landscape", help=f"Comma-separated output profiles rendered in one pass ({', '.join(OUTPUT_PROFILES)}); extra profiles add a suffix to --output")
+    parser.add_argument("--keep-temp", action="store_true", help="Keep the job's temporary workspace")
+    parser.add_argument("--pipe-io", action="store_true", help="Stream the master audio and slide list to FFmpeg through pipes (no scratch files)")
+    parser.add_argument("--workspace-dir", help="Where to create the per-job scratch workspace (default: tmpfs if available)")
+    parser.add_argument("--report", help="Write a JSON timing report (wall time per stage, encode telemetry) to this path")
+    parser.add_argument("--segmented", action="store_true", help="Split at slide boundaries and encode segments in parallel")
+    parser.add_argument("--jobs", default=os.cpu_count() or 1, type=int, help="Parallel segment encodes for --segmented (default: all cores)")
+    parser.add_argument("--cache-dir", help="Incremental render cache directory (implies --segmented; only changed segments are re-encoded)")
+    parser.add_argument("--prekey", action="store_true", help="Key the OBS recording once into a cached alpha intermediate and overlay that")
+    parser.add_argument("--cache-size", default=20.0, type=float, help="Render cache size limit in GB (least recently used entries are evicted)")
+    parser.add_argument("--prekey-cache-dir", default=DEFAULT_PREKEY_CACHE_DIR, help="Where --prekey keeps its keyed intermediates (separate from --cache-dir)")
+    parser.add_argument("--prekey-cache-size", default=100.0, type=float, help="Keyed intermediate cache size limit in GB (about 40 GB per hour of recording)")
+    parser.add_argument("--encoder", default="auto", choices=["auto", *ENCODER_BACKENDS], help="Video encoder (default: fastest calibrated encoder on this host)")
+    parser.add_argument("--quality-target", default=DEFAULT_QUALITY_TARGET, type=float, help="Minimum calibration SSIM for --encoder auto")
+    parser.add_argument("--recalibrate-encoder", action="store_true", help="Ignore the cached encoder choice and re-run calibration")
+    parser.add_argument("--proxy", action="store_true", help="Fast low-resolution review render (reduced size/frame rate, cheap scaler, fastest preset; single pass, ignores --profiles/--encoder)")
+    parser.add_argument("--proxy-height", default=PROXY_HEIGHT, type=int, help="Frame height of the --proxy render")
+    parser.add_argument("--proxy-fps", default=PROXY_FPS, type=int, help="Frame rate of the --proxy render")
+    parser.add_argument("--proxy-overlay", action="store_true", help="With --proxy, burn in a timecode and the scene id of the current slide")
+    args = parser.parse_args()
+
+    # Load Scenario
+    with open(args.scenario, 'r', encoding='utf-8') as f:
+        scenario = json.load(f)
+
+    assets_dir = os.path.dirname(os.path.abspath(args.scenario))
+
+    # Private scratch space: concurrent renders never clobber each other's temp files
+    workspace = create_workspace(args.workspace_dir)
+    timer = StageTimer()
+    try:
+        summary = render(args, scenario, assets_dir, workspace, timer)
+        if args.report:
+            timer.write_report(args.report, **summary)
+    except subprocess.CalledProcessError as e:
+        print(f"FFmpeg failed: {e}")
+        sys.exit(1) # Non-zero so batch runs can detect and retry the failure
+    finally:
+        if args.keep_temp:
+            print(f"Temporary files kept in: {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+def render(args, scenario, assets_dir, workspace, timer=None, progress_callback=print_progress):
+    """
+    Runs the composite for parsed CLI arguments inside a private workspace.
+
+    Args:
+        timer (StageTimer): Collects wall time per stage (asset_prep, audio_mix,
+            concat_generation, encode).
+        progress_callback (callable): Receives live encode telemetry (see ffmpeg_runner.parse_progress).
+
+    Returns:
+        dict: Summary of the render (outputs, duration, encoder).
+    """
+    timer = timer or StageTimer()
+    progress_callback = timer.track_progress(progress_callback)
+
+    # --- Step 1: Prepare Assets (Speed Optimized) ---
+    print("[Step 1] Preparing Assets...")
+    ffmpeg_exe = get_ffmpeg_exe()
+
+    # Sessions recorded in blocks (or resumed) are joined back into one recording
+    obs_video, shifts = args.obs_video[0], None
+    recordings = load_recordings(assets_dir)
+    if len(args.obs_video) > 1 or len(recordings) > 1:
+        with timer.stage("stitch"):
+            files = resolve_recording_files(args.obs_video, recordings)
+            obs_video = os.path.join(workspace, "obs_stitched" + os.path.splitext(files[0])[1])
+            shifts = stitch_recordings(ffmpeg_exe, files, recordings, obs_video)
+
+    audio_offset, drift, sync = args.audio_offset, 0.0, None
+    if args.auto_sync:
+        # Measure against the unshifted mix; the timeline below is built with the result
+        with timer.stage("sync"):
+            _, raw_audio_events, raw_duration = build_timeline(scenario, assets_dir, 0.0, shifts=shifts)
+            sync = estimate_sync(ffmpeg_exe, obs_video, raw_audio_events, raw_duration,
+                                 drift=args.sync_drift, window=args.sync_window)
+            print(f"[Sync] Applying --audio-offset {sync['offset']:.3f}" + (f" (drift {sync['drift'] * 1e6:+.1f} ppm)" if sync["drift"] else ""))
+            audio_offset, drift = sync["offset"], sync["drift"]
+
+    with timer.stage("asset_prep"):
+        slide_events, audio_events, total_duration = build_timeline(scenario, assets_dir, audio_offset, drift, shifts)
+
+        # Fallback black image (the concat demuxer needs a real file)
+        black_img = ensure_black_image(os.path.join(workspace, "black.png"))
+
+        if args.proxy:
+            # One small review file; the fastest preset beats calibrating a backend for it
+            encoder = "libx264"
+            outputs = [{"name": "proxy", "path": args.output, "filter": "null", "codec_args": PROXY_CODEC_ARGS}]
+        else:
+            # Video encoder (shared by the single-pass and segmented renders)
+            encoder = args.encoder
+            if encoder == "auto":
+                encoder = select_encoder(ffmpeg_exe, args.quality_target, VIDEO_BITRATE, recalibrate=args.recalibrate_encoder)
+            outputs = resolve_outputs([p.strip() for p in args.profiles.split(",") if p.strip()], args.output, encoder)
+
+        cache = RenderCache(args.cache_dir, int(args.cache_size * 1024**3)) if args.cache_dir else None
+
+    # Scale + chroma key once per recording/key settings
+    obs_input = obs_video
+    prekeyed = False
+    if args.prekey:
+        with timer.stage("prekey"):
+            prekey_cache = RenderCache(args.prekey_cache_dir, int(args.prekey_cache_size * 1024**3))
+            intermediate = ensure_keyed_intermediate(ffmpeg_exe, obs_video, args.similarity, args.blend, prekey_cache, FPS)
+            if intermediate:
+                obs_input, prekeyed = intermediate, True
+
+    if args.proxy:
+        post_filter = None
+        if args.proxy_overlay:
+            overlay_path = write_overlay(os.path.join(workspace, "proxy_overlay.ass"), scenario,
+                                         slide_events, total_duration, args.proxy_height)
+            post_filter = overlay_filter(overlay_path)
+        print(f"[Proxy] Rendering {args.proxy_height}p @ {args.proxy_fps}fps review proxy")
+        filter_fn = lambda bg, obs: build_composite_filter(
+            bg, obs, args.similarity, args.blend, prekeyed=prekeyed,
+            fps=args.proxy_fps, height=args.proxy_height, scaler=PROXY_SCALER, post_filter=post_filter)
+    else:
+        filter_fn = lambda bg, obs: build_composite_filter(bg, obs, args.similarity, args.blend, prekeyed=prekeyed)
+
+    # 1. Master Audio (streaming block mixer, bounded memory)
+    with timer.stage("audio_mix"):
+        mixer = MasterAudioMixer(samplerate=44100)
+        manifest = voice_manifest(scenario, assets_dir)
+        for start, path in audio_events:
+            mixer.add(path, start, manifest.get(path))
+        if args.pipe_io:
+            # Streamed straight into FFmpeg during the encode, no WAV on disk
+            print("Master Audio will be streamed to FFmpeg.")
+            audio = AudioPipe(mixer.blocks(total_duration), mixer.samplerate, mixer.channels or 1)
+        else:
+            print("Generating Master Audio...")
+            audio = os.path.join(workspace, "master_audio.wav")
+            # Write audio file (WAV is faster and avoids codec issues)
+            mixer.write(audio, total_duration)
+
+    summary = {
+        "outputs": [out["path"] for out in outputs],
+        "profiles": [out["name"] for out in outputs],
+        "output_duration": total_duration,
+        "encoder": encoder,
+        "segmented": bool((args.segmented or cache) and not args.proxy),
+        "proxy": {"height": args.proxy_height, "fps": args.proxy_fps} if args.proxy else None,
+        "sync": {k: sync[k] for k in ("offset", "confidence", "drift")} if sync else None,
+    }
+
+    # Proxies are cheap enough that per-segment process startup would dominate
+    if summary["segmented"]:
+        # --- Step 2: Parallel Segmented Composition ---
+        print(f"[Step 2] Compositing with FFmpeg (Segmented, {args.jobs} jobs)...")
+        with timer.stage("encode"):
+            render_segmented(
+                ffmpeg_exe, slide_events, total_duration, obs_input, audio, outputs,
+                os.path.join(workspace, "segments"), black_img,
+                filter_fn=filter_fn,
+                fps=FPS, jobs=args.jobs, keep_temp=args.keep_temp,
+                cache=cache, progress_callback=progress_callback,
+            )
+        print(f"Success! Output saved to: {', '.join(summary['outputs'])}")
+        return summary
+
+    # 2. Slide Sequence (concat list on stdin with --pipe-io, else a file in the workspace)
     print("Generating Slide Sequence...")
-    concat_file = "temp_slides_concat.txt"
-    with open(concat_file, 'w', encoding='utf-8') as f:
-        # Ensure we cover from 0.0 to end
-        # FFmpeg concat: file, duration
-        # We need relative durations.
-        
-        # Add initial black/delay if first slide isn't at 0
-        current_head = 0.0
-        
-        # Fallback black image
-        black_img = "temp_black.png"
-        if not os.path.exists(black_img):
-             # Make a small black image using MoviePy purely for file generation? 
-             # Or Pillow.
-             from PIL import Image
-             Image.new('RGB', (1920, 1080), (0,0,0)).save(black_img)
-
-        sorted_slides = sorted(slide_events, key=lambda x: x[0])
-        
-        for i, (t, img_path) in enumerate(sorted_slides):
-            if not os.path.exists(img_path):
-                img_path = black_img
-                
-            # Gap before this slide?
-            if t > current_head:
-                gap = t - current_head
-                f.write(f"file '{os.path.abspath(black_img)}'\n")
-                f.write(f"duration {gap:.3f}\n")
-                current_head = t
-            
-            # Duration of this slide is until next slide or total_duration
-            if i < len(sorted_slides) - 1:
-                next_t = sorted_slides[i+1][0]
-                duration = next_t - t
-            else:
-                duration = total_duration - t
-            
-            # Sanity check
-            if duration < 0: duration = 0.1
-            
-            f.write(f"file '{os.path.abspath(img_path)}'\n")
-            f.write(f"duration {duration:.3f}\n")
-            current_head += duration
-            
-        # Add final entry again due to FFmpeg quirk? 
-        # "Due to a quirk, the last image has to be specified twice" - some docs say.
-        # Let's add a dummy entry to ensure the last duration holds?
-        # Actually standard practice is just listing them.
-        # But if the stream ends, we want it to hold? 
-        # We will set -t on output anyway.
-        # Let's duplicate the last image with a tiny duration just to close the stream safely.
-        if sorted_slides:
-            f.write(f"file '{os.path.abspath(sorted_slides[-1][1])}'\n")
-            # f.write(f"duration 1.0\n") # Just to make sure it exists
+    with timer.stage("concat_generation"):
+        concat_text = build_slides_concat(slide_events, total_duration, black_img)
+        if args.pipe_io:
+            slides_input = ["-f", "concat", "-safe", "0", "-protocol_whitelist", "file,pipe", "-i", "pipe:0"]
+        else:
+            concat_file = os.path.join(workspace, "slides_concat.txt")
+            with open(concat_file, 'w', encoding='utf-8') as f:
+                f.write(concat_text)
+            slides_input = ["-f", "concat", "-safe", "0", "-i", concat_file]
 
     # --- Step 2: Single Pass FFmpeg Composition ---
     print(f"[Step 2] Compositing with FFmpeg (Hybrid Concat+Overlay)...")
-    
-    ffmpeg_exe = get_ffmpeg_exe()
-    
+
     # Inputs:
     # 0: Slides (concat)
     # 1: Audio (master audio)
     # 2: OBS Video (greenscreen)
-    
+
+    # Decode and key once; the composite is split into one branch per output profile
+    graph, labels = build_split_graph(filter_fn(0, 2), outputs)
+    audio_pipe = audio if args.pipe_io else None
     cmd = [
         ffmpeg_exe,
         "-y",
-        "-f", "concat", "-safe", "0", "-i", concat_file, # Input 0: Slides
-        "-i", temp_audio, # Input 1: Audio
-        "-i", args.obs_video, # Input 2: OBS
-        # Scale OBS video to 1080p height (preserve aspect ratio), set fps to 30, chromakey, then overlay centered
-        # scale=-1:1080 -> Keep AR, height 1080
-        # flags=lanczos -> Better scaling quality
-        # fps=30 -> Smooth downsample from 60fps
-        # overlay=(W-w)/2:(H-h)/2 -> Center the character
-        f"-filter_complex", 
-        f"[2:v]fps=30,scale=-1:1080:flags=lanczos,chromakey=0x00FF00:{args.similarity}:{args.blend}[vt];[0:v]fps=30[bg];[bg][vt]overlay=(W-w)/2:(H-h)/2[v]",
-        "-map", "[v]",
-        "-map", "1:a",
-        "-c:v", "h264_videotoolbox", "-b:v", "8000k", # Increased bitrate slightly
-        "-c:a", "copy",
-        "-t", str(total_duration),
-        args.output
+        *slides_input, # Input 0: Slides
+        *(audio_pipe.input_args() if audio_pipe else ["-i", audio]), # Input 1: Audio
+        *(PROXY_DECODE_ARGS if args.proxy else []),
+        "-i", obs_input, # Input 2: OBS (or keyed intermediate)
+        "-filter_complex", graph,
     ]
-    
+    for label, out in zip(labels, outputs):
+        cmd += [
+            "-map", f"[{label}]",
+            "-map", "1:a",
+            *out["codec_args"],
+            "-c:a", "copy",
+            "-t", str(total_duration),
+            out["path"]
+        ]
+
     print("Executing FFmpeg command:")
     print(" ".join(cmd))
-    
-    try:
-        subprocess.run(cmd, check=True)
-        print(f"Success! Output saved to: {args.output}")
-        if not args.keep_temp:
-            if os.path.exists(temp_audio): os.remove(temp_audio)
-            if os.path.exists(concat_file): os.remove(concat_file)
-            if os.path.exists("temp_black.png"): os.remove("temp_black.png")
-    except subprocess.CalledProcessError as e:
-        print(f"FFmpeg failed: {e}")
+
+    with timer.stage("encode"):
+        run_ffmpeg(
+            cmd, stdin_data=concat_text if args.pipe_io else None, audio_pipe=audio_pipe,
+            progress_callback=progress_callback, total_duration=total_duration,
+        )
+    print(f"Success! Output saved to: {', '.join(summary['outputs'])}")
+    return summary
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,165 @@
+"""
+Encoder Backends Module
+Probes the bundled FFmpeg for the video encoders it actually has, calibrates them
+with a short test encode and picks the fastest one that meets the quality target.
+The choice is cached per machine.
+"""
+
+import os
+import re
+import json
+import time
+import socket
+import tempfile
+import subprocess
+
+# Encoder arguments per backend, in order of preference.
+# "{bitrate}" is replaced with the requested video bitrate.
+# Software encoders come last and act as the fallback on every host.
+ENCODER_BACKENDS = {
+    "h264_videotoolbox": ["-c:v", "h264_videotoolbox", "-b:v", "{bitrate}"],
+    "h264_nvenc": ["-c:v", "h264_nvenc", "-preset", "p4", "-b:v", "{bitrate}"],
+    "h264_qsv": ["-c:v", "h264_qsv", "-preset", "faster", "-b:v", "{bitrate}"],
+    "h264_amf": ["-c:v", "h264_amf", "-quality", "speed", "-b:v", "{bitrate}"],
+    "hevc_videotoolbox": ["-c:v", "hevc_videotoolbox", "-b:v", "{bitrate}", "-tag:v", "hvc1"],
+    "hevc_nvenc": ["-c:v", "hevc_nvenc", "-preset", "p4", "-b:v", "{bitrate}", "-tag:v", "hvc1"],
+    "libx264": ["-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-pix_fmt", "yuv420p"],
+    "libx265": ["-c:v", "libx265", "-preset", "fast", "-crf", "23", "-pix_fmt", "yuv420p", "-tag:v", "hvc1"],
+}
+
+FALLBACK_ENCODERS = ["libx264", "libx265"]
+
+# Everything else runs on a GPU/media engine with a limited number of concurrent sessions
+SOFTWARE_ENCODERS = {"libx264", "libx265"}
+
+DEFAULT_BITRATE = "8000k"
+DEFAULT_QUALITY_TARGET = 0.95 # Minimum SSIM of the calibration encode
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "ghostless", "encoders.json")
+
+# Short synthetic clip used for calibration (1080p30, 2 seconds)
+CALIBRATION_SOURCE = "testsrc2=size=1920x1080:rate=30:duration=2"
+
+def encoder_args(name, bitrate=DEFAULT_BITRATE):
+    """Returns the FFmpeg output arguments for an encoder backend."""
+    if name not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder: {name} (available: {', '.join(ENCODER_BACKENDS)})")
+    return [a.replace("{bitrate}", bitrate) for a in ENCODER_BACKENDS[name]]
+
+def is_hardware_encoder(name):
+    """True for backends with a hardware session limit (everything but the software encoders)."""
+    return name in ENCODER_BACKENDS and name not in SOFTWARE_ENCODERS
+
+def probe_encoders(ffmpeg_exe):
+    """Returns the known backends that the FFmpeg build lists, in order of preference."""
+    result = subprocess.run([ffmpeg_exe, "-hide_banner", "-encoders"], capture_output=True, text=True)
+    listed = set()
+    for line in result.stdout.splitlines():
+        # " V....D libx264              libx264 H.264 / AVC ..."
+        m = re.match(r"\s*V\S*\s+(\S+)", line)
+        if m:
+            listed.add(m.group(1))
+    return [name for name in ENCODER_BACKENDS if name in listed]
+
+def calibrate_encoder(ffmpeg_exe, name, bitrate=DEFAULT_BITRATE):
+    """
+    Runs a short test encode and measures its speed and quality.
+
+    Listed hardware encoders may still be unusable (no GPU, no driver), in which
+    case the encode fails and None is returned.
+
+    Returns:
+        dict: {"fps": float, "ssim": float} or None.
+    """
+    with tempfile.TemporaryDirectory(prefix="ghostless_enc_") as tmp:
+        out_path = os.path.join(tmp, "calibration.mp4")
+        cmd = [
+            ffmpeg_exe, "-y", "-v", "error",
+            "-f", "lavfi", "-i", CALIBRATION_SOURCE,
+            "-pix_fmt", "yuv420p",
+            *encoder_args(name, bitrate),
+            out_path
+        ]
+        t0 = time.time()
+        if subprocess.run(cmd, capture_output=True).returncode != 0:
+            return None
+        elapsed = time.time() - t0
+
+        # Compare against the same synthetic source
+        cmd = [
+            ffmpeg_exe, "-hide_banner",
+            "-i", out_path,
+            "-f", "lavfi", "-i", CALIBRATION_SOURCE,
+            "-lavfi", "[0:v]format=yuv420p[a];[1:v]format=yuv420p[b];[a][b]ssim",
+            "-f", "null", "-"
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        m = re.search(r"All:([0-9.]+)", result.stderr)
+        if result.returncode != 0 or not m:
+            return None
+
+    frames = 60 # 2 seconds at 30fps
+    return {"fps": frames / elapsed if elapsed > 0 else float('inf'), "ssim": float(m.group(1))}
+
+def _cache_key(ffmpeg_exe):
+    return f"{socket.gethostname()}|{os.path.abspath(ffmpeg_exe)}"
+
+def _load_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def select_encoder(ffmpeg_exe, quality_target=DEFAULT_QUALITY_TARGET, bitrate=DEFAULT_BITRATE,
+                   cache_path=CACHE_PATH, recalibrate=False):
+    """
+    Picks the fastest available encoder whose calibration SSIM meets `quality_target`.
+
+    Results are cached per host and FFmpeg binary; pass recalibrate=True after
+    driver or hardware changes.
+
+    Returns:
+        str: Encoder backend name.
+    """
+    cache = _load_cache(cache_path)
+    key = _cache_key(ffmpeg_exe)
+    entry = cache.get(key)
+    if entry and not recalibrate and entry.get("quality_target") == quality_target and entry.get("bitrate") == bitrate:
+        return entry["encoder"]
+
+    print("[Encoder] Calibrating available encoders...")
+    results = {}
+    for name in probe_encoders(ffmpeg_exe):
+        stats = calibrate_encoder(ffmpeg_exe, name, bitrate)
+        results[name] = stats
+        if stats:
+            print(f"[Encoder] {name}: {stats['fps']:.0f} fps, SSIM {stats['ssim']:.4f}")
+        else:
+            print(f"[Encoder] {name}: unavailable")
+
+    usable = [(name, s) for name, s in results.items() if s and s["ssim"] >= quality_target]
+    if usable:
+        best = max(usable, key=lambda item: item[1]["fps"])[0]
+    else:
+        # Nothing met the target: fall back to the tuned software presets
+        best = next((name for name in FALLBACK_ENCODERS if results.get(name)), FALLBACK_ENCODERS[0])
+    print(f"[Encoder] Selected {best}")
+
+    cache[key] = {
+        "encoder": best,
+        "quality_target": quality_target,
+        "bitrate": bitrate,
+        "results": results,
+        "calibrated_at": time.time(),
+    }
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    return best
+
+if __name__ == "__main__":
+    from imageio_ffmpeg import get_ffmpeg_exe
+    select_encoder(get_ffmpeg_exe(), recalibrate=True)
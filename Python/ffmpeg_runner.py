@@ -0,0 +1,168 @@
+"""
+FFmpeg Runner Module
+Runs FFmpeg with in-memory inputs (concat lists on stdin, mixed audio on a pipe)
+and creates private per-job workspaces for the scratch files that remain.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import subprocess
+
+# Use tmpfs for scratch space when it has room for a render's temp files
+TMPFS_DIR = "/dev/shm"
+TMPFS_MIN_FREE = 4 * 1024**3
+
+def create_workspace(base_dir=None, prefix="ghostless_"):
+    """
+    Creates a private scratch directory for one render job.
+
+    Defaults to tmpfs (/dev/shm) when available with enough free space, otherwise
+    the system temp directory. Concurrent jobs never share scratch files.
+    """
+    if base_dir is None:
+        if os.path.isdir(TMPFS_DIR) and os.access(TMPFS_DIR, os.W_OK) \
+                and shutil.disk_usage(TMPFS_DIR).free >= TMPFS_MIN_FREE:
+            base_dir = TMPFS_DIR
+        else:
+            base_dir = tempfile.gettempdir()
+    os.makedirs(base_dir, exist_ok=True)
+    return tempfile.mkdtemp(prefix=prefix, dir=base_dir)
+
+class AudioPipe:
+    """Feeds mixed audio blocks to FFmpeg through an anonymous pipe (no WAV on disk)."""
+
+    def __init__(self, blocks, samplerate, channels):
+        """
+        Args:
+            blocks (iterable): float32 (n, channels) blocks, e.g. MasterAudioMixer.blocks().
+        """
+        if os.name == 'nt':
+            raise RuntimeError("Piped audio requires a POSIX system (pass_fds).")
+        self.blocks = blocks
+        self.samplerate = samplerate
+        self.channels = channels
+        self.read_fd, self.write_fd = os.pipe()
+        self.error = None
+
+    def input_args(self):
+        """FFmpeg input arguments reading raw 16-bit PCM from the pipe."""
+        return ["-f", "s16le", "-ar", str(self.samplerate), "-ac", str(self.channels), "-i", f"pipe:{self.read_fd}"]
+
+    def _write(self):
+        try:
+            with os.fdopen(self.write_fd, 'wb') as f:
+                for block in self.blocks:
+                    f.write((block * 32767.0).astype('<i2').tobytes())
+        except BrokenPipeError:
+            pass # FFmpeg stopped reading (e.g. -t reached)
+        except Exception as e:
+            self.error = e
+
+    def start(self):
+        os.close(self.read_fd) # The child owns the read end now
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def join(self):
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+def parse_progress(block, total_duration=None):
+    """
+    Converts one block of FFmpeg -progress output into telemetry.
+
+    Returns:
+        dict: frame, fps, bitrate_kbps, out_time, speed, eta (None when unknown) and done.
+    """
+    def number(value):
+        try:
+            return float(value.rstrip("x").replace("kbits/s", ""))
+        except (AttributeError, ValueError):
+            return None
+
+    out_time_us = number(block.get("out_time_us"))
+    out_time = out_time_us / 1e6 if out_time_us is not None else None
+    speed = number(block.get("speed"))
+    eta = None
+    if total_duration and out_time is not None and speed:
+        eta = max(0.0, (total_duration - out_time) / speed)
+    return {
+        "frame": int(number(block.get("frame")) or 0),
+        "fps": number(block.get("fps")),
+        "bitrate_kbps": number(block.get("bitrate")),
+        "out_time": out_time,
+        "speed": speed,
+        "eta": eta,
+        "done": block.get("progress") == "end",
+    }
+
+def concat_file_line(path):
+    """A concat demuxer "file" directive for `path` (absolute, with single quotes escaped)."""
+    quoted = os.path.abspath(path).replace("'", "'\\''")
+    return f"file 'file:{quoted}'"
+
+def print_progress(progress):
+    """Default progress callback: a single updating console line."""
+    def fmt(value, spec, suffix=""):
+        return "-" if value is None else f"{value:{spec}}{suffix}"
+    line = (
+        f"frame={progress['frame']} fps={fmt(progress['fps'], '.1f')} "
+        f"speed={fmt(progress['speed'], '.2f', 'x')} bitrate={fmt(progress['bitrate_kbps'], '.0f', 'kbps')} "
+        f"eta={fmt(progress['eta'], '.0f', 's')}"
+    )
+    print(f"\r{line:<80}", end="\n" if progress["done"] else "", flush=True)
+
+def run_ffmpeg(cmd, stdin_data=None, audio_pipe=None, progress_callback=None, total_duration=None):
+    """
+    Runs an FFmpeg command, optionally feeding stdin and a piped audio input.
+
+    Args:
+        progress_callback (callable): Called with parse_progress() telemetry for each
+            update of FFmpeg's machine-readable progress stream.
+        total_duration (float): Expected output duration, used for the ETA.
+
+    Raises:
+        subprocess.CalledProcessError: If FFmpeg exits with an error.
+    """
+    if progress_callback:
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    pass_fds = (audio_pipe.read_fd,) if audio_pipe else ()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if stdin_data is not None else None,
+        stdout=subprocess.PIPE if progress_callback else None,
+        pass_fds=pass_fds,
+    )
+    if audio_pipe:
+        audio_pipe.start()
+
+    if stdin_data is not None:
+        # Written from a thread so a large concat list can't deadlock against the audio pipe
+        def feed():
+            try:
+                proc.stdin.write(stdin_data.encode('utf-8'))
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+
+    if progress_callback:
+        # key=value lines, each block terminated by progress=continue|end
+        block = {}
+        for line in proc.stdout:
+            key, _, value = line.decode('utf-8', 'replace').strip().partition("=")
+            block[key] = value
+            if key == "progress":
+                progress_callback(parse_progress(block, total_duration))
+                block = {}
+
+    returncode = proc.wait()
+    if audio_pipe:
+        audio_pipe.join()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return returncode
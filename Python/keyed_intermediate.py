@@ -0,0 +1,88 @@
+"""
+Keyed Intermediate Module
+Scales and chroma-keys the OBS recording once and caches the result as an
+alpha-channel intermediate, so later composites only have to overlay it.
+"""
+
+import os
+import math
+import tempfile
+import subprocess
+
+from render_cache import hash_inputs, media_fingerprint
+from media_probe import get_video_duration
+
+# Bump when the intermediate format or the key filter changes
+INTERMEDIATE_VERSION = 2
+
+# Lossless FFV1 keeps the alpha channel at a fraction of ProRes 4444's size (the
+# keyed-out background compresses well); every frame is a keyframe (accurate seeks)
+INTERMEDIATE_EXT = ".mkv"
+INTERMEDIATE_CODEC_ARGS = ["-c:v", "ffv1", "-level", "3", "-g", "1", "-slices", "16", "-slicecrc", "0", "-pix_fmt", "yuva420p"]
+
+# Conservative FFV1 data rate at 1080p30 (about 40 GB per hour; ProRes 4444 needs ~150)
+INTERMEDIATE_BYTES_PER_SECOND = 12 * 1024**2
+
+def build_key_filter(similarity, blend, fps=30, height=1080, scaler="lanczos"):
+    """Returns the scale + chroma key chain applied to the OBS recording."""
+    return f"fps={fps},scale=-1:{height}:flags={scaler},chromakey=0x00FF00:{similarity}:{blend}"
+
+def estimate_intermediate_bytes(ffmpeg_exe, obs_video, fps=30):
+    """Rough size of the keyed intermediate of a recording (1080p, `fps`)."""
+    return int(get_video_duration(ffmpeg_exe, obs_video) * INTERMEDIATE_BYTES_PER_SECOND * fps / 30)
+
+def ensure_keyed_intermediate(ffmpeg_exe, obs_video, similarity, blend, cache, fps=30):
+    """
+    Returns the path of the keyed intermediate for a recording, rendering it on a cache miss.
+
+    The cache key covers the recording's fingerprint and the key parameters, so
+    changing --similarity/--blend or re-recording produces a new intermediate.
+
+    Returns None (key inline instead) when the intermediate would not fit in the
+    cache: storing it would evict every other entry and still exceed the limit.
+
+    Args:
+        cache (RenderCache): Intermediate cache, kept apart from the segment cache
+            so both have their own size budget (--prekey-cache-size).
+    """
+    key_filter = build_key_filter(similarity, blend, fps)
+    key = hash_inputs(
+        kind="keyed_intermediate",
+        version=INTERMEDIATE_VERSION,
+        obs=media_fingerprint(obs_video),
+        filter=key_filter,
+    )
+    cached = cache.get(key, ext=INTERMEDIATE_EXT)
+    if cached:
+        print(f"[Prekey] Using cached keyed intermediate: {cached}")
+        return cached
+
+    estimate = estimate_intermediate_bytes(ffmpeg_exe, obs_video, fps)
+    if estimate > cache.max_bytes:
+        needed = math.ceil(estimate / 1024**3)
+        print(f"[Prekey] WARNING: Not prekeying: the keyed intermediate needs about {estimate / 1024**3:.1f} GB, "
+              f"more than the {cache.max_bytes / 1024**3:.1f} GB intermediate cache. Keying inline instead; "
+              f"pass --prekey-cache-size {needed} (or more) to prekey this recording.")
+        return None
+
+    print("[Prekey] Rendering keyed intermediate (one-time per recording/key settings)...")
+    fd, tmp_path = tempfile.mkstemp(suffix=INTERMEDIATE_EXT, dir=cache.cache_dir)
+    os.close(fd)
+    cmd = [
+        ffmpeg_exe,
+        "-y",
+        "-i", obs_video,
+        "-vf", key_filter,
+        "-an",
+        *INTERMEDIATE_CODEC_ARGS,
+        tmp_path
+    ]
+    print(" ".join(cmd))
+    try:
+        subprocess.run(cmd, check=True)
+    except subprocess.CalledProcessError:
+        if os.path.exists(tmp_path): os.remove(tmp_path)
+        raise
+    path = cache.put(key, tmp_path, ext=INTERMEDIATE_EXT)
+    cache.evict(keep=[path])
+    return path
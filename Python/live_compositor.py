@@ -0,0 +1,305 @@
+"""
+Live Compositor Module
+Composites the OBS recording while it is still being recorded: each finalized
+chunk (a split file, or a window of a growing MKV) is keyed and encoded against
+the slide events already logged for its time range. When the recording stops
+only the last chunk, the audio mix and a stream-copy join remain.
+
+Usage (start before or during the recording):
+    python live_compositor.py assets/scenario.json --watch-dir ~/Movies/obs
+    python live_compositor.py assets/scenario.json --growing-file ~/Movies/obs/rec.mkv
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import subprocess
+from imageio_ffmpeg import get_ffmpeg_exe
+
+from audio_mixer import MasterAudioMixer
+from compositor import FPS, VIDEO_BITRATE, build_composite_filter, build_timeline, ensure_black_image
+from encoder_backends import ENCODER_BACKENDS, DEFAULT_QUALITY_TARGET, select_encoder
+from output_profiles import OUTPUT_PROFILES, resolve_outputs
+from segmented_render import build_segment_cmd, join_segments, plan_segments
+from ffmpeg_runner import create_workspace
+from media_probe import get_video_duration
+from recording_stitch import recording_start
+
+# Extensions OBS records to
+RECORDING_PATTERNS = ("*.mkv", "*.mp4", "*.mov", "*.flv")
+
+def _file_settled(path, settle):
+    """True once the file has not been modified for `settle` seconds."""
+    return time.time() - os.path.getmtime(path) >= settle
+
+class SplitFileSource:
+    """Chunks of an OBS split recording: every file but the newest is final."""
+
+    def __init__(self, ffmpeg_exe, watch_dir, patterns=RECORDING_PATTERNS, settle=3.0):
+        self.ffmpeg_exe = ffmpeg_exe
+        self.watch_dir = watch_dir
+        self.patterns = patterns
+        self.settle = settle
+        self.since = None
+        self.files_done = 0
+        self.offset = 0.0 # Timeline position of the next file's first frame
+        self.done = False
+
+    def _files(self):
+        files = set()
+        for pattern in self.patterns:
+            files.update(glob.glob(os.path.join(self.watch_dir, pattern)))
+        files = [f for f in files if os.path.getmtime(f) >= self.since]
+        # The file being written is always the most recently modified one
+        return sorted(files, key=lambda f: (os.path.getmtime(f), f))
+
+    def poll(self, log, elapsed):
+        """
+        Returns the chunks that became final since the last call.
+
+        Args:
+            elapsed (float): How far the recording has progressed (file time).
+
+        Returns:
+            list: dicts with path, offset (timeline time of the file's start),
+            start, end (None for the last chunk: runs to the end of the timeline).
+        """
+        if self.since is None:
+            # OBS starts recording shortly before T=0 of the log
+            self.since = log["start_time"] - 10.0
+        files = self._files()
+        if log.get("finished") and not files:
+            raise RuntimeError(f"Recording finished but no recording files were found in {self.watch_dir}")
+        final = len(files) - 1
+        if log.get("finished") and files and _file_settled(files[-1], self.settle):
+            final = len(files)
+
+        chunks = []
+        while self.files_done < final:
+            path = files[self.files_done]
+            duration = get_video_duration(self.ffmpeg_exe, path)
+            last = self.files_done == len(files) - 1 and final == len(files)
+            chunks.append({
+                "path": path,
+                "offset": self.offset,
+                "start": self.offset,
+                "end": None if last else self.offset + duration,
+            })
+            self.offset += duration
+            self.files_done += 1
+        if final == len(files) and files:
+            self.done = True
+        return chunks
+
+class GrowingFileSource:
+    """Fixed windows of a single recording that is still being written (MKV)."""
+
+    def __init__(self, path, window=10.0, margin=2.0, settle=3.0):
+        """
+        Args:
+            window (float): Chunk length in seconds.
+            margin (float): How far the recording must be past a window before it is
+                read (OBS buffers a few seconds before they reach the file).
+        """
+        self.path = path
+        self.window = window
+        self.margin = margin
+        self.settle = settle
+        self.next_start = 0.0
+        self.done = False
+
+    def poll(self, log, elapsed):
+        if not os.path.exists(self.path):
+            return []
+        chunks = []
+        while self.next_start + self.window + self.margin <= elapsed:
+            chunks.append({"path": self.path, "offset": 0.0, "start": self.next_start, "end": self.next_start + self.window})
+            self.next_start += self.window
+        if log.get("finished") and _file_settled(self.path, self.settle):
+            chunks.append({"path": self.path, "offset": 0.0, "start": self.next_start, "end": None})
+            self.done = True
+        return chunks
+
+def clip_segments(segments, start_frame, end_frame):
+    """Restricts planned segments to the frame range [start_frame, end_frame)."""
+    clipped = []
+    for seg in segments:
+        a = max(seg["start_frame"], start_frame)
+        b = min(seg["start_frame"] + seg["frames"], end_frame)
+        if b > a:
+            clipped.append({**seg, "start_frame": a, "frames": b - a})
+    return clipped
+
+class LiveCompositor:
+    def __init__(self, ffmpeg_exe, scenario, assets_dir, source, outputs, workspace,
+                 similarity=0.13, blend=0.2, audio_offset=0.0, fps=FPS, threads=0):
+        """
+        Initialize the live compositor.
+
+        Args:
+            source (SplitFileSource or GrowingFileSource): Yields finalized chunks.
+            outputs (list): Output descriptions (see output_profiles.resolve_outputs).
+            workspace (str): Private scratch directory for the chunk segments.
+        """
+        self.ffmpeg_exe = ffmpeg_exe
+        self.scenario = scenario
+        self.assets_dir = assets_dir
+        self.source = source
+        self.outputs = outputs
+        self.workspace = workspace
+        self.audio_offset = audio_offset
+        self.fps = fps
+        self.threads = threads
+        self.log_path = os.path.join(assets_dir, "recording_log.json")
+        self.filter_complex = build_composite_filter(0, 1, similarity, blend)
+        self.black_img = ensure_black_image(os.path.join(workspace, "black.png"))
+        self.segments_dir = os.path.join(workspace, "segments")
+        os.makedirs(self.segments_dir, exist_ok=True)
+        self.seg_paths = [[] for _ in outputs] # seg_paths[output][segment]
+        self.rendered_frames = 0 # Timeline frames composited so far
+        self.origin = 0.0 # Log time of the OBS file's first frame (timeline 0), see wait_for_recording()
+
+    def _read_log(self):
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def wait_for_recording(self, poll=1.0):
+        """
+        Waits until recording_log.json belongs to a recording that started after launch
+        and the director has logged where the OBS file begins (self.origin).
+        """
+        launched = time.time()
+        print(f"[Live] Waiting for the recording to start ({self.log_path})...")
+        while True:
+            log = self._read_log()
+            if (log and log.get("start_time") and (not log.get("finished") or log["start_time"] >= launched)
+                    and recording_start(log) is not None):
+                # Same convention as the offline build_timeline: composite on the OBS file's time
+                self.origin = recording_start(log)
+                print(f"[Live] Recording detected (file starts at log time {self.origin:.3f}s).")
+                return log
+            time.sleep(poll)
+
+    def _elapsed(self, log):
+        """Recording progress in file time."""
+        return log.get("elapsed", 0.0) - self.origin
+
+    def _slide_events(self, log):
+        images_dir = os.path.join(self.assets_dir, "images")
+        return [(e["time"] - self.origin, os.path.join(images_dir, e["file"])) for e in log["events"] if e["type"] == "slide"]
+
+    def render_chunk(self, chunk, log, end_time):
+        """Encodes the timeline range of one chunk (video only), split at slide changes."""
+        start_frame = self.rendered_frames
+        end_frame = int(round(end_time * self.fps))
+        if end_frame <= start_frame:
+            return
+        # Slide events up to the end of the chunk are final (the log is past it)
+        segments = clip_segments(plan_segments(self._slide_events(log), end_frame / self.fps, self.black_img, self.fps), start_frame, end_frame)
+        t0 = time.perf_counter()
+        for seg in segments:
+            index = len(self.seg_paths[0])
+            out_paths = [
+                os.path.abspath(os.path.join(self.segments_dir, f"segment_{index:04d}_{out['name']}.mp4"))
+                for out in self.outputs
+            ]
+            cmd = build_segment_cmd(self.ffmpeg_exe, seg, chunk["path"], out_paths, self.filter_complex,
+                                    self.outputs, self.fps, self.threads, obs_offset=chunk["offset"])
+            subprocess.run(cmd, check=True)
+            for o, path in enumerate(out_paths):
+                self.seg_paths[o].append(path)
+        self.rendered_frames = end_frame
+        elapsed = time.perf_counter() - t0
+        length = (end_frame - start_frame) / self.fps
+        print(f"[Live] Composited {start_frame / self.fps:.1f}-{end_frame / self.fps:.1f}s "
+              f"({len(segments)} segments) in {elapsed:.1f}s ({length / elapsed:.2f}x realtime)")
+
+    def run(self, poll=1.0):
+        """Follows the recording until it is finished, then writes the outputs."""
+        log = self.wait_for_recording(poll)
+        pending = []
+        while True:
+            log = self._read_log() or log
+            pending += self.source.poll(log, self._elapsed(log))
+            # A chunk is composited once the log is past its end (all its slide changes are known)
+            while pending and pending[0]["end"] is not None and self._elapsed(log) >= pending[0]["end"]:
+                chunk = pending.pop(0)
+                self.render_chunk(chunk, log, chunk["end"])
+            if self.source.done and log.get("finished"):
+                break
+            time.sleep(poll)
+
+        t_end = time.perf_counter()
+        print("[Live] Recording finished, compositing the remainder...")
+        slide_events, audio_events, total_duration = build_timeline(self.scenario, self.assets_dir, self.audio_offset)
+        for chunk in pending:
+            # The last chunk runs to the end of the timeline (the overlay holds its last frame)
+            self.render_chunk(chunk, log, total_duration if chunk["end"] is None else min(chunk["end"], total_duration))
+
+        mixer = MasterAudioMixer(samplerate=44100)
+        for start, path in audio_events:
+            mixer.add(path, start)
+        audio = os.path.join(self.workspace, "master_audio.wav")
+        mixer.write(audio, total_duration)
+        join_segments(self.ffmpeg_exe, self.seg_paths, audio, self.outputs, total_duration, self.segments_dir)
+        print(f"[Live] Final video ready {time.perf_counter() - t_end:.1f}s after the recording ended.")
+        return [out["path"] for out in self.outputs]
+
+def main():
+    parser = argparse.ArgumentParser(description="Ghostless Live Compositor")
+    parser.add_argument("scenario", help="Path to scenario.json (recording_log.json is followed next to it)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--watch-dir", help="OBS recording directory with split files (run_prototype.py --live-split or OBS automatic splitting)")
+    source.add_argument("--growing-file", help="Single recording that is still being written (MKV)")
+    parser.add_argument("--window", default=10.0, type=float, help="Chunk length in seconds for --growing-file")
+    parser.add_argument("--similarity", default=0.13, type=float, help="Chroma Key similarity (0.0-1.0)")
+    parser.add_argument("--blend", default=0.2, type=float, help="Chroma Key blend (0.0-1.0)")
+    parser.add_argument("--audio-offset", default=0.0, type=float, help="Audio sync offset in seconds")
+    parser.add_argument("--output", default="final_output.mp4", help="Output filename")
+    parser.add_argument("--profiles", default="landscape", help=f"Comma-separated output profiles ({', '.join(OUTPUT_PROFILES)})")
+    parser.add_argument("--encoder", default="auto", choices=["auto", *ENCODER_BACKENDS], help="Video encoder (default: fastest calibrated encoder on this host)")
+    parser.add_argument("--threads", default=0, type=int, help="FFmpeg threads per chunk encode (0: auto)")
+    parser.add_argument("--poll", default=1.0, type=float, help="Polling interval in seconds")
+    parser.add_argument("--keep-temp", action="store_true", help="Keep the job's temporary workspace")
+    parser.add_argument("--workspace-dir", help="Where to create the scratch workspace (default: tmpfs if available)")
+    args = parser.parse_args()
+
+    with open(args.scenario, 'r', encoding='utf-8') as f:
+        scenario = json.load(f)
+    assets_dir = os.path.dirname(os.path.abspath(args.scenario))
+
+    ffmpeg_exe = get_ffmpeg_exe()
+    encoder = args.encoder
+    if encoder == "auto":
+        encoder = select_encoder(ffmpeg_exe, DEFAULT_QUALITY_TARGET, VIDEO_BITRATE)
+    outputs = resolve_outputs([p.strip() for p in args.profiles.split(",") if p.strip()], args.output, encoder)
+
+    if args.watch_dir:
+        source = SplitFileSource(ffmpeg_exe, args.watch_dir)
+    else:
+        source = GrowingFileSource(args.growing_file, window=args.window)
+
+    workspace = create_workspace(args.workspace_dir)
+    try:
+        compositor = LiveCompositor(ffmpeg_exe, scenario, assets_dir, source, outputs, workspace,
+                                    args.similarity, args.blend, args.audio_offset, threads=args.threads)
+        paths = compositor.run(args.poll)
+        print(f"Success! Output saved to: {', '.join(paths)}")
+    except subprocess.CalledProcessError as e:
+        print(f"FFmpeg failed: {e}")
+        sys.exit(1)
+    finally:
+        if args.keep_temp:
+            print(f"Temporary files kept in: {workspace}")
+        else:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
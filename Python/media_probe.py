@@ -0,0 +1,17 @@
+"""
+Media Probe Module
+Small helpers that read stream information through the bundled FFmpeg binary
+(imageio-ffmpeg does not ship ffprobe).
+"""
+
+import re
+import subprocess
+
+def get_video_duration(ffmpeg_exe, path):
+    """Returns the container duration in seconds (parsed from FFmpeg's input banner)."""
+    result = subprocess.run([ffmpeg_exe, "-hide_banner", "-i", path], capture_output=True, text=True)
+    m = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", result.stderr)
+    if not m:
+        raise ValueError(f"Could not read duration of {path}")
+    hours, minutes, seconds = m.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
@@ -0,0 +1,57 @@
+"""
+Output Profiles Module
+Publishing variants rendered from a single decode/key pass: the composite is
+split once in the FFmpeg graph and each branch is scaled/cropped and encoded.
+"""
+
+import os
+
+from encoder_backends import encoder_args
+
+# filter: applied to the 1920x1080 composite, bitrate: for bitrate-driven encoders
+OUTPUT_PROFILES = {
+    "landscape": {"filter": "null", "bitrate": "8000k", "suffix": ""},
+    "720p": {"filter": "scale=1280:720:flags=bicubic", "bitrate": "4000k", "suffix": "_720p"},
+    # 9:16 center cut (the character is overlaid centered)
+    "vertical": {"filter": "crop=ih*9/16:ih,scale=1080:1920:flags=lanczos", "bitrate": "6000k", "suffix": "_vertical"},
+}
+
+def resolve_outputs(profile_names, output, encoder):
+    """
+    Expands profile names into output descriptions.
+
+    The first profile writes to `output`; the others add their suffix to it
+    (e.g. final_output_720p.mp4).
+
+    Returns:
+        list: dicts with name, path, filter and codec_args.
+    """
+    base, ext = os.path.splitext(output)
+    outputs = []
+    for i, name in enumerate(profile_names):
+        if name not in OUTPUT_PROFILES:
+            raise ValueError(f"Unknown output profile: {name} (available: {', '.join(OUTPUT_PROFILES)})")
+        profile = OUTPUT_PROFILES[name]
+        outputs.append({
+            "name": name,
+            "path": output if i == 0 else f"{base}{profile['suffix'] or '_' + name}{ext}",
+            "filter": profile["filter"],
+            "codec_args": encoder_args(encoder, profile["bitrate"]),
+        })
+    return outputs
+
+def build_split_graph(filter_complex, outputs, src_label="v"):
+    """
+    Appends a split of [src_label] into one branch per output.
+
+    Returns:
+        tuple: (filter_complex, labels) where labels[i] is the output pad for outputs[i].
+    """
+    if len(outputs) == 1 and outputs[0]["filter"] == "null":
+        return filter_complex, [src_label]
+    labels = [f"out{i}" for i in range(len(outputs))]
+    split_pads = "".join(f"[s{i}]" for i in range(len(outputs)))
+    graph = f"{filter_complex};[{src_label}]split={len(outputs)}{split_pads}"
+    for i, out in enumerate(outputs):
+        graph += f";[s{i}]{out['filter']}[{labels[i]}]"
+    return graph, labels
@@ -0,0 +1,118 @@
+"""
+Audio Prefetch Module
+Decodes upcoming voice files on a background thread into a memory-bounded LRU
+cache, so playback starts from RAM instead of paying disk/decode latency on the cue.
+"""
+
+import os
+import queue
+import threading
+from collections import OrderedDict
+import soundfile as sf
+
+class AudioPrefetcher:
+    def __init__(self, voice_dir, lookahead=3, max_bytes=512 * 1024**2):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            voice_dir (str): Directory of the voice WAVs.
+            lookahead (int): Number of upcoming scenes to keep decoded.
+            max_bytes (int): Memory limit of the decoded buffers (least recently used are dropped).
+        """
+        self.voice_dir = voice_dir
+        self.lookahead = lookahead
+        self.max_bytes = max_bytes
+        self._cache = OrderedDict() # filename -> (data, samplerate)
+        self._bytes = 0
+        self._loading = set()
+        self._cond = threading.Condition()
+        self._queue = queue.Queue()
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0 # Requested while its prefetch was still decoding
+        self.evictions = 0
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def _load(self, filename):
+        path = os.path.join(self.voice_dir, filename)
+        if not os.path.exists(path):
+            return None
+        return sf.read(path, dtype='float32')
+
+    def _store(self, filename, audio):
+        """Adds a decoded buffer and evicts the least recently used ones over the limit. Caller holds the lock."""
+        size = audio[0].nbytes
+        if size > self.max_bytes:
+            return # Would evict everything else; play it uncached
+        self._cache[filename] = audio
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (old_data, _) = self._cache.popitem(last=False)
+            self._bytes -= old_data.nbytes
+            self.evictions += 1
+
+    def _worker(self):
+        while True:
+            filename = self._queue.get()
+            if filename is None:
+                return
+            try:
+                audio = self._load(filename)
+            except Exception as e:
+                print(f"[Prefetch] Failed to decode {filename}: {e}")
+                audio = None
+            with self._cond:
+                self._loading.discard(filename)
+                if audio is not None and filename not in self._cache:
+                    self._store(filename, audio)
+                self._cond.notify_all()
+
+    def prefetch(self, filenames):
+        """Queues voice files for background decoding (already cached/queued ones are skipped)."""
+        with self._cond:
+            for filename in filenames:
+                if not filename or filename in self._cache or filename in self._loading:
+                    continue
+                self._loading.add(filename)
+                self._queue.put(filename)
+
+    def get(self, filename):
+        """
+        Returns (data, samplerate) for a voice file, or None if it does not exist.
+
+        Served from RAM when prefetched; waits for an in-flight prefetch rather than
+        decoding twice; decodes synchronously (a miss) otherwise.
+        """
+        with self._cond:
+            if filename in self._loading:
+                self.waits += 1
+                self._cond.wait_for(lambda: filename not in self._loading)
+            if filename in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(filename)
+                return self._cache[filename]
+            self.misses += 1
+        audio = self._load(filename)
+        if audio is not None:
+            with self._cond:
+                if filename not in self._cache:
+                    self._store(filename, audio)
+        return audio
+
+    def stats(self):
+        with self._cond:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "waits": self.waits,
+                "evictions": self.evictions,
+                "cached_files": len(self._cache),
+                "cached_mb": self._bytes / 1024**2,
+            }
+
+    def close(self):
+        """Stops the background thread."""
+        self._queue.put(None)
+        self._thread.join()
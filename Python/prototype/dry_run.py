@@ -0,0 +1,111 @@
+"""
+Dry Run Module
+Simulated clock and local stand-ins for OBS, OSC and audio output, so a scenario
+can be run through SceneDirector in milliseconds without OBS, Unity or a sound device.
+Only the interfaces of the real backends are mirrored here; none of them (or
+their OBS / PortAudio dependencies) is imported.
+"""
+
+import asyncio
+import threading
+
+class VirtualClock:
+    """Clock that only advances when slept on: every deadline is hit exactly."""
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, seconds):
+        """Moves the clock forward outside the event loop (e.g. blocking waits)."""
+        self.time += seconds
+
+    async def sleep(self, seconds):
+        self.time += max(0.0, seconds)
+        # Still yield, so background tasks started by handlers get to run
+        await asyncio.sleep(0)
+
+class DryRunTransport:
+    """Stand-in for OscTransport (VirtualActor's transport): records messages instead of sending them."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = [] # (time, address, value)
+
+    def set(self, address, *values):
+        self.sent.append((self.clock(), address, values[0] if len(values) == 1 else list(values)))
+
+    def flush(self, timestamp=None):
+        pass
+
+    def send(self, address, *values):
+        self.set(address, *values)
+
+    def close(self):
+        pass
+
+class DryRunObs:
+    """Stand-in for ObsController: records the requests at their simulated time."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.requests = [] # (time, request)
+
+    def _request(self, name):
+        self.requests.append((self.clock(), name))
+        print(f"[OBS] (dry run) {name}")
+
+    def start_recording(self):
+        self._request("StartRecord")
+
+    def stop_recording(self):
+        self._request("StopRecord")
+        return None
+
+    def split_recording(self):
+        self._request("SplitRecordFile")
+
+    def disconnect(self):
+        pass
+
+class DryRunLine:
+    """Same fields as playback_engine.Playback, for a line that "starts" immediately."""
+
+    def __init__(self, data, start_at):
+        self.data = data
+        self.start_at = start_at
+        self.position = 0
+        self.start_time = None
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class DryRunPlayback:
+    """Stand-in for PlaybackEngine: nothing is played, every line starts exactly when requested."""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def start(self):
+        print("[Playback] (dry run) No output stream")
+
+    def time(self):
+        return self.clock()
+
+    def play(self, data, samplerate, at=None):
+        playback = DryRunLine(data, at)
+        playback.start_time = self.clock() if at is None else at
+        playback.started.set()
+        playback.done.set()
+        return playback
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
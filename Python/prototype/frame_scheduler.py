@@ -0,0 +1,128 @@
+"""
+Frame Scheduler Module
+Fixed-timestep loop for the procedural senders: frames are due on an absolute
+grid (start + n / fps) of a monotonic clock, so the rate never drifts with the
+work done per frame. Waits sleep coarsely and spin the last stretch for
+sub-millisecond wake-ups. Overruns either catch up (run the missed frames
+back to back) or skip to the next deadline.
+
+Usage:
+    scheduler = FrameScheduler(60)
+    for frame in scheduler:
+        update(frame.time, frame.dt)
+"""
+
+import time
+from collections import deque, namedtuple
+
+# Final approach to a deadline spent busy-waiting instead of sleeping (seconds)
+SPIN_WINDOW = 0.002
+
+# Frames kept for the live statistics
+STATS_WINDOW = 600
+
+POLICIES = ("skip", "catch_up")
+
+# index: frame number on the grid; time: its scheduled time since start (use it
+# to animate, not the wake-up time); dt: time since the previous frame;
+# lateness: how late the frame started (s)
+Frame = namedtuple("Frame", ["index", "time", "dt", "lateness"])
+
+class FrameScheduler:
+    def __init__(self, fps, policy="skip", max_catch_up=5, spin_window=SPIN_WINDOW,
+                 clock=time.perf_counter, sleep=time.sleep):
+        """
+        Initialize the scheduler.
+
+        Args:
+            fps (float): Target frame rate.
+            policy (str): After an overrun, "skip" jumps to the next future deadline
+                (dt covers the gap); "catch_up" runs the missed frames back to back,
+                at most `max_catch_up` of them, then skips the rest.
+            spin_window (float): Busy-wait this long before each deadline (0: sleep only).
+            clock (callable): Monotonic clock in seconds.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}' (expected one of {', '.join(POLICIES)})")
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self.spin_window = spin_window
+        self.clock = clock
+        self.sleep = sleep
+        self.frames = 0
+        self.overruns = 0 # Deadlines missed by more than a frame
+        self.skipped = 0 # Frames dropped to get back on schedule
+        self._lateness = deque(maxlen=STATS_WINDOW)
+        self._starts = deque(maxlen=STATS_WINDOW)
+
+    def wait_until(self, deadline):
+        """Sleeps until shortly before `deadline`, then spins until it is reached."""
+        remaining = deadline - self.clock()
+        if remaining > self.spin_window:
+            self.sleep(remaining - self.spin_window)
+        while self.clock() < deadline:
+            pass
+
+    def __iter__(self):
+        start = self.clock()
+        index = 0
+        previous_time = 0.0
+        behind = 0 # Consecutive catch-up frames
+        while True:
+            deadline = start + index * self.period
+            self.wait_until(deadline)
+            now = self.clock()
+            lateness = now - deadline
+
+            if lateness > self.period:
+                if behind == 0:
+                    self.overruns += 1
+                missed = int(lateness / self.period)
+                if self.policy == "catch_up" and behind < self.max_catch_up:
+                    behind += 1 # Run this (late) frame now, the next one right after
+                else:
+                    # Drop the missed frames and run the most recent one due
+                    self.skipped += missed
+                    index += missed
+                    deadline = start + index * self.period
+                    lateness = now - deadline
+                    behind = 0
+            else:
+                behind = 0
+
+            frame_time = index * self.period
+            self.frames += 1
+            self._lateness.append(lateness)
+            self._starts.append(now)
+            yield Frame(index, frame_time, frame_time - previous_time, lateness)
+            previous_time = frame_time
+            index += 1
+
+    def stats(self):
+        """
+        Live statistics over the last STATS_WINDOW frames.
+
+        Returns:
+            dict: fps (achieved), jitter_p50_ms / jitter_p99_ms (start lateness),
+            overruns and skipped frames (totals).
+        """
+        fps = 0.0
+        if len(self._starts) > 1:
+            fps = (len(self._starts) - 1) / max(self._starts[-1] - self._starts[0], 1e-9)
+        lateness = sorted(self._lateness)
+        def percentile(p):
+            return lateness[min(len(lateness) - 1, int(len(lateness) * p))] * 1000 if lateness else 0.0
+        return {
+            "fps": fps,
+            "jitter_p50_ms": percentile(0.50),
+            "jitter_p99_ms": percentile(0.99),
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+        }
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"{s['fps']:.1f}/{self.fps:g} fps, jitter p50 {s['jitter_p50_ms']:.2f} ms "
+                f"p99 {s['jitter_p99_ms']:.2f} ms, {s['overruns']} overruns, {s['skipped']} skipped")
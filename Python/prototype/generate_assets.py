@@ -1,21 +1,60 @@
 """
 Generate Dummy Assets
-Creates dummy WAV files and empty PNG files for testing the prototype.
+Creates dummy WAV files and empty PNG files for testing the prototype, and
+speech-like voice sets for synthetic benchmark scenarios.
 """
 
 import os
 import numpy as np
 import soundfile as sf
 
-def create_sine_wave(filename, duration_sec, freq=440.0, sample_rate=44100):
+def create_sine_wave(filename, duration_sec, freq=440.0, sample_rate=44100, out_dir="assets/voice"):
     t = np.linspace(0, duration_sec, int(sample_rate * duration_sec), False)
     # Generate a simple sine wave
     audio_data = 0.5 * np.sin(2 * np.pi * freq * t)
     
-    path = os.path.join("assets/voice", filename)
+    path = os.path.join(out_dir, filename)
     sf.write(path, audio_data, sample_rate)
     print(f"Created audio: {path} ({duration_sec}s)")
 
+def create_speech_like_wave(path, duration_sec, rng, sample_rate=44100):
+    """
+    Writes a voice stand-in: voiced "syllables" (harmonic bursts with a gliding
+    pitch) separated by short pauses. Unlike a steady sine it has the envelope
+    structure of speech, so sync estimation and lip-sync analysis behave realistically.
+    """
+    audio_data = np.zeros(int(sample_rate * duration_sec), dtype=np.float32)
+    pos = int(rng.uniform(0.05, 0.2) * sample_rate)
+    while pos < len(audio_data):
+        n = min(int(rng.uniform(0.08, 0.3) * sample_rate), len(audio_data) - pos)
+        t = np.arange(n) / sample_rate
+        f0 = rng.uniform(110.0, 260.0) * (1.0 + rng.uniform(-0.15, 0.15) * t / max(t[-1], 1e-3))
+        phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+        burst = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * np.arange(n) / n) ** 2
+        audio_data[pos:pos + n] = 0.3 * burst * envelope
+        pos += n + int(rng.uniform(0.03, 0.25) * sample_rate)
+    sf.write(path, audio_data, sample_rate)
+    return path
+
+def generate_voice_set(voice_dir, count, min_sec=2.0, max_sec=8.0, seed=0, sample_rate=44100):
+    """
+    Creates `count` speech-like WAVs (audio-1.wav ...) with random durations.
+
+    Returns:
+        list: File names in scene order.
+    """
+    os.makedirs(voice_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    files = []
+    for i in range(1, count + 1):
+        filename = f"audio-{i}.wav"
+        duration = round(float(rng.uniform(min_sec, max_sec)), 2)
+        create_speech_like_wave(os.path.join(voice_dir, filename), duration, rng, sample_rate)
+        files.append(filename)
+    print(f"Created {count} voice files in {voice_dir}")
+    return files
+
 def create_dummy_image(filename):
     path = os.path.join("assets/images", filename)
     # Create an empty file just to satisfy existence checks if implemented
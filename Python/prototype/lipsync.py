@@ -0,0 +1,189 @@
+"""
+Lip Sync Module
+Computes per-frame mouth envelopes (openness + a coarse a/i/u/e/o viseme estimate)
+for the voice WAVs ahead of time and caches them beside the audio. During playback
+the frames are streamed over OSC, paced by the output stream's clock, so the live
+path only indexes an array.
+
+Usage (optional, the director computes missing envelopes on startup):
+    python lipsync.py assets/scenario.json [--fps 60]
+"""
+
+import os
+import sys
+import json
+import asyncio
+import argparse
+import numpy as np
+import soundfile as sf
+
+LIPSYNC_FPS = 60
+ENVELOPE_VERSION = 1
+CACHE_SUFFIX = ".lipsync.npz"
+
+# Envelope columns: mouth openness, then VRM viseme weights
+CHANNELS = ("open", "aa", "ih", "ou", "ee", "oh")
+CLOSED = np.zeros(len(CHANNELS), dtype=np.float32)
+
+# Bands (Hz) roughly covering F1 and F2 of the vowels
+BANDS = ((200, 600), (600, 1200), (1200, 2400), (2400, 4800))
+# Typical share of energy per band for each vowel (a, i, u, e, o)
+VOWEL_PROFILES = np.array([
+    [0.20, 0.45, 0.25, 0.10], # aa: high F1
+    [0.45, 0.10, 0.15, 0.30], # ih: low F1, high F2
+    [0.60, 0.25, 0.10, 0.05], # ou: low F1 and F2
+    [0.35, 0.20, 0.30, 0.15], # ee: mid F1, high-ish F2
+    [0.40, 0.40, 0.15, 0.05], # oh: mid F1, low F2
+], dtype=np.float32)
+VOWEL_SHARPNESS = 12.0 # Softmax temperature of the profile match
+
+SILENCE_DB = -50.0 # Frames below this RMS keep the mouth closed
+ATTACK = 0.6 # Smoothing per frame when opening / closing (1 = no smoothing)
+RELEASE = 0.3
+CHUNK_FRAMES = 1024 # Frames analyzed per FFT batch (bounds memory on long lines)
+
+def _band_matrix(n_fft, samplerate):
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / samplerate)
+    return np.stack([(freqs >= lo) & (freqs < hi) for lo, hi in BANDS], axis=1).astype(np.float32)
+
+def _smooth(values, attack=ATTACK, release=RELEASE):
+    """Asymmetric one-pole smoothing: the mouth opens quickly and closes more slowly."""
+    out = np.empty_like(values)
+    state = 0.0
+    for i, v in enumerate(values):
+        state += (attack if v > state else release) * (v - state)
+        out[i] = state
+    return out
+
+def compute_envelope(data, samplerate, fps=LIPSYNC_FPS):
+    """
+    Analyzes a voice buffer into one mouth frame per 1/fps seconds.
+
+    Args:
+        data (np.ndarray): Samples (mono or multichannel).
+
+    Returns:
+        np.ndarray: float32 array (frames, len(CHANNELS)); viseme weights are
+        scaled by the openness, so a closed mouth is all zeros.
+    """
+    data = np.asarray(data, dtype=np.float32)
+    if data.ndim > 1:
+        data = data.mean(axis=1)
+    hop = samplerate / fps
+    n_frames = int(np.ceil(len(data) / hop))
+    win = int(2 * hop) & ~1
+    window = np.hanning(win).astype(np.float32)
+    window_power = float(np.mean(window ** 2))
+    bands = _band_matrix(win, samplerate)
+
+    # Frames centred on each video frame (zero-padded at both ends)
+    padded = np.pad(data, (win, win))
+    starts = (np.arange(n_frames) * hop + hop / 2 - win / 2).astype(np.int64) + win
+    rms = np.empty(n_frames, dtype=np.float32)
+    shares = np.empty((n_frames, len(BANDS)), dtype=np.float32)
+    offsets = np.arange(win)
+    for first in range(0, n_frames, CHUNK_FRAMES):
+        chunk = padded[starts[first:first + CHUNK_FRAMES, None] + offsets] * window
+        rms[first:first + len(chunk)] = np.sqrt(np.mean(chunk ** 2, axis=1) / window_power)
+        energy = (np.abs(np.fft.rfft(chunk, axis=1)) ** 2) @ bands
+        shares[first:first + len(chunk)] = energy / np.maximum(energy.sum(axis=1, keepdims=True), 1e-12)
+
+    # Openness relative to the line's own loudness, gated below SILENCE_DB
+    level_db = 20 * np.log10(np.maximum(rms, 1e-9))
+    reference = np.percentile(rms[level_db > SILENCE_DB], 95) if np.any(level_db > SILENCE_DB) else 1.0
+    openness = np.clip(rms / reference, 0.0, 1.0) ** 0.7
+    openness[level_db <= SILENCE_DB] = 0.0
+    openness = _smooth(openness)
+
+    # Closest vowel profiles (softmax over negative distances)
+    distance = np.linalg.norm(shares[:, None, :] - VOWEL_PROFILES[None, :, :], axis=2)
+    scores = np.exp(-VOWEL_SHARPNESS * (distance - distance.min(axis=1, keepdims=True)))
+    visemes = scores / scores.sum(axis=1, keepdims=True)
+
+    envelope = np.empty((n_frames, len(CHANNELS)), dtype=np.float32)
+    envelope[:, 0] = openness
+    envelope[:, 1:] = visemes * openness[:, None]
+    return envelope
+
+def cache_path(wav_path):
+    return os.path.splitext(wav_path)[0] + CACHE_SUFFIX
+
+def load_envelope(wav_path, fps=LIPSYNC_FPS):
+    """
+    Returns the envelope of a voice file, from its cache when it is up to date.
+
+    The cache (next to the WAV) is recomputed when the WAV, the frame rate or
+    the analysis version changes.
+    """
+    stat = os.stat(wav_path)
+    path = cache_path(wav_path)
+    if os.path.exists(path):
+        try:
+            with np.load(path) as cached:
+                if (int(cached["version"]) == ENVELOPE_VERSION and int(cached["fps"]) == fps
+                        and int(cached["source_size"]) == stat.st_size
+                        and int(cached["source_mtime_ns"]) == stat.st_mtime_ns):
+                    return cached["envelope"]
+        except Exception as e:
+            print(f"[LipSync] Ignoring unreadable cache {path}: {e}")
+
+    data, samplerate = sf.read(wav_path, dtype='float32')
+    envelope = compute_envelope(data, samplerate, fps)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, envelope=envelope, fps=fps, version=ENVELOPE_VERSION,
+             source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+    os.replace(tmp_path, path)
+    return envelope
+
+def load_scenario_envelopes(scenes, voice_dir, fps=LIPSYNC_FPS):
+    """Envelopes of every scene's voice file (missing files are skipped)."""
+    envelopes = {}
+    for scene in scenes:
+        filename = scene.get("voice_file")
+        path = os.path.join(voice_dir, filename or "")
+        if filename and filename not in envelopes and os.path.isfile(path):
+            envelopes[filename] = load_envelope(path, fps)
+    return envelopes
+
+async def stream_envelope(envelope, playback, clock, send, fps=LIPSYNC_FPS):
+    """
+    Sends each envelope frame when the audio reaches it, then closes the mouth.
+
+    Args:
+        playback: Started Playback handle (start_time on the clock below).
+        clock (callable): Audio stream clock (PlaybackEngine.time).
+        send (callable): Receives one envelope row per frame.
+
+    Frames are indexed from the stream position, so a late wake-up skips
+    frames instead of falling behind the audio.
+    """
+    sent = -1
+    while not playback.cancelled:
+        position = clock() - playback.start_time
+        frame = int(position * fps)
+        if frame >= len(envelope):
+            break
+        if frame > sent and frame >= 0:
+            send(envelope[frame])
+            sent = frame
+        await asyncio.sleep(max(0.0, (max(frame, -1) + 1) / fps - position))
+    send(CLOSED)
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute lip-sync envelopes for a scenario's voice files")
+    parser.add_argument("scenario", help="Path to scenario.json")
+    parser.add_argument("--fps", default=LIPSYNC_FPS, type=int, help="Mouth frames per second")
+    args = parser.parse_args()
+
+    with open(args.scenario, 'r', encoding='utf-8') as f:
+        scenario = json.load(f)
+    voice_dir = os.path.join(os.path.dirname(os.path.abspath(args.scenario)), "voice")
+    envelopes = load_scenario_envelopes(scenario.get("scenes", []), voice_dir, args.fps)
+    if not envelopes:
+        print(f"[LipSync] No voice files found in {voice_dir}")
+        sys.exit(1)
+    frames = sum(len(e) for e in envelopes.values())
+    print(f"[LipSync] {len(envelopes)} envelopes, {frames} frames ({frames / args.fps:.1f}s) cached beside the WAVs")
+
+if __name__ == "__main__":
+    main()
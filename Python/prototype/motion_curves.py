@@ -0,0 +1,132 @@
+"""
+Motion Curves Module
+Baked procedural motion: one float32 curve per parameter sampled at a fixed
+frame rate, stored in a compact binary file. Playback memory-maps the file and
+interpolates at any target rate, so idle motion costs an array lookup per
+frame and is identical on every take.
+
+File layout (little-endian):
+    header   "GLMC", version (u16), reserved (u16), fps (f64),
+             frames (u32), parameters (u32), names size (u32)
+    names    parameter names, UTF-8, newline separated (padded to 16 bytes)
+    curves   float32 [parameters][frames], one contiguous array per parameter
+
+Usage (bake with scripts/bake_motion.py):
+    python motion_curves.py idle.curves [--fps 90] [--loop] [--port 9000]
+"""
+
+import os
+import struct
+import argparse
+import numpy as np
+
+from osc_transport import get_transport
+from frame_scheduler import FrameScheduler
+
+MAGIC = b"GLMC"
+CURVES_VERSION = 1
+HEADER = struct.Struct("<4sHHdIII")
+ALIGN = 16
+CURVES_SUFFIX = ".curves"
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+def write_curves(path, names, curves, fps):
+    """
+    Writes baked curves.
+
+    Args:
+        names (list): Parameter names.
+        curves (np.ndarray): (parameters, frames) values, frame k at k / fps seconds.
+        fps (float): Bake frame rate.
+    """
+    curves = np.ascontiguousarray(curves, dtype="<f4")
+    if curves.ndim != 2 or curves.shape[0] != len(names):
+        raise ValueError(f"Expected ({len(names)}, frames) curves, got {curves.shape}")
+    encoded = "\n".join(names).encode("utf-8")
+    header = HEADER.pack(MAGIC, CURVES_VERSION, 0, float(fps), curves.shape[1], len(names), len(encoded))
+    data_offset = _align(HEADER.size + len(encoded))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header + encoded)
+        f.write(b"\x00" * (data_offset - HEADER.size - len(encoded)))
+        f.write(curves.tobytes())
+    os.replace(tmp_path, path)
+
+class MotionCurves:
+    def __init__(self, path):
+        """
+        Opens a curve file (memory-mapped; only the frames sampled are read).
+        """
+        with open(path, "rb") as f:
+            magic, version, _, fps, frames, count, names_size = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a motion curve file")
+            if version != CURVES_VERSION:
+                raise ValueError(f"{path}: unsupported curve version {version} (expected {CURVES_VERSION})")
+            self.names = f.read(names_size).decode("utf-8").split("\n") if count else []
+        if frames < 1:
+            raise ValueError(f"{path} has no frames")
+        self.path = path
+        self.fps = fps
+        self.frames = frames
+        self.duration = (frames - 1) / fps
+        self.curves = np.memmap(path, dtype="<f4", mode="r", offset=_align(HEADER.size + names_size),
+                                shape=(count, frames))
+
+    def sample(self, t, loop=False):
+        """
+        Values of every parameter at time `t`, linearly interpolated between frames.
+
+        Args:
+            t (float): Seconds from the start of the bake.
+            loop (bool): Wrap around at the end (otherwise the last frame holds).
+
+        Returns:
+            np.ndarray: One float32 value per parameter, in `names` order.
+        """
+        position = t * self.fps
+        if loop and self.frames > 1:
+            position %= self.frames - 1
+        position = min(max(position, 0.0), self.frames - 1)
+        index = int(position)
+        frac = position - index
+        if frac == 0.0 or index + 1 >= self.frames:
+            return np.array(self.curves[:, index])
+        pair = self.curves[:, index:index + 2]
+        return pair[:, 0] + (pair[:, 1] - pair[:, 0]) * np.float32(frac)
+
+    def values(self, t, loop=False):
+        """sample() as a {name: value} dict."""
+        return dict(zip(self.names, self.sample(t, loop).tolist()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream baked motion curves over OSC")
+    parser.add_argument("curves", help=f"Curve file ({CURVES_SUFFIX})")
+    parser.add_argument("--ip", default="127.0.0.1")
+    parser.add_argument("--port", default=9000, type=int)
+    parser.add_argument("--prefix", default="/avatar/parameters/", help="OSC address prefix")
+    parser.add_argument("--fps", default=None, type=float, help="Playback rate (default: the bake rate)")
+    parser.add_argument("--loop", action="store_true", help="Loop instead of stopping at the end")
+    args = parser.parse_args()
+
+    curves = MotionCurves(args.curves)
+    fps = args.fps or curves.fps
+    transport = get_transport(args.ip, args.port)
+    addresses = [args.prefix + name for name in curves.names]
+    print(f"[Curves] {len(curves.names)} parameters, {curves.duration:.1f}s baked at {curves.fps:g} fps, "
+          f"playing at {fps:g} fps -> {args.ip}:{args.port}")
+
+    try:
+        for frame in FrameScheduler(fps):
+            if frame.time > curves.duration and not args.loop:
+                break
+            transport.set_floats(addresses, curves.sample(frame.time, args.loop).tolist())
+            transport.flush()
+    except KeyboardInterrupt:
+        print("\nStopping...")
+
+if __name__ == "__main__":
+    main()
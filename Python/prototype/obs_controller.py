@@ -54,6 +54,21 @@ class ObsController:
         else:
             print("[OBS] Client not connected. Skipping Stop Recording.")
 
+    def split_recording(self):
+        """
+        Finalizes the current recording file and continues in a new one.
+
+        Requires OBS 30+ with "Automatic File Splitting" enabled in the output settings.
+        """
+        if self.client:
+            try:
+                self.client.send("SplitRecordFile")
+                print("[OBS] Recording Split.")
+            except Exception as e:
+                print(f"[OBS] Failed to split recording: {e}")
+        else:
+            print("[OBS] Client not connected. Skipping Split Recording.")
+
     def disconnect(self):
         """Disconnects the client (if applicable)."""
         # obs-websocket-py handles cleanup usually, but we can explicit close if needed
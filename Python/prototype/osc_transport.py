@@ -0,0 +1,168 @@
+"""
+OSC Transport Module
+One UDP socket per destination, shared by every sender in the process (actor,
+lip sync, procedural loops). Parameters written during a frame are coalesced
+(last write wins) and sent as a single timetagged OSC bundle, so Unity applies
+the frame at once and the packet count drops to one per frame.
+"""
+
+import time
+import socket
+import struct
+import threading
+
+# Seconds between the NTP epoch (1900) and the Unix epoch (1970)
+NTP_DELTA = 2208988800
+IMMEDIATELY = b"\x00\x00\x00\x00\x00\x00\x00\x01"
+BUNDLE_TAG = b"#bundle\x00"
+FLOAT_TAG = b",f\x00\x00"
+
+# Keep datagrams below the usual loopback/LAN limits; larger frames are split
+MAX_DATAGRAM = 8192
+
+def _pad(data):
+    """OSC strings/blobs are null-terminated and padded to 4 bytes."""
+    return data + b"\x00" * (4 - len(data) % 4)
+
+def encode_timetag(t):
+    """NTP timetag for Unix time `t` (None: immediately)."""
+    if t is None:
+        return IMMEDIATELY
+    seconds, fraction = divmod(t + NTP_DELTA, 1.0)
+    return struct.pack(">II", int(seconds), int(fraction * (1 << 32)))
+
+def encode_arguments(values):
+    """Type tag string and packed arguments (float32, int32, string, bool)."""
+    tags = [","]
+    payload = []
+    for value in values:
+        if isinstance(value, bool):
+            tags.append("T" if value else "F")
+        elif isinstance(value, int):
+            tags.append("i")
+            payload.append(struct.pack(">i", value))
+        elif isinstance(value, float):
+            tags.append("f")
+            payload.append(struct.pack(">f", value))
+        elif isinstance(value, str):
+            tags.append("s")
+            payload.append(_pad(value.encode("utf-8")))
+        else:
+            # numpy scalars and the like
+            tags.append("f")
+            payload.append(struct.pack(">f", float(value)))
+    return _pad("".join(tags).encode("ascii")) + b"".join(payload)
+
+class OscTransport:
+    def __init__(self, ip="127.0.0.1", port=9000, latency=0.0):
+        """
+        Initialize the transport (use get_transport() to share one per destination).
+
+        Args:
+            latency (float): Timetag each bundle this far in the future, so the
+                receiver can apply it on schedule (0: "immediately").
+        """
+        self.address = (ip, port)
+        self.latency = latency
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._addresses = {} # address -> pre-encoded pattern
+        self._pending = {} # address -> encoded arguments, in first-write order
+        self._lock = threading.Lock()
+        self.packets = 0
+        self.messages = 0
+        self.coalesced = 0 # Writes replaced by a later write in the same frame
+
+    def _encode_message(self, address, arguments):
+        pattern = self._addresses.get(address)
+        if pattern is None:
+            pattern = self._addresses[address] = _pad(address.encode("ascii"))
+        return pattern + arguments
+
+    def set(self, address, *values):
+        """Stages a parameter for the next flush(); a later write to the same address replaces it."""
+        arguments = encode_arguments(values)
+        with self._lock:
+            if address in self._pending:
+                self.coalesced += 1
+            self._pending[address] = arguments
+
+    def set_floats(self, addresses, values):
+        """
+        Stages one float per address in a single pack (e.g. a row of a vectorized engine).
+
+        Args:
+            addresses (list): OSC addresses.
+            values (sequence): Floats in the same order (a NumPy row works).
+        """
+        packed = struct.pack(f">{len(addresses)}f", *values)
+        with self._lock:
+            for i, address in enumerate(addresses):
+                if address in self._pending:
+                    self.coalesced += 1
+                self._pending[address] = FLOAT_TAG + packed[4 * i:4 * i + 4]
+
+    def flush(self, timestamp=None):
+        """
+        Sends everything staged since the last flush as one bundle.
+
+        Args:
+            timestamp (float): Unix time the frame applies to (default: now + latency,
+                or "immediately" without latency).
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, {}
+        if timestamp is None and self.latency:
+            timestamp = time.time() + self.latency
+        header = BUNDLE_TAG + encode_timetag(timestamp)
+
+        datagram = header
+        for address, arguments in pending.items():
+            message = self._encode_message(address, arguments)
+            element = struct.pack(">i", len(message)) + message
+            if len(datagram) + len(element) > MAX_DATAGRAM and len(datagram) > len(header):
+                self._send(datagram)
+                datagram = header
+            datagram += element
+        self._send(datagram)
+        with self._lock:
+            self.messages += len(pending)
+
+    def send(self, address, *values):
+        """
+        Sends one message right away (events such as gesture triggers).
+
+        The message goes out on its own: parameters other senders staged for
+        the current frame stay pending until their flush(), so frames remain atomic.
+        """
+        self._send(self._encode_message(address, encode_arguments(values)))
+        with self._lock:
+            self.messages += 1
+
+    def _send(self, datagram):
+        try:
+            self._sock.sendto(datagram, self.address)
+        except OSError as e:
+            print(f"[OSC] Error sending bundle: {e}")
+            return
+        with self._lock:
+            self.packets += 1
+
+    def stats(self):
+        with self._lock:
+            return {"packets": self.packets, "messages": self.messages, "coalesced": self.coalesced}
+
+    def close(self):
+        self._sock.close()
+
+_transports = {}
+_transports_lock = threading.Lock()
+
+def get_transport(ip="127.0.0.1", port=9000):
+    """Returns the process-wide transport for a destination (created on first use)."""
+    with _transports_lock:
+        transport = _transports.get((ip, port))
+        if transport is None:
+            transport = _transports[(ip, port)] = OscTransport(ip, port)
+        return transport
@@ -0,0 +1,154 @@
+"""
+Playback Engine Module
+Keeps one PortAudio output stream open for the whole session and mixes queued
+voice buffers in its callback. Lines can be scheduled to start at an exact time,
+and every start is reported with the stream's DAC timestamp.
+"""
+
+import time
+import queue
+import threading
+import numpy as np
+import sounddevice as sd
+
+class Playback:
+    """Handle of a queued buffer: start time (when it reached the DAC) and completion."""
+
+    def __init__(self, data, start_at):
+        self.data = data
+        self.start_at = start_at # Requested start on the stream clock (None: as soon as possible)
+        self.position = 0
+        self.start_time = None # DAC time of the first sample, on the engine's clock
+        self.started = threading.Event()
+        self.done = threading.Event()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+class PlaybackEngine:
+    def __init__(self, samplerate, channels=2, device=None, latency='low', clock=time.monotonic):
+        """
+        Initialize the engine (the stream opens on start()).
+
+        Args:
+            samplerate (int): Session sample rate; buffers at other rates are resampled on queueing.
+            channels (int): Output channels; mono buffers are copied to every channel.
+            clock (callable): Clock used for play(at=...) and reported start times
+                (the scheduler's monotonic clock).
+        """
+        self.samplerate = samplerate
+        self.channels = channels
+        self.device = device
+        self.latency = latency
+        self.clock = clock
+        self.stream = None
+        self._incoming = queue.SimpleQueue()
+        self._active = []
+        self._clock_offset = 0.0 # clock() - stream.time
+        self.underflows = 0
+
+    def start(self):
+        """Opens the output stream (kept running, outputting silence between lines)."""
+        self.stream = sd.OutputStream(
+            samplerate=self.samplerate, channels=self.channels, dtype='float32',
+            device=self.device, latency=self.latency, callback=self._callback,
+        )
+        self.stream.start()
+        self._clock_offset = self.clock() - self.stream.time
+        print(f"[Playback] Output stream open: {self.samplerate} Hz, {self.channels} ch, "
+              f"latency {self.stream.latency * 1000:.1f} ms")
+
+    def time(self):
+        """Current time of the output stream's clock, on the engine's clock (what is being heard now)."""
+        return self.stream.time + self._clock_offset
+
+    def _prepare(self, data, samplerate):
+        """Converts a buffer to the stream's rate and channel count (off the audio thread)."""
+        data = np.asarray(data, dtype=np.float32)
+        if data.ndim == 1:
+            data = data[:, None]
+        if samplerate != self.samplerate and len(data) > 1:
+            n_out = int(round(len(data) * self.samplerate / samplerate))
+            src = np.arange(n_out) * (samplerate / self.samplerate)
+            data = np.stack([np.interp(src, np.arange(len(data)), data[:, c]) for c in range(data.shape[1])], axis=1).astype(np.float32)
+        if data.shape[1] != self.channels:
+            if data.shape[1] == 1:
+                data = np.repeat(data, self.channels, axis=1)
+            else:
+                mono = data.mean(axis=1, keepdims=True)
+                data = np.repeat(mono, self.channels, axis=1)
+        return np.ascontiguousarray(data)
+
+    def play(self, data, samplerate, at=None):
+        """
+        Queues a buffer for playback.
+
+        Args:
+            at (float): Start time on the engine's clock; the first sample is placed
+                at that exact stream position when it is far enough ahead (more than
+                the output latency). None starts at the next buffer.
+
+        Returns:
+            Playback: Handle whose start_time is the DAC time of the first sample.
+        """
+        start_at = None if at is None else at - self._clock_offset
+        playback = Playback(self._prepare(data, samplerate), start_at)
+        self._incoming.put(playback)
+        return playback
+
+    def _callback(self, outdata, frames, time_info, status):
+        if status.output_underflow:
+            self.underflows += 1
+        outdata.fill(0)
+        while True:
+            try:
+                self._active.append(self._incoming.get_nowait())
+            except queue.Empty:
+                break
+
+        # Stream time at which the first sample of this buffer reaches the DAC
+        dac = time_info.outputBufferDacTime or (time_info.currentTime + self.stream.latency)
+        finished = []
+        for pb in self._active:
+            if pb.cancelled:
+                finished.append(pb)
+                continue
+            offset = 0
+            if pb.position == 0:
+                if pb.start_at is not None:
+                    offset = int(round((pb.start_at - dac) * self.samplerate))
+                    if offset >= frames:
+                        continue # Starts in a later buffer
+                    offset = max(0, offset) # Late: start right away
+                pb.start_time = dac + offset / self.samplerate + self._clock_offset
+                pb.started.set()
+            n = min(frames - offset, len(pb.data) - pb.position)
+            outdata[offset:offset + n] += pb.data[pb.position:pb.position + n]
+            pb.position += n
+            if pb.position >= len(pb.data):
+                finished.append(pb)
+        for pb in finished:
+            self._active.remove(pb)
+            pb.done.set()
+        np.clip(outdata, -1.0, 1.0, out=outdata)
+
+    def stop(self):
+        """Drops everything queued or playing."""
+        for pb in list(self._active):
+            pb.cancel()
+        while True:
+            try:
+                pb = self._incoming.get_nowait()
+            except queue.Empty:
+                break
+            pb.cancel()
+            pb.done.set()
+
+    def close(self):
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+            if self.underflows:
+                print(f"[Playback] {self.underflows} output underflows")
@@ -0,0 +1,181 @@
+"""
+Procedural Engine Module
+Idle "life" motion (breathing, sway, blinks, drifting expressions) for any
+number of avatars. The state of every parameter of every avatar lives in NumPy
+arrays (avatars x parameters) and one vectorized step advances the blink state
+machines, noise targets and sine layers of all of them per frame.
+"""
+
+import math
+import numpy as np
+
+from osc_transport import get_transport
+
+ADDRESS_PREFIX = "/avatar/parameters/"
+
+# (name, kind, settings) per parameter; defaults match simulacra_v2.py
+#   sine:  offset + amp * sin(freq * t + phase)
+#   noise: moves toward a random target in [min, max] at `speed`/s, then holds 0.5-2s
+#   blink: eyelid closure 0-1 from the blink state machine
+DEFAULT_PARAMETERS = [
+    ("HeadYaw", "noise", {"speed": 0.3, "min": -0.5, "max": 0.5}),
+    ("HeadPitch", "sine", {"amp": 0.1, "freq": 0.3, "phase": math.pi / 2}),
+    ("BodySway", "sine", {"amp": 1.0, "freq": 0.5}),
+    ("Breath", "sine", {"offset": 0.5, "amp": 0.5, "freq": 1.5}),
+    ("EyeBlink", "blink", {}),
+    ("BrowsUp", "noise", {"speed": 0.2, "min": 0.0, "max": 0.4}),
+    ("MouthSmile", "noise", {"speed": 0.1, "min": 0.0, "max": 0.3}),
+]
+
+# Blink state machine (same timings as simulacra_v2.BlinkController)
+BLINK_OPEN, BLINK_CLOSING, BLINK_CLOSED, BLINK_OPENING = range(4)
+BLINK_CLOSE = 0.1
+BLINK_HOLD = 0.05
+BLINK_REOPEN = 0.15
+BLINK_INTERVAL = (2.0, 6.0)
+DOUBLE_BLINK_CHANCE = 0.2
+NOISE_HOLD = (0.5, 2.0)
+
+class ProceduralEngine:
+    def __init__(self, avatars, parameters=DEFAULT_PARAMETERS, seed=None, desync=True):
+        """
+        Initialize the engine.
+
+        Args:
+            avatars (list): Avatar endpoints, dicts {ip, port, prefix} (prefix defaults
+                to ADDRESS_PREFIX), or an int count when nothing is sent.
+            parameters (list): (name, kind, settings) tuples, see DEFAULT_PARAMETERS.
+            seed (int): Seed of the engine's random generator (reproducible motion).
+            desync (bool): Randomize the sine phases per avatar so avatars don't move in unison.
+        """
+        self.avatars = [{}] * avatars if isinstance(avatars, int) else list(avatars)
+        self.names = [name for name, _, _ in parameters]
+        self.rng = np.random.default_rng(seed)
+        self.time = 0.0
+        n = len(self.avatars)
+
+        self._sine = [i for i, (_, kind, _) in enumerate(parameters) if kind == "sine"]
+        self._noise = [i for i, (_, kind, _) in enumerate(parameters) if kind == "noise"]
+        self._blink = [i for i, (_, kind, _) in enumerate(parameters) if kind == "blink"]
+        unknown = {kind for _, kind, _ in parameters} - {"sine", "noise", "blink"}
+        if unknown:
+            raise ValueError(f"Unknown parameter kind(s): {', '.join(sorted(unknown))}")
+
+        # Sine layers: (n_sine,) settings, (avatars, n_sine) phases
+        sines = [parameters[i][2] for i in self._sine]
+        self.sine_offset = np.array([s.get("offset", 0.0) for s in sines])
+        self.sine_amp = np.array([s.get("amp", 1.0) for s in sines])
+        self.sine_freq = np.array([s.get("freq", 1.0) for s in sines])
+        self.sine_phase = np.tile(np.array([s.get("phase", 0.0) for s in sines]), (n, 1))
+        if desync and n > 1:
+            self.sine_phase += self.rng.uniform(0, 2 * math.pi, self.sine_phase.shape)
+
+        # Noise layers: (avatars, n_noise)
+        noises = [parameters[i][2] for i in self._noise]
+        self.noise_speed = np.array([s.get("speed", 1.0) for s in noises])
+        self.noise_min = np.array([s.get("min", 0.0) for s in noises])
+        self.noise_max = np.array([s.get("max", 1.0) for s in noises])
+        shape = (n, len(noises))
+        self.noise_value = self.rng.uniform(self.noise_min, self.noise_max, shape)
+        self.noise_target = self.rng.uniform(self.noise_min, self.noise_max, shape)
+        self.noise_hold = np.zeros(shape)
+
+        # Blink state machines: (avatars, n_blink)
+        shape = (n, len(self._blink))
+        self.blink_state = np.full(shape, BLINK_OPEN)
+        self.blink_timer = np.zeros(shape)
+        self.blink_value = np.zeros(shape)
+        self.blink_next = self.rng.uniform(1.0, 4.0, shape)
+
+        self.values = np.zeros((n, len(parameters)))
+
+        # Per-avatar address lists and transports (reused every frame)
+        self._targets = []
+        for avatar in self.avatars:
+            if "port" in avatar:
+                prefix = avatar.get("prefix", ADDRESS_PREFIX)
+                transport = get_transport(avatar.get("ip", "127.0.0.1"), avatar["port"])
+                self._targets.append((transport, [prefix + name for name in self.names]))
+
+    def _step_noise(self, dt):
+        holding = self.noise_hold > 0
+        self.noise_hold[holding] -= dt
+        diff = self.noise_target - self.noise_value
+        step = np.broadcast_to(self.noise_speed * dt, diff.shape)
+        arrived = ~holding & (np.abs(diff) < step)
+        moving = ~holding & ~arrived
+        self.noise_value[moving] += np.copysign(step, diff)[moving]
+        if arrived.any():
+            # Reached: snap, pick a new target and hold the expression for a bit
+            self.noise_value[arrived] = self.noise_target[arrived]
+            low = np.broadcast_to(self.noise_min, diff.shape)[arrived]
+            high = np.broadcast_to(self.noise_max, diff.shape)[arrived]
+            self.noise_target[arrived] = self.rng.uniform(low, high)
+            self.noise_hold[arrived] = self.rng.uniform(*NOISE_HOLD, arrived.sum())
+
+    def _step_blink(self, dt):
+        state, timer, value = self.blink_state, self.blink_timer, self.blink_value
+        # Masks from the state at the start of the frame: one transition per frame
+        is_open, closing = state == BLINK_OPEN, state == BLINK_CLOSING
+        closed, opening = state == BLINK_CLOSED, state == BLINK_OPENING
+        timer[~is_open] += dt
+
+        value[is_open] = 0.0
+        start = is_open & (self.time >= self.blink_next)
+        state[start] = BLINK_CLOSING
+        timer[start] = 0.0
+
+        progress = np.minimum(1.0, timer / BLINK_CLOSE)
+        value[closing] = progress[closing]
+        done = closing & (progress >= 1.0)
+        state[done] = BLINK_CLOSED
+        timer[done] = 0.0
+
+        value[closed] = 1.0
+        done = closed & (timer >= BLINK_HOLD)
+        state[done] = BLINK_OPENING
+        timer[done] = 0.0
+
+        progress = np.minimum(1.0, timer / BLINK_REOPEN)
+        value[opening] = 1.0 - progress[opening]
+        done = opening & (progress >= 1.0)
+        if done.any():
+            state[done] = BLINK_OPEN
+            count = done.sum()
+            delay = self.rng.uniform(*BLINK_INTERVAL, count)
+            delay[self.rng.random(count) < DOUBLE_BLINK_CHANCE] = 0.1
+            self.blink_next[done] = self.time + delay
+
+    def step(self, dt):
+        """
+        Advances every avatar by `dt` seconds.
+
+        Returns:
+            np.ndarray: (avatars, parameters) values, in the order of the parameter list.
+        """
+        self.time += dt
+        if self._sine:
+            self.values[:, self._sine] = self.sine_offset + self.sine_amp * np.sin(self.sine_freq * self.time + self.sine_phase)
+        if self._noise:
+            self._step_noise(dt)
+            self.values[:, self._noise] = self.noise_value
+        if self._blink:
+            self._step_blink(dt)
+            self.values[:, self._blink] = self.blink_value
+        return self.values
+
+    def send(self, values=None):
+        """Sends the current frame: one bundle per avatar endpoint."""
+        values = self.values if values is None else values
+        for (transport, addresses), row in zip(self._targets, values.tolist()):
+            transport.set_floats(addresses, row)
+            transport.flush()
+
+def parse_avatar(spec):
+    """'ip:port[/prefix]' (or just 'port') -> avatar endpoint dict."""
+    endpoint, _, prefix = spec.partition("/")
+    ip, _, port = endpoint.rpartition(":")
+    avatar = {"ip": ip or "127.0.0.1", "port": int(port)}
+    if prefix:
+        avatar["prefix"] = "/" + prefix.strip("/") + "/"
+    return avatar
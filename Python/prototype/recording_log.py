@@ -0,0 +1,153 @@
+"""
+Recording Log Module
+Writes recording_log.json incrementally while a scenario runs, so tools can
+follow the recording live (e.g. the live compositor) and an interrupted session
+can be resumed from its last completed scene.
+"""
+
+import os
+import json
+import time
+import threading
+
+class RecordingLog:
+    def __init__(self, path, heartbeat=1.0, clock=time.monotonic):
+        """
+        Initialize the log.
+
+        Args:
+            path (str): Location of recording_log.json.
+            heartbeat (float): Seconds between rewrites while no events arrive, so
+                readers know up to which time the event list is complete.
+            clock (callable): Monotonic clock for "elapsed" (immune to wall-clock jumps).
+        """
+        self.path = path
+        self.heartbeat = heartbeat
+        self.clock = clock
+        self._t0 = None
+        self.data = {"start_time": 0, "elapsed": 0.0, "finished": False, "completed_scenes": 0,
+                     "recordings": [], "events": []}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, start_time, t0=None, base=0.0):
+        """
+        Marks T=0 of the recording and starts the heartbeat.
+
+        Args:
+            start_time (float): Wall-clock time of T=0 (for humans and other tools).
+            t0 (float): Reading of `clock` at T=0 (default: now).
+            base (float): Log time at `t0` (non-zero when resuming a session).
+        """
+        self.data["start_time"] = start_time
+        self.set_origin(self.clock() if t0 is None else t0, base)
+        self.flush()
+        self._thread = threading.Thread(target=self._heartbeat, daemon=True)
+        self._thread.start()
+
+    def set_origin(self, t0, base=0.0):
+        """
+        Maps the clock reading `t0` to log time `base` (for "elapsed").
+
+        Each recorded block restarts its clock, while log times continue from
+        where the previous block ended.
+        """
+        with self._lock:
+            self._t0 = t0 - base
+
+    def resume(self, first_scene, planned_time):
+        """
+        Continues the interrupted session logged at `path` from scene `first_scene`.
+
+        Events of that scene and later ones are dropped, and the recording that was
+        running is cut where the scene started (its "outpoint", in file time).
+
+        Args:
+            first_scene (int): Index of the first scene to record again.
+            planned_time (float): Timeline time of that scene's slide, used when
+                the previous session never reached it.
+
+        Returns:
+            float: Log time at which the session continues.
+
+        Raises:
+            FileNotFoundError: If there is no log of the interrupted session at `path`.
+        """
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cannot resume: no recording log of the interrupted session at {self.path}")
+        with open(self.path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        events = previous.get("events", [])
+        slide = next((e for e in events if e["type"] == "slide" and e.get("scene") == first_scene), None)
+        cut_time = slide["time"] if slide else planned_time
+        # Logs written before scene indices were recorded are cut by time
+        kept = [e for e in events if (e["scene"] < first_scene if "scene" in e else e["time"] < cut_time)]
+
+        recordings = [r for r in previous.get("recordings", []) if r["first_scene"] < first_scene]
+        if kept and not previous.get("recordings"):
+            # Single recording from an older log: file time 0 is log time 0
+            recordings = [{"first_scene": 0, "start": 0.0, "end": None, "file": None}]
+        if recordings:
+            last = recordings[-1]
+            if last.get("end") is None or last["end"] > cut_time:
+                last["end"] = cut_time
+                last["outpoint"] = cut_time - last["start"]
+
+        with self._lock:
+            self.data.update(previous)
+            self.data.update(finished=False, completed_scenes=first_scene, recordings=recordings, events=kept)
+        return cut_time
+
+    def add_recording(self, recording):
+        """Registers an OBS recording ({first_scene, start, end, file}); returns its index."""
+        with self._lock:
+            self.data["recordings"].append(recording)
+            index = len(self.data["recordings"]) - 1
+        self.flush()
+        return index
+
+    def update_recording(self, index, **fields):
+        """Updates a registered recording (e.g. its end time and file once stopped)."""
+        with self._lock:
+            self.data["recordings"][index].update(fields)
+        self.flush()
+
+    def append(self, event):
+        """Adds an event ({type, file, time}) and writes the log immediately."""
+        with self._lock:
+            self.data["events"].append(event)
+        self.flush()
+
+    def annotate(self, **fields):
+        """Adds top-level fields (e.g. the schedule report) to the log."""
+        with self._lock:
+            self.data.update(fields)
+
+    @property
+    def events(self):
+        return self.data["events"]
+
+    def flush(self):
+        """Atomically rewrites the log file (readers never see a partial file)."""
+        with self._lock:
+            if self._t0 is not None and not self.data["finished"]:
+                self.data["elapsed"] = self.clock() - self._t0
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def _heartbeat(self):
+        while not self._stop.wait(self.heartbeat):
+            self.flush()
+
+    def close(self):
+        """Stops the heartbeat and writes the final log."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+        with self._lock:
+            self.data["finished"] = True
+        self.flush()
@@ -6,12 +6,29 @@ Main entry point to execute the automation workflow.
 import os
 import argparse
 from scene_director import SceneDirector
+from lipsync import LIPSYNC_FPS
 
 def main():
     parser = argparse.ArgumentParser(description="Ghostless Automation Prototype")
     parser.add_argument("scenario", help="Path to the JSON scenario file", default="test_scenario.json", nargs="?")
     parser.add_argument("--obs-pass", help="OBS WebSocket Password", default="")
+    parser.add_argument("--live-split", action="store_true", help="Split the OBS recording after every scene (for live_compositor.py)")
+    parser.add_argument("--prefetch", default=3, type=int, help="Upcoming voice files decoded ahead in the background")
+    parser.add_argument("--audio-cache-mb", default=512, type=float, help="Memory limit of the decoded voice cache (MB)")
+    parser.add_argument("--audio-device", default=None, help="Output device name or index (default: system output, which should include BlackHole)")
+    parser.add_argument("--audio-latency", default="low", help="Output stream latency: 'low', 'high' or seconds")
+    parser.add_argument("--dry-run", action="store_true", help="Run the scenario on a simulated clock without OBS, OSC or audio (writes recording_log.json in milliseconds)")
+    parser.add_argument("--block-size", default=0, type=int, help="Record every block of this many scenes into its own OBS file (0: one recording)")
+    parser.add_argument("--resume-from", type=int, help="Scene number (1-based) to continue an interrupted session from; keeps the logged earlier scenes")
+    parser.add_argument("--lipsync", action="store_true", help="Stream precomputed mouth curves (/ghostless/control/mouth) during each line")
+    parser.add_argument("--lipsync-fps", default=LIPSYNC_FPS, type=int, help="Mouth frames per second for --lipsync")
+    parser.add_argument("--pre-motion-overlap", default=0.0, type=float, help="Seconds each pre-motion starts before its slide, overlapping the previous line")
     args = parser.parse_args()
+    audio_device = int(args.audio_device) if args.audio_device and args.audio_device.isdigit() else args.audio_device
+    try:
+        audio_latency = float(args.audio_latency)
+    except ValueError:
+        audio_latency = args.audio_latency
 
     # Deduce assets_dir from scenario path
     scenario_path = os.path.abspath(args.scenario)
@@ -27,8 +44,23 @@ def main():
     print(f"Scenario: {scenario_path}")
     print(f"Assets Dir: {assets_dir}")
     
-    director = SceneDirector(scenario_path, assets_dir=assets_dir, obs_pass=args.obs_pass)
-    director.run()
+    director = SceneDirector(scenario_path, assets_dir=assets_dir, obs_pass=args.obs_pass, live_split=args.live_split,
+                             pre_motion_overlap=args.pre_motion_overlap, prefetch=args.prefetch,
+                             audio_cache_mb=args.audio_cache_mb, audio_device=audio_device,
+                             audio_latency=audio_latency, dry_run=args.dry_run,
+                             block_size=args.block_size, lipsync=args.lipsync, lipsync_fps=args.lipsync_fps)
+    resume_from = None
+    if args.resume_from:
+        scene_count = len(director.scenario_data.get("scenes", []))
+        if not 1 <= args.resume_from <= scene_count:
+            parser.error(f"--resume-from must be between 1 and {scene_count}")
+        # Resuming continues the interrupted session's log; without it there is nothing to keep
+        log_path = os.path.join(assets_dir, "recording_log.json")
+        if not os.path.exists(log_path):
+            parser.error(f"--resume-from needs the interrupted session's log, but {log_path} does not exist "
+                         "(run without --resume-from to record from the start)")
+        resume_from = args.resume_from - 1
+    director.run(resume_from=resume_from)
 
 if __name__ == "__main__":
     main()
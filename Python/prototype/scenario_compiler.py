@@ -0,0 +1,163 @@
+"""
+Scenario Compiler Module
+Validates a scenario before a recording session and resolves every asset once:
+voice durations and formats, image sizes, checksums and motion entries. The
+compiled scenario is a superset of scenario.json, so SceneDirector and the
+compositor load it in place of the original without probing the assets again.
+
+Usage:
+    python scenario_compiler.py assets/scenario.json [--output assets/scenario.compiled.json] [--jobs 8]
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import soundfile as sf
+
+from motion_config import MOTION_DB
+
+COMPILED_VERSION = 1
+COMPILED_SUFFIX = ".compiled.json"
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """SHA-1 of a file, read in chunks."""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _file_entry(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha1": file_checksum(path)}
+
+def _resolve_voice(path):
+    info = sf.info(path)
+    if info.frames == 0:
+        raise ValueError("contains no audio")
+    return {
+        "duration": info.frames / info.samplerate,
+        "samplerate": info.samplerate,
+        "channels": info.channels,
+        "frames": info.frames,
+        **_file_entry(path),
+    }
+
+def _resolve_image(path):
+    from PIL import Image
+    with Image.open(path) as img:
+        width, height = img.size
+        img.verify() # Catches truncated/corrupt files without decoding every pixel
+    return {"width": width, "height": height, **_file_entry(path)}
+
+def compile_scene(index, scene, assets_dir):
+    """
+    Validates one scene and resolves its assets.
+
+    Returns:
+        tuple: (compiled scene, list of error messages)
+    """
+    label = f"Scene {scene.get('id', index + 1)}"
+    compiled = dict(scene)
+    errors = []
+
+    voice_file = scene.get("voice_file")
+    if not voice_file:
+        errors.append(f"{label}: no voice_file")
+    else:
+        path = os.path.join(assets_dir, "voice", voice_file)
+        try:
+            compiled["voice"] = _resolve_voice(path)
+        except Exception as e:
+            missing = not os.path.isfile(path) # libsndfile reports missing files as a generic error
+            errors.append(f"{label}: voice file not found: {path}" if missing else f"{label}: unreadable voice file {path}: {e}")
+
+    image_file = scene.get("image_file")
+    if not image_file:
+        errors.append(f"{label}: no image_file")
+    else:
+        path = os.path.join(assets_dir, "images", image_file)
+        try:
+            compiled["image"] = _resolve_image(path)
+        except FileNotFoundError:
+            errors.append(f"{label}: image not found: {path}")
+        except Exception as e:
+            errors.append(f"{label}: invalid image {path}: {e}")
+
+    tag = scene.get("motion_tag")
+    if tag:
+        if tag in MOTION_DB:
+            compiled["motion"] = MOTION_DB[tag]
+        else:
+            errors.append(f"{label}: unknown motion_tag '{tag}' (known: {', '.join(sorted(MOTION_DB))})")
+
+    return compiled, errors
+
+def compile_scenario(scenario_path, assets_dir=None, jobs=None):
+    """
+    Validates a scenario and resolves all of its assets in parallel.
+
+    Args:
+        scenario_path (str): Path to scenario.json.
+        assets_dir (str): Directory holding voice/ and images/ (default: the scenario's).
+        jobs (int): Worker threads (hashing and header reads are I/O bound).
+
+    Returns:
+        tuple: (compiled scenario, list of error messages)
+    """
+    scenario_path = os.path.abspath(scenario_path)
+    assets_dir = assets_dir or os.path.dirname(scenario_path)
+    with open(scenario_path, 'r', encoding='utf-8') as f:
+        scenario = json.load(f)
+
+    scenes = scenario.get("scenes", [])
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) * 4)) as pool:
+        results = list(pool.map(lambda item: compile_scene(item[0], item[1], assets_dir), enumerate(scenes)))
+
+    compiled = dict(scenario)
+    compiled["scenes"] = [scene for scene, _ in results]
+    compiled["compiled"] = {
+        "version": COMPILED_VERSION,
+        "source": os.path.basename(scenario_path),
+        "source_sha1": file_checksum(scenario_path),
+        "total_voice_duration": sum(s["voice"]["duration"] for s in compiled["scenes"] if "voice" in s),
+    }
+    errors = [error for _, scene_errors in results for error in scene_errors]
+    return compiled, errors
+
+def is_compiled(scenario):
+    """True for a scenario produced by compile_scenario()."""
+    return "compiled" in scenario
+
+def check_source(scenario, scenario_path):
+    """Warns when the scenario a compiled file was made from has changed since."""
+    info = scenario.get("compiled", {})
+    source = os.path.join(os.path.dirname(os.path.abspath(scenario_path)), info.get("source", ""))
+    if os.path.isfile(source) and file_checksum(source) != info.get("source_sha1"):
+        print(f"Warning: {info['source']} changed after it was compiled; re-run scenario_compiler.py")
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a scenario and compile its asset manifest")
+    parser.add_argument("scenario", help="Path to scenario.json")
+    parser.add_argument("--output", help=f"Compiled scenario path (default: next to the scenario, *{COMPILED_SUFFIX})")
+    parser.add_argument("--jobs", type=int, help="Parallel validation workers")
+    args = parser.parse_args()
+
+    compiled, errors = compile_scenario(args.scenario, jobs=args.jobs)
+    if errors:
+        print(f"[Compiler] {len(errors)} problem(s) in {args.scenario}:")
+        for error in errors:
+            print(f"  - {error}")
+        sys.exit(1)
+
+    output = args.output or os.path.splitext(args.scenario)[0] + COMPILED_SUFFIX
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(compiled, f, ensure_ascii=False, separators=(",", ":"))
+    print(f"[Compiler] {len(compiled['scenes'])} scenes, "
+          f"{compiled['compiled']['total_voice_duration']:.1f}s of voice -> {output}")
+
+if __name__ == "__main__":
+    main()
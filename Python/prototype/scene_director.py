@@ -6,22 +6,61 @@ Orchestrates the timing of audio, acting, and background/slide changes.
 import os
 import time
 import json
+import asyncio
 import soundfile as sf
-import sounddevice as sd
 from virtual_actor import VirtualActor
-from obs_controller import ObsController
+from recording_log import RecordingLog
+from timeline_scheduler import TimelineScheduler, build_cue_timeline
+from audio_prefetch import AudioPrefetcher
+from lipsync import LIPSYNC_FPS, load_scenario_envelopes, stream_envelope
+from scenario_compiler import check_source, is_compiled
+from dry_run import VirtualClock, DryRunTransport, DryRunObs, DryRunPlayback
 
 class SceneDirector:
-    def __init__(self, config_json_path, assets_dir="assets", obs_pass=''):
+    def __init__(self, config_json_path, assets_dir="assets", obs_pass='', live_split=False, pre_motion_overlap=0.0,
+                 prefetch=3, audio_cache_mb=512, audio_device=None, audio_latency='low', dry_run=False,
+                 block_size=0, lipsync=False, lipsync_fps=LIPSYNC_FPS):
         self.config_json_path = config_json_path
         self.assets_dir = assets_dir
-        self.actor = VirtualActor()
-        self.obs = ObsController(password=obs_pass)
+        # Record every block of this many scenes into its own OBS file (0: one recording)
+        self.block_size = block_size
+        # Split the OBS recording after every scene so the live compositor can start on it
+        self.live_split = live_split
+        # Start each pre-motion this many seconds before its slide (over the previous line's tail)
+        self.pre_motion_overlap = pre_motion_overlap
+        # Upcoming lines are decoded in the background so playback starts from RAM
+        self.prefetcher = AudioPrefetcher(os.path.join(assets_dir, "voice"), lookahead=prefetch,
+                                          max_bytes=int(audio_cache_mb * 1024**2))
+        # Stream precomputed mouth curves over OSC during each line (see lipsync.py)
+        self.lipsync = lipsync and not dry_run
+        self.lipsync_fps = lipsync_fps
+        self.envelopes = {}
+        # Output device/latency of the session's single playback stream
+        self.audio_device = audio_device
+        self.audio_latency = audio_latency
+        # Dry run: simulated clock, no audio, local stand-ins for OBS and OSC
+        self.dry_run = dry_run
+        if dry_run:
+            self.clock = VirtualClock()
+            self.actor = VirtualActor(transport=DryRunTransport(self.clock.now))
+            self.obs = DryRunObs(self.clock.now)
+        else:
+            # Real backends only here: a dry run works without obsws-python or PortAudio
+            from obs_controller import ObsController
+            self.clock = None
+            self.actor = VirtualActor()
+            self.obs = ObsController(password=obs_pass)
         self.scenario_data = self._load_scenario()
+        self.playback = None # One output stream for the whole session (see run())
 
     def _load_scenario(self):
         with open(self.config_json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            scenario = json.load(f)
+        if is_compiled(scenario):
+            # Assets were validated and resolved by scenario_compiler.py
+            check_source(scenario, self.config_json_path)
+            print(f"[Director] Compiled scenario: {len(scenario.get('scenes', []))} scenes, assets resolved")
+        return scenario
 
     def _get_audio_duration(self, filename):
         """Returns duration of wav file in seconds."""
@@ -33,109 +72,262 @@ class SceneDirector:
         f = sf.SoundFile(path)
         return len(f) / f.samplerate
 
-    def _play_audio(self, filename):
-        """Plays audio file to the default output (which should include BlackHole for 3tene)."""
-        path = os.path.join(self.assets_dir, "voice", filename)
-        if not os.path.exists(path):
-            return
+    def _session_samplerate(self):
+        """Sample rate of the output stream: that of the first voice file (others are resampled)."""
+        for scene in self.scenario_data.get("scenes", []):
+            if "voice" in scene:
+                return scene["voice"]["samplerate"]
+            path = os.path.join(self.assets_dir, "voice", scene.get("voice_file") or "")
+            if os.path.isfile(path):
+                return sf.info(path).samplerate
+        return 44100
+
+    def _play_audio(self, filename, at=None):
+        """
+        Queues a line on the session's output stream (which should include BlackHole for 3tene).
+
+        Args:
+            at (float): Start time on the monotonic clock (sample-accurate when queued ahead).
+
+        Returns:
+            Playback: Handle reporting the DAC start time, or None if the file is missing.
+        """
+        if self.dry_run:
+            # Nothing is played (or decoded): only the start time matters
+            if not os.path.exists(os.path.join(self.assets_dir, "voice", filename)):
+                return None
+            return self.playback.play(None, None, at=at)
+        audio = self.prefetcher.get(filename)
+        if audio is None:
+            return None
+        data, fs = audio
+        return self.playback.play(data, fs, at=at)
+
+    def build_timeline(self, pre_motion_overlap=None):
+        """Precomputes the cue timeline of the scenario (see timeline_scheduler)."""
+        scenes = self.scenario_data.get("scenes", [])
+        # Compiled scenarios carry the durations; otherwise every WAV header is read
+        durations = [scene["voice"]["duration"] if "voice" in scene else self._get_audio_duration(scene.get("voice_file"))
+                     for scene in scenes]
+        overlap = self.pre_motion_overlap if pre_motion_overlap is None else pre_motion_overlap
+        return build_cue_timeline(scenes, durations, pre_motion_overlap=overlap)
 
-        data, fs = sf.read(path, dtype='float32')
-        sd.play(data, fs)
-        sd.wait() # Wait until finished
+    def _recording_blocks(self, first_scene):
+        """Scene index ranges (start, stop) recorded into one OBS file each."""
+        count = len(self.scenario_data.get("scenes", []))
+        size = self.block_size or max(count, 1)
+        return [(a, min(a + size, count)) for a in range(first_scene, count, size)]
 
-    def run(self):
-        """Runs the entire scenario."""
+    def _log_time(self, t):
+        """Simulated times are exact; rounding to the millisecond drops float noise from the log."""
+        return round(t, 3) if self.dry_run else t
+
+    def _wait_for_obs(self):
+        """Gives OBS a moment to stabilize after starting a recording."""
+        if self.dry_run:
+            self.clock.advance(1.0)
+        else:
+            time.sleep(1.0)
+
+    def run(self, resume_from=None):
+        """
+        Runs the entire scenario.
+
+        Args:
+            resume_from (int): Scene index to continue an interrupted session from.
+                recording_log.json keeps the events of the earlier scenes and the new
+                ones follow them; the compositor stitches the recordings back together.
+        """
         print(f"Starting Project: {self.scenario_data.get('project_title')}")
+        cues, end_time = self.build_timeline()
+        print(f"Timeline: {len(cues)} cues, {end_time:.1f}s")
+        scenes = self.scenario_data.get("scenes", [])
+        slide_times = {cue["index"]: cue["time"] for cue in cues if cue["kind"] == "slide"}
         
-        recording_log = {
-            "start_time": 0,
-            "events": []
-        }
-        
-        # Start OBS Recording
-        self.obs.start_recording()
-        
-        # Give OBS a moment to stabilize
-        time.sleep(1.0)
-        
-        # Record Start Time (Reference T=0)
-        start_time = time.time()
-        recording_log["start_time"] = start_time
-        
-        for scene in self.scenario_data.get("scenes", []):
-            # Log Scene Start (for Slide Change)
-            scene_start_relative = time.time() - start_time
-            
-            # Execute Scene
-            # We need to capture when audio actually starts inside execute_scene.
-            # To avoid major refactoring, we'll modify execute_scene to return audio start time or pass the log list.
-            # Let's modify execute_scene to take the log list and reference start time.
-            self.execute_scene_with_logging(scene, recording_log["events"], start_time)
+        # Written incrementally so the live compositor can follow the recording
+        log_path = os.path.join(self.assets_dir, "recording_log.json")
+        if self.dry_run:
+            recording_log = RecordingLog(log_path, clock=self.clock.now)
+            self.playback = DryRunPlayback(self.clock.now)
+        else:
+            from playback_engine import PlaybackEngine
+            recording_log = RecordingLog(log_path)
+            # A single output stream for all lines: no per-line device setup, gapless playback
+            self.playback = PlaybackEngine(self._session_samplerate(), device=self.audio_device,
+                                           latency=self.audio_latency)
+
+        first_scene = resume_from or 0
+        # Log time = timeline time + shift (non-zero when resuming after a slower first session)
+        shift = 0.0
+        if resume_from:
+            resume_time = recording_log.resume(first_scene, slide_times[first_scene])
+            shift = resume_time - slide_times[first_scene]
+            print(f"Resuming at scene {scenes[first_scene].get('id')} (log time {resume_time:.2f}s, "
+                  f"{len(recording_log.events)} events kept)")
+        # A dry run starts at wall-clock 0 so its log is reproducible
+        start_time = recording_log.data["start_time"] if resume_from else (0.0 if self.dry_run else time.time())
+
+        if self.lipsync:
+            # Offline analysis (cached beside the WAVs); the live path only indexes frames
+            self.envelopes = load_scenario_envelopes(scenes, os.path.join(self.assets_dir, "voice"), self.lipsync_fps)
+            print(f"[LipSync] {len(self.envelopes)} envelopes at {self.lipsync_fps} fps")
+
+        self.playback.start()
+        if not self.dry_run:
+            self.prefetcher.prefetch(scene.get("voice_file") for scene in scenes[first_scene:first_scene + self.prefetcher.lookahead])
+
+        if self.dry_run:
+            scheduler = TimelineScheduler(clock=self.clock.now, sleep=self.clock.sleep, spin_window=0.0)
+        else:
+            scheduler = TimelineScheduler()
+
+        # Each block of scenes is its own OBS recording (a single block unless block_size is set)
+        for block_start, block_stop in self._recording_blocks(first_scene):
+            origin = slide_times[block_start]
+            block_cues = [dict(cue, time=max(0.0, cue["time"] - origin))
+                          for cue in cues if block_start <= cue["index"] < block_stop]
+            block_end = slide_times.get(block_stop, end_time) - origin
+            base = origin + shift
+
+            # Start OBS Recording
+            self.obs.start_recording()
+            record_start = scheduler.clock()
+            self._wait_for_obs()
+
+            # Record Start Time (Reference T=0 of the block); event times come from the monotonic clock
+            t0 = scheduler.clock()
+            if block_start == first_scene:
+                recording_log.start(start_time, t0, base)
+            else:
+                recording_log.set_origin(t0, base)
+            recording = recording_log.add_recording({
+                "first_scene": block_start,
+                "start": self._log_time(base - (t0 - record_start)), # Log time at which the file begins
+                "end": None,
+                "file": None,
+            })
             
-        # Give a moment of silence at the end
-        time.sleep(2.0)
+            asyncio.run(self._run_timeline(scheduler, block_cues, block_end, recording_log, t0, base, recording))
             
-        # Stop OBS Recording
-        self.obs.stop_recording()
+            # Stop OBS Recording
+            end = base + scheduler.now()
+            recording_log.update_recording(recording, end=self._log_time(end), file=self.obs.stop_recording())
+
         self.actor.cleanup()
+        self.playback.close()
+        self.prefetcher.close()
+        audio_cache = self.prefetcher.stats()
+        if not self.dry_run:
+            print(f"[Prefetch] {audio_cache['hits']} hits, {audio_cache['misses']} misses, "
+                  f"{audio_cache['waits']} waited on decode, {audio_cache['evictions']} evictions")
         
-        # Save Log
-        log_path = os.path.join(self.assets_dir, "recording_log.json")
-        with open(log_path, 'w') as f:
-            json.dump(recording_log, f, indent=2)
+        report = scheduler.report()
+        print(f"[Scheduler] {report['cues']} cues: lateness mean {report.get('mean_ms', 0):.1f} ms, "
+              f"p95 {report.get('p95_ms', 0):.1f} ms, max {report.get('max_ms', 0):.1f} ms ({report.get('worst')})")
+        
+        # Save Log (marks the recording as finished)
+        if self.dry_run:
+            recording_log.annotate(dry_run=True, schedule=report)
+        else:
+            recording_log.annotate(schedule=report, audio_cache=audio_cache)
+        recording_log.close()
         print(f"Recording Log saved to {log_path}")
         print("Project Finished.")
 
-    def execute_scene_with_logging(self, scene, event_log, start_time):
-        """Executes a single scene with logging."""
-        scene_id = scene.get("id")
-        text = scene.get("text")
-        motion_tag = scene.get("motion_tag")
-        voice_file = scene.get("voice_file")
-        image_file = scene.get("image_file")
-        
-        print(f"\n--- Scene {scene_id} Start ---")
-        print(f"Displaying Slide: {image_file}")
-        
-        # Log Slide Event
-        event_log.append({
-            "type": "slide",
-            "file": image_file,
-            "time": time.time() - start_time
-        })
-        
-        # 1. Pre-computation: Get Duration
-        duration = self._get_audio_duration(voice_file)
-        
-        # 2. Pre-Action
-        self.actor.perform_pre_motion()
-        time.sleep(0.5)
-        
-        # 3. Action
-        self.actor.perform_motion(motion_tag)
-        
-        print(f"Playing Audio: {voice_file} ('{text}')")
-        
-        # Log Audio Event
-        audio_start_time = time.time() - start_time
-        event_log.append({
-            "type": "audio",
-            "file": voice_file,
-            "time": audio_start_time
-        })
-        
-        # Set Speaking State ON
-        self.actor.set_speaking(True)
-        
-        self._play_audio(voice_file)
-        
-        # Set Speaking State OFF
-        self.actor.set_speaking(False)
-        
-        # 4. Post-scene wait
-        time.sleep(0.2)
-        
-        print(f"--- Scene {scene_id} End ---\n")
+    async def _run_timeline(self, scheduler, cues, end_time, event_log, t0, base=0.0, recording=0):
+        """
+        Fires the scenario cues on the scheduler, logging actual times and lateness.
+
+        Args:
+            base (float): Log time of the cues' T=0 (start of the recorded block).
+            recording (int): Index of the OBS recording the events belong to.
+        """
+        loop = asyncio.get_running_loop()
+        scenes = self.scenario_data.get("scenes", [])
+
+        lines = {} # scene index -> task queueing its voice line
+
+        def run_blocking(func, *args):
+            if self.dry_run:
+                # Stand-ins return at once; staying on the loop keeps the event order reproducible
+                future = loop.create_future()
+                future.set_result(func(*args))
+                return future
+            return loop.run_in_executor(None, func, *args)
+
+        def log_event(event_type, filename, cue, fired_at):
+            lateness = fired_at - cue["time"]
+            fired_at, lateness = self._log_time(base + fired_at), self._log_time(lateness)
+            event_log.append({
+                "type": event_type,
+                "file": filename,
+                "time": fired_at,
+                "lateness": lateness,
+                "scene": cue["index"],
+                "recording": recording,
+            })
+
+        async def queue_line(scene, speech_time):
+            # Queued ahead of its cue so the stream can place the first sample exactly
+            return await run_blocking(self._play_audio, scene.get("voice_file"), t0 + speech_time)
+
+        async def log_speech(cue, fired_at):
+            playback = await lines.pop(cue["index"])
+            if playback is None:
+                log_event("audio", cue["scene"].get("voice_file"), cue, fired_at)
+                return
+            # The audio event is when the first sample reached the DAC, not when the cue fired
+            if await run_blocking(playback.started.wait, 5.0):
+                log_event("audio", cue["scene"].get("voice_file"), cue, playback.start_time - t0)
+            else:
+                print(f"[Playback] {cue['scene'].get('voice_file')} did not start")
+                return
+            envelope = self.envelopes.get(cue["scene"].get("voice_file"))
+            if envelope is not None:
+                # Paced by the output stream's clock, from the line's DAC start
+                await stream_envelope(envelope, playback, self.playback.time, self.actor.set_mouth, self.lipsync_fps)
+
+        def on_slide(cue, fired_at):
+            scene = cue["scene"]
+            print(f"\n--- Scene {scene.get('id')} Start ---")
+            print(f"Displaying Slide: {scene.get('image_file')}")
+            log_event("slide", scene.get("image_file"), cue, fired_at)
+            if not self.dry_run:
+                # Keep the next K lines decoded ahead of their cues
+                upcoming = scenes[cue["index"]:cue["index"] + 1 + self.prefetcher.lookahead]
+                self.prefetcher.prefetch(s.get("voice_file") for s in upcoming)
+            speech_time = next(c["time"] for c in cues if c["index"] == cue["index"] and c["kind"] == "speech_start")
+            lines[cue["index"]] = asyncio.ensure_future(queue_line(scene, speech_time))
+            return lines[cue["index"]]
+
+        def on_speech_start(cue, fired_at):
+            scene = cue["scene"]
+            print(f"Playing Audio: {scene.get('voice_file')} ('{scene.get('text')}')")
+            # Set Speaking State ON
+            self.actor.set_speaking(True)
+            return log_speech(cue, fired_at)
+
+        def on_speech_end(cue, fired_at):
+            # Set Speaking State OFF
+            self.actor.set_speaking(False)
+            print(f"--- Scene {cue['scene'].get('id')} End ---\n")
+            # Checkpoint: a failed session can be resumed from the next scene
+            event_log.annotate(completed_scenes=cue["index"] + 1)
+            event_log.flush()
+            if self.live_split:
+                return run_blocking(self.obs.split_recording)
+
+        handlers = {
+            "slide": on_slide,
+            "pre_motion": lambda cue, fired_at: self.actor.perform_pre_motion(),
+            "motion": lambda cue, fired_at: self.actor.perform_motion(cue["scene"].get("motion_tag"),
+                                                                        candidates=cue["scene"].get("motion")),
+            "speech_start": on_speech_start,
+            "speech_end": on_speech_end,
+        }
+        await scheduler.run(cues, handlers, t0)
+        # Give a moment of silence at the end
+        await scheduler.wait_until(end_time)
 
 if __name__ == "__main__":
     # Ensure paths are resolved relative to this script
@@ -0,0 +1,118 @@
+"""
+Timeline Scheduler Module
+Precomputes the absolute timeline of a scenario (slides, motions, speech) and
+fires each cue at its deadline on a monotonic clock, measuring how late it was.
+Cues are scheduled against T=0 rather than chained, so delays never accumulate.
+"""
+
+import time
+import asyncio
+import inspect
+
+# Scene pacing (seconds): slide change -> speech, speech end -> next scene
+SLIDE_LEAD = 0.5
+SCENE_GAP = 0.2
+TAIL = 2.0 # Silence after the last line
+
+# Final approach to a deadline: sleep coarsely, then yield until the clock reaches it
+SPIN_WINDOW = 0.002
+
+def build_cue_timeline(scenes, durations, slide_lead=SLIDE_LEAD, scene_gap=SCENE_GAP,
+                       pre_motion_overlap=0.0, tail=TAIL):
+    """
+    Lays out every cue of a scenario on an absolute timeline.
+
+    Args:
+        scenes (list): Scenario scenes.
+        durations (list): Voice duration (s) of each scene.
+        pre_motion_overlap (float): Fire each pre-motion this much before its
+            slide change, overlapping the tail of the previous line.
+
+    Returns:
+        tuple: (cues, end_time) where cues are dicts {time, kind, scene, index}
+        sorted by time; kinds are slide, pre_motion, motion, speech_start, speech_end.
+    """
+    cues = []
+    t = 0.0
+    prev_speech_start = 0.0
+    for index, (scene, duration) in enumerate(zip(scenes, durations)):
+        pre_motion = max(prev_speech_start, t - pre_motion_overlap)
+        speech = t + slide_lead
+        for time_, kind in ((t, "slide"), (pre_motion, "pre_motion"), (speech, "motion"),
+                            (speech, "speech_start"), (speech + duration, "speech_end")):
+            cues.append({"time": time_, "kind": kind, "scene": scene, "index": index})
+        prev_speech_start = speech
+        t = speech + duration + scene_gap
+    # Stable sort keeps the listed order for cues sharing a deadline
+    cues.sort(key=lambda c: c["time"])
+    return cues, t + tail
+
+class TimelineScheduler:
+    def __init__(self, clock=time.monotonic, sleep=asyncio.sleep, spin_window=SPIN_WINDOW):
+        """
+        Initialize the scheduler.
+
+        Args:
+            clock (callable): Monotonic time source in seconds.
+            sleep (callable): Coroutine used to wait (injectable for simulated clocks).
+            spin_window (float): Final approach spent yielding instead of sleeping
+                (0 for simulated clocks, which reach the deadline exactly).
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.spin_window = spin_window
+        self.t0 = None
+        self.lateness = [] # (cue, seconds late)
+
+    def now(self):
+        """Seconds since T=0 of the running timeline."""
+        return self.clock() - self.t0
+
+    async def wait_until(self, deadline):
+        """Waits until `deadline` (seconds after T=0)."""
+        while True:
+            remaining = deadline - self.now()
+            if remaining <= 0:
+                return
+            if remaining > self.spin_window:
+                await self.sleep(remaining - self.spin_window)
+            else:
+                await self.sleep(0)
+
+    async def run(self, cues, handlers, t0=None):
+        """
+        Fires the cues in order at their deadlines.
+
+        Args:
+            handlers (dict): kind -> callable(cue, fired_at). A handler may return an
+                awaitable for slow work (e.g. OBS requests), which runs in the
+                background and is awaited before run() returns.
+            t0 (float): Clock reading for T=0 (default: now).
+        """
+        self.t0 = self.clock() if t0 is None else t0
+        background = []
+        for cue in cues:
+            await self.wait_until(cue["time"])
+            fired_at = self.now()
+            self.lateness.append((cue, fired_at - cue["time"]))
+            handler = handlers.get(cue["kind"])
+            if handler:
+                result = handler(cue, fired_at)
+                if inspect.isawaitable(result):
+                    background.append(asyncio.ensure_future(result))
+        if background:
+            await asyncio.gather(*background)
+
+    def report(self):
+        """Summary of cue lateness in milliseconds (mean, p95, max and the worst cue)."""
+        if not self.lateness:
+            return {"cues": 0}
+        late = sorted(l for _, l in self.lateness)
+        worst_cue, worst = max(self.lateness, key=lambda x: x[1])
+        return {
+            "cues": len(late),
+            "mean_ms": sum(late) / len(late) * 1000,
+            "p95_ms": late[min(len(late) - 1, int(len(late) * 0.95))] * 1000,
+            "max_ms": worst * 1000,
+            "worst": f"{worst_cue['kind']} (scene {worst_cue['scene'].get('id')})",
+        }
@@ -5,42 +5,50 @@ Handles OSC communication with Unity to control the avatar's expressions and mot
 
 import time
 import random
-from pythonosc import udp_client
 
 from motion_config import MOTION_DB
+from osc_transport import get_transport
 
 class VirtualActor:
-    def __init__(self, osc_ip="127.0.0.1", osc_port=9000):
+    def __init__(self, osc_ip="127.0.0.1", osc_port=9000, transport=None):
         """
         Initialize the VirtualActor with OSC connection.
         
         Args:
             osc_ip (str): IP address of the Unity OSC receiver.
             osc_port (int): Port of the Unity OSC receiver.
+            transport: Object with OscTransport's send(address, *values) to use
+                instead (e.g. dry_run.DryRunTransport).
         """
-        self.client = udp_client.SimpleUDPClient(osc_ip, osc_port)
-        print(f"[VirtualActor] OSC Client initialized at {osc_ip}:{osc_port}")
+        if transport is None:
+            # Shared with every other sender to this receiver in the process
+            transport = get_transport(osc_ip, osc_port)
+            print(f"[VirtualActor] OSC Client initialized at {osc_ip}:{osc_port}")
+        self.transport = transport
 
-    def _send_osc(self, address, value):
-        """Sends an OSC message."""
+    def _send_osc(self, address, value, log=True):
+        """Sends an OSC message (log=False for per-frame streams)."""
         try:
-            self.client.send_message(address, value)
-            print(f"[OSC] Sent {address}: {value}")
+            self.transport.send(address, *(value if isinstance(value, (list, tuple)) else [value]))
+            if log:
+                print(f"[OSC] Sent {address}: {value}")
         except Exception as e:
             print(f"[OSC] Error sending message: {e}")
 
-    def perform_motion(self, tag, intensity="normal"):
+    def perform_motion(self, tag, intensity="normal", candidates=None):
         """
         Executes a motion based on a semantic tag.
         
         Args:
             tag (str): The semantic motion tag (e.g., "agree", "greeting").
+            candidates (list): Motion entries already resolved for the tag
+                (compiled scenarios); looked up in MOTION_DB otherwise.
         """
-        if tag not in MOTION_DB:
-            print(f"[Actor] Unknown motion tag: {tag}")
-            return
-
-        candidates = MOTION_DB[tag]
+        if candidates is None:
+            if tag not in MOTION_DB:
+                print(f"[Actor] Unknown motion tag: {tag}")
+                return
+            candidates = MOTION_DB[tag]
         if not candidates:
             return
 
@@ -76,6 +84,15 @@ class VirtualActor:
         val = 1.0 if is_speaking else 0.0
         self._send_osc("/ghostless/control/speech", val)
 
+    def set_mouth(self, frame):
+        """
+        Sends one lip-sync frame (see lipsync.CHANNELS).
+
+        Args:
+            frame (sequence): Mouth openness followed by the aa/ih/ou/ee/oh weights.
+        """
+        self._send_osc("/ghostless/control/mouth", [float(v) for v in frame], log=False)
+
     def perform_micro_movement(self):
         """
         Executes a subtle micro-movement (blink, gaze shift) during idle times.
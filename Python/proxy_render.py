@@ -0,0 +1,100 @@
+"""
+Proxy Render Module
+Settings and overlay for low-resolution review renders: reduced size and frame
+rate, a cheap scaler, the fastest encoder preset and an optional burned-in
+timecode / scene id (as an ASS subtitle, so no drawtext/freetype build is needed).
+"""
+
+import os
+
+PROXY_HEIGHT = 540
+PROXY_FPS = 15
+PROXY_SCALER = "fast_bilinear"
+
+# Software x264 at its fastest preset; quality only has to be good enough to judge timing
+PROXY_CODEC_ARGS = ["-c:v", "libx264", "-preset", "ultrafast", "-crf", "30", "-pix_fmt", "yuv420p"]
+
+# Decoder shortcut for the OBS input: skipping the H.264 deblocking filter saves
+# ~15% decode time, and blocking artifacts don't matter for a review copy
+PROXY_DECODE_ARGS = ["-skip_loop_filter", "all"]
+
+# Slides and the composite are 16:9
+PROXY_ASPECT = 16 / 9
+
+# Timecode resolution of the overlay (seconds)
+TIMECODE_STEP = 0.1
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: {width}
+PlayResY: {height}
+WrapStyle: 2
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: TC,Monospace,{font_size},&H00FFFFFF,&H00FFFFFF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,3,2,0,7,{margin},{margin},{margin},1
+Style: Scene,Monospace,{font_size},&H0000FFFF,&H0000FFFF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,3,2,0,9,{margin},{margin},{margin},1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+def proxy_size(height=PROXY_HEIGHT):
+    """Returns the (width, height) of the proxy frame, width rounded to an even number."""
+    width = int(round(height * PROXY_ASPECT / 2)) * 2
+    return width, height
+
+def _ass_time(t):
+    """ASS timestamps are H:MM:SS.cc"""
+    cs = int(round(max(0.0, t) * 100))
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+def _timecode(t):
+    ds = int(round(t * 10))
+    return f"{ds // 36000:02d}:{ds // 600 % 60:02d}:{ds // 10 % 60:02d}.{ds % 10}"
+
+def scene_labels(scenario, slide_events):
+    """
+    Maps each slide window to the scene id that showed it.
+
+    Returns:
+        list: (start, label) per slide event, in time order.
+    """
+    ids = {}
+    for scene in scenario.get("scenes", []):
+        if scene.get("image_file") and scene.get("id") is not None:
+            ids.setdefault(scene["image_file"], str(scene["id"]))
+    labels = []
+    for t, img_path in sorted(slide_events, key=lambda x: x[0]):
+        name = os.path.basename(img_path)
+        labels.append((t, f"Scene {ids[name]}" if name in ids else name))
+    return labels
+
+def write_overlay(path, scenario, slide_events, total_duration, height=PROXY_HEIGHT):
+    """
+    Writes the burned-in overlay (running timecode top left, scene id top right)
+    as an ASS subtitle file for FFmpeg's `ass` filter.
+    """
+    width, height = proxy_size(height)
+    font_size = max(12, height // 20)
+    lines = [ASS_HEADER.format(width=width, height=height, font_size=font_size, margin=font_size // 2)]
+
+    steps = int(total_duration / TIMECODE_STEP) + 1
+    for i in range(steps):
+        start = i * TIMECODE_STEP
+        lines.append(f"Dialogue: 0,{_ass_time(start)},{_ass_time(start + TIMECODE_STEP)},TC,,0,0,0,,{_timecode(start)}\n")
+
+    labels = scene_labels(scenario, slide_events)
+    for i, (start, label) in enumerate(labels):
+        end = labels[i + 1][0] if i < len(labels) - 1 else total_duration
+        if end > start:
+            lines.append(f"Dialogue: 0,{_ass_time(start)},{_ass_time(end)},Scene,,0,0,0,,{label}\n")
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    return path
+
+def overlay_filter(path):
+    """Filter that burns the overlay file into the video (drive colons escaped for Windows)."""
+    escaped = os.path.abspath(path).replace("\\", "/").replace(":", "\\:")
+    return f"ass=filename='{escaped}'"
@@ -0,0 +1,114 @@
+"""
+Recording Stitch Module
+Joins the OBS recordings of a session recorded in blocks (or resumed after a
+failure) into one file with a stream-copy concat, and maps the logged event
+times onto the stitched timeline.
+"""
+
+import os
+import json
+from media_probe import get_video_duration
+from ffmpeg_runner import concat_file_line, run_ffmpeg
+
+def load_recordings(assets_dir):
+    """Returns the "recordings" listed in recording_log.json (empty for older logs)."""
+    log_path = os.path.join(assets_dir, "recording_log.json")
+    if not os.path.exists(log_path):
+        return []
+    with open(log_path, 'r', encoding='utf-8') as f:
+        return json.load(f).get("recordings", [])
+
+def recording_start(log):
+    """
+    Log time at which the (first) OBS recording begins (negative: OBS starts before T=0).
+
+    Composites run on the recording's file time, so event times are moved by
+    -recording_start() (build_timeline, the live compositor). Returns None while
+    the director has not logged the recording yet; logs written before
+    recordings were logged map file time 0 to log time 0.
+    """
+    if "recordings" not in log:
+        return 0.0
+    recordings = log["recordings"]
+    return recordings[0]["start"] if recordings else None
+
+def resolve_recording_files(obs_videos, recordings):
+    """
+    Matches the OBS files given on the command line to the logged recordings.
+
+    A single file for several logged recordings falls back to the paths OBS
+    reported when each recording stopped.
+
+    Raises:
+        ValueError: If the files cannot be matched to the log.
+    """
+    if len(obs_videos) == 1 and len(recordings) > 1:
+        files = [r.get("file") for r in recordings]
+        missing = [i for i, path in enumerate(files) if not path or not os.path.exists(path)]
+        if missing:
+            raise ValueError(f"The log lists {len(recordings)} recordings; pass all of them "
+                             f"(recording {missing[0] + 1} was not found)")
+        return files
+    if recordings and len(obs_videos) != len(recordings):
+        raise ValueError(f"{len(obs_videos)} OBS files given but the log lists {len(recordings)} recordings")
+    return list(obs_videos)
+
+def recording_shifts(durations, recordings):
+    """
+    Offsets that move logged event times onto the stitched recording.
+
+    Recording k starts at log time recordings[k]["start"] but at the sum of the
+    previous durations in the stitched file. The shifts apply on top of the
+    move to file time (-recording_start(), see build_timeline), which already
+    places the first recording, so its shift is 0.
+
+    Returns:
+        dict: recording index -> shift in seconds.
+    """
+    if not recordings:
+        return {}
+    shifts = {}
+    position = 0.0
+    for index, (duration, recording) in enumerate(zip(durations, recordings)):
+        shifts[index] = position - (recording["start"] - recordings[0]["start"])
+        position += duration
+    return shifts
+
+def stitch_recordings(ffmpeg_exe, obs_videos, recordings, out_path, progress_callback=None):
+    """
+    Concatenates the recordings without re-encoding (concat demuxer, stream copy).
+
+    Recordings cut by a resumed session end at their logged "outpoint".
+
+    Args:
+        obs_videos (list): Recording files in order.
+        recordings (list): Logged recordings (may be empty for older logs).
+        out_path (str): Stitched file (same container as the recordings).
+
+    Returns:
+        dict: recording index -> time shift for build_timeline().
+    """
+    durations = []
+    lines = []
+    for index, path in enumerate(obs_videos):
+        outpoint = recordings[index].get("outpoint") if index < len(recordings) else None
+        duration = get_video_duration(ffmpeg_exe, path)
+        lines.append(concat_file_line(path))
+        if outpoint is not None and outpoint < duration:
+            lines.append(f"outpoint {outpoint:.6f}")
+            duration = outpoint
+        durations.append(duration)
+
+    list_file = f"{out_path}.txt"
+    with open(list_file, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+    print(f"[Stitch] Joining {len(obs_videos)} recordings ({sum(durations):.1f}s) by stream copy")
+    cmd = [
+        ffmpeg_exe, "-y",
+        "-f", "concat", "-safe", "0", "-i", list_file,
+        "-map", "0", "-c", "copy",
+        out_path,
+    ]
+    run_ffmpeg(cmd, progress_callback=progress_callback, total_duration=sum(durations))
+    return recording_shifts(durations, recordings)
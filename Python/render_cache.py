@@ -0,0 +1,109 @@
+"""
+Render Cache Module
+Content-addressed on-disk cache for rendered files with size-based LRU eviction.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+
+# Sampled fingerprint of large media (OBS recordings are several GB)
+FINGERPRINT_SAMPLES = 16
+FINGERPRINT_CHUNK = 1 << 16
+
+_digest_memo = {}
+
+def file_digest(path):
+    """Returns the SHA-256 of a file's contents (memoized by size and mtime)."""
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    if memo_key not in _digest_memo:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        _digest_memo[memo_key] = h.hexdigest()
+    return _digest_memo[memo_key]
+
+def media_fingerprint(path):
+    """
+    Returns a fast fingerprint of a large media file.
+
+    Hashes the size plus evenly spaced chunks instead of the whole file, which is
+    enough to tell recordings apart without reading gigabytes.
+    """
+    size = os.path.getsize(path)
+    h = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        for i in range(FINGERPRINT_SAMPLES):
+            f.seek(max(0, (size - FINGERPRINT_CHUNK) * i // max(1, FINGERPRINT_SAMPLES - 1)))
+            h.update(f.read(FINGERPRINT_CHUNK))
+    return h.hexdigest()
+
+def hash_inputs(**parts):
+    """Returns a stable cache key for a set of JSON-serializable inputs."""
+    payload = json.dumps(parts, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class RenderCache:
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding cached files (created if missing).
+            max_bytes (int): Size limit; least recently used files are evicted beyond it.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, key, ext=".mp4"):
+        return os.path.join(self.cache_dir, key[:2], key + ext)
+
+    def get(self, key, ext=".mp4"):
+        """Returns the cached path for `key` (marking it as recently used) or None."""
+        path = self.path_for(key, ext)
+        if os.path.exists(path):
+            os.utime(path) # Refresh LRU position
+            self.hits += 1
+            return path
+        self.misses += 1
+        return None
+
+    def put(self, key, src_path, ext=".mp4"):
+        """Moves a rendered file into the cache and returns its cached path."""
+        path = self.path_for(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.part"
+        shutil.move(src_path, tmp_path)
+        os.replace(tmp_path, path) # Atomic publish, no half-written entries
+        return path
+
+    def evict(self, keep=()):
+        """Deletes least recently used files until the cache fits in max_bytes."""
+        keep = {os.path.abspath(p) for p in keep}
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".part"):
+                    continue
+                path = os.path.join(root, name)
+                st = os.stat(path)
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if os.path.abspath(path) in keep:
+                continue
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,56 @@
+"""
+Render Report Module
+Measures wall time per compositor stage and writes a JSON report, used to spot
+regressions and plan render farm capacity.
+"""
+
+import json
+import time
+import socket
+from contextlib import contextmanager
+
+class StageTimer:
+    def __init__(self):
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.stages = {} # name -> seconds (accumulated)
+        self.last_progress = None
+
+    @contextmanager
+    def stage(self, name):
+        """Times a block and adds it to the stage `name`."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def track_progress(self, callback=None):
+        """Wraps a progress callback so the last telemetry ends up in the report."""
+        def wrapped(progress):
+            self.last_progress = progress
+            if callback:
+                callback(progress)
+        return wrapped
+
+    def report(self, **extra):
+        wall = time.perf_counter() - self._t0
+        report = {
+            "host": socket.gethostname(),
+            "started_at": self.started_at,
+            "wall_time": wall,
+            "stages": dict(self.stages),
+            "encode_progress": self.last_progress,
+        }
+        output_duration = extra.get("output_duration")
+        if output_duration and wall > 0:
+            report["realtime_factor"] = output_duration / wall
+        report.update(extra)
+        return report
+
+    def write_report(self, path, **extra):
+        report = self.report(**extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Timing report saved to {path}")
+        return report
@@ -0,0 +1,74 @@
+"""
+Bake Motion: Procedural idle motion -> curve file
+Renders one of the procedural generators offline with a fixed seed and saves
+the result as baked curves (prototype/motion_curves.py), so the idle motion is
+identical between takes and playback is only a lookup.
+
+Usage:
+    python bake_motion.py idle.curves [--source v2|osc|engine] [--duration 120] [--fps 60] [--seed 0]
+    python ../prototype/motion_curves.py idle.curves --loop
+"""
+
+import os
+import sys
+import random
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prototype"))
+from motion_curves import write_curves
+from procedural_engine import ProceduralEngine
+from simulacra_osc import get_procedural_values
+from simulacra_v2 import IdleMotion
+
+SOURCES = ("v2", "osc", "engine")
+
+def bake(source, duration, fps, seed):
+    """
+    Runs a generator on the frame grid (frame k at k / fps, first dt 0, as in the live loops).
+
+    Returns:
+        (list, np.ndarray): Parameter names and (parameters, frames) values.
+    """
+    frames = int(round(duration * fps)) + 1
+    times = np.arange(frames) / fps
+
+    if source == "osc":
+        rows = [get_procedural_values(t) for t in times]
+        names = list(rows[0])
+        return names, np.array([[row[name] for name in names] for row in rows]).T
+
+    if source == "v2":
+        random.seed(seed) # The V2 controllers draw from the global generator
+        motion = IdleMotion()
+        rows = [motion.update(t, t - times[max(k - 1, 0)]) for k, t in enumerate(times)]
+        names = list(rows[0])
+        return names, np.array([[row[name] for name in names] for row in rows]).T
+
+    if source == "engine":
+        engine = ProceduralEngine(1, seed=seed)
+        curves = np.empty((len(engine.names), frames))
+        for k, t in enumerate(times):
+            curves[:, k] = engine.step(t - times[max(k - 1, 0)])[0]
+        return engine.names, curves
+
+    raise ValueError(f"Unknown source '{source}' (expected one of {', '.join(SOURCES)})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake procedural idle motion into a curve file")
+    parser.add_argument("output", help="Curve file to write (.curves)")
+    parser.add_argument("--source", default="v2", choices=SOURCES,
+                        help="v2: simulacra_v2 controllers, osc: simulacra_osc sines, engine: procedural_engine")
+    parser.add_argument("--duration", default=120.0, type=float, help="Seconds to bake")
+    parser.add_argument("--fps", default=60.0, type=float, help="Bake frame rate")
+    parser.add_argument("--seed", default=0, type=int, help="Random seed (same seed, same motion)")
+    args = parser.parse_args()
+
+    names, curves = bake(args.source, args.duration, args.fps, args.seed)
+    write_curves(args.output, names, curves, args.fps)
+    size = os.path.getsize(args.output)
+    print(f"[Bake] {args.source} (seed {args.seed}): {len(names)} parameters x {curves.shape[1]} frames "
+          f"@ {args.fps:g} fps -> {args.output} ({size / 1024:.1f} KB)")
+
+if __name__ == "__main__":
+    main()
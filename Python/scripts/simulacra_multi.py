@@ -0,0 +1,56 @@
+"""
+Simulacra Multi: Procedural idle motion for several avatars
+Same body/face layers as simulacra_v2.py, computed for every avatar in one
+vectorized step per frame (procedural_engine.py) and sent as one bundle per
+avatar endpoint.
+
+Usage:
+    python simulacra_multi.py --avatar 127.0.0.1:9000 --avatar 127.0.0.1:9001
+    python simulacra_multi.py --avatar 127.0.0.1:9000/avatar/a --avatar 127.0.0.1:9000/avatar/b
+"""
+
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prototype"))
+from frame_scheduler import FrameScheduler
+from procedural_engine import ProceduralEngine, parse_avatar
+
+# Config
+DEFAULT_AVATAR = "127.0.0.1:9000"
+FPS = 60
+STATS_INTERVAL = 5.0 # Seconds between frame timing reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Procedural idle motion for one or more avatars")
+    parser.add_argument("--avatar", action="append", metavar="IP:PORT[/PREFIX]",
+                        help=f"Avatar endpoint, repeatable (default: {DEFAULT_AVATAR}); "
+                             "an optional prefix replaces /avatar/parameters")
+    parser.add_argument("--fps", default=FPS, type=float, help="Frames per second")
+    parser.add_argument("--seed", default=None, type=int, help="Random seed (reproducible motion)")
+    args = parser.parse_args()
+
+    avatars = [parse_avatar(spec) for spec in args.avatar or [DEFAULT_AVATAR]]
+    engine = ProceduralEngine(avatars, seed=args.seed)
+    print(f"--- Simulacra Multi ({len(avatars)} avatars, {len(engine.names)} parameters) ---")
+    for avatar in avatars:
+        print(f"  {avatar['ip']}:{avatar['port']} {avatar.get('prefix', '')}")
+
+    scheduler = FrameScheduler(args.fps)
+    next_stats = STATS_INTERVAL # Frame time of the next report (indices can be skipped)
+
+    try:
+        for frame in scheduler:
+            engine.step(frame.dt)
+            engine.send()
+
+            if frame.time >= next_stats:
+                print(f"[Frames] {scheduler.format_stats()}")
+                next_stats = frame.time + STATS_INTERVAL
+
+    except KeyboardInterrupt:
+        print("\nStopping...")
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,20 @@ Simulacra OSC Controller
 Generates procedural "life-like" motion (breathing, sway) and sends it to Unity via OSC.
 """
 
-import time
+import os
+import sys
 import math
 import random
-from pythonosc import udp_client
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prototype"))
+from osc_transport import get_transport
+from frame_scheduler import FrameScheduler
 
 # Configuration
 OSC_IP = "127.0.0.1"
 OSC_PORT = 9000
 FPS = 30
+STATS_INTERVAL = 5.0 # Seconds between frame timing reports
 
 def get_procedural_values(t):
     """
@@ -36,31 +41,30 @@ def get_procedural_values(t):
     }
 
 def main():
-    client = udp_client.SimpleUDPClient(OSC_IP, OSC_PORT)
+    transport = get_transport(OSC_IP, OSC_PORT)
     print(f"--- Simulacra OSC Started ({OSC_IP}:{OSC_PORT}) ---")
     print("Press Ctrl+C to stop.")
     
-    start_time = time.time()
+    # Frames on a fixed grid: the rate does not drift with the work per frame
+    scheduler = FrameScheduler(FPS)
+    next_stats = STATS_INTERVAL # Frame time of the next report (indices can be skipped)
     
     try:
-        while True:
-            current_time = time.time()
-            elapsed = current_time - start_time
-            
-            # Calculate values
-            values = get_procedural_values(elapsed)
+        for frame in scheduler:
+            # Calculate values (at the frame's scheduled time, so motion stays smooth under jitter)
+            values = get_procedural_values(frame.time)
             
-            # Send OSC
-            # Using bundles would be more efficient, but individual messages are fine for localhost
+            # Send OSC: one bundle per frame
             for key, val in values.items():
-                address = f"/avatar/parameters/{key}"
-                client.send_message(address, val)
+                transport.set(f"/avatar/parameters/{key}", val)
+            transport.flush()
             
             # Control Logic for Random Gaze (Optional Micro-movements)
             # if random.random() < 0.01: ...
             
-            # Wait for next frame
-            time.sleep(1.0 / FPS)
+            if frame.time >= next_stats:
+                print(f"[Frames] {scheduler.format_stats()}")
+                next_stats = frame.time + STATS_INTERVAL
             
     except KeyboardInterrupt:
         print("\nStopping...")
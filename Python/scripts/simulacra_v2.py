@@ -3,15 +3,20 @@ Simulacra V2: Full Body & Face Controller
 Generates "Life-like" noise for Body (Sway/Breath) and Face (Blink/Brows/Mouth).
 """
 
-import time
+import os
+import sys
 import math
 import random
-from pythonosc import udp_client
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prototype"))
+from osc_transport import get_transport
+from frame_scheduler import FrameScheduler
 
 # Config
 OSC_IP = "127.0.0.1"
 OSC_PORT = 9000
 FPS = 60
+STATS_INTERVAL = 5.0 # Seconds between frame timing reports
 
 # Blink State Machine
 BLINK_STATE_OPEN = 0
@@ -24,13 +29,15 @@ class BlinkController:
         self.state = BLINK_STATE_OPEN
         self.value = 0.0
         self.timer = 0.0
-        self.next_blink_time = time.time() + random.uniform(1.0, 4.0)
+        self.time = 0.0 # Own clock, advanced by dt (never mixed with wall-clock time)
+        self.next_blink_time = random.uniform(1.0, 4.0)
         self.duration_close = 0.1
         self.duration_closed = 0.05
         self.duration_open = 0.15
 
     def update(self, dt):
-        now = time.time()
+        self.time += dt
+        now = self.time
         
         if self.state == BLINK_STATE_OPEN:
             self.value = 0.0
@@ -95,57 +102,67 @@ class NoiseGen:
             
         return self.val
 
+class IdleMotion:
+    """All V2 controllers together; update() returns one frame of parameter values."""
+    def __init__(self):
+        self.blink_ctrl = BlinkController()
+        self.brows_ctrl = NoiseGen(speed=0.2, min_v=0.0, max_v=0.4) # Subtle brows
+        self.mouth_ctrl = NoiseGen(speed=0.1, min_v=0.0, max_v=0.3) # Subtle smile
+        self.head_sway = NoiseGen(speed=0.3, min_v=-0.5, max_v=0.5)
+
+    def update(self, elapsed, dt):
+        # 1. Body Logic (Sine Waves)
+        breath = (math.sin(elapsed * 1.5) + 1.0) / 2.0
+        body_sway = math.sin(elapsed * 0.5)
+        
+        # 2. Face Logic
+        blink_val = self.blink_ctrl.update(dt)
+        brows_val = self.brows_ctrl.update(dt)
+        
+        # Exaggerate for debugging
+        # brows_val = brows_val * 2.0 
+        
+        mouth_val = self.mouth_ctrl.update(dt)
+        head_yaw_val = self.head_sway.update(dt)
+        
+        # print(f"Blink: {blink_val:.2f} | Brows: {brows_val:.2f} | Mouth: {mouth_val:.2f} | Sway: {body_sway:.2f}", end="\r")
+
+        return {
+            # Body
+            "HeadYaw": head_yaw_val,
+            "HeadPitch": math.cos(elapsed*0.3)*0.1,
+            "BodySway": body_sway,
+            "Breath": breath,
+            # Face
+            "EyeBlink": blink_val,
+            "BrowsUp": brows_val,
+            "MouthSmile": mouth_val,
+        }
+
 def main():
-    client = udp_client.SimpleUDPClient(OSC_IP, OSC_PORT)
+    transport = get_transport(OSC_IP, OSC_PORT)
     print(f"--- Simulacra V2 (Face+Body) ({OSC_IP}:{OSC_PORT}) ---")
     
-    start_time = time.time()
-    
     # Controllers
-    blink_ctrl = BlinkController()
-    brows_ctrl = NoiseGen(speed=0.2, min_v=0.0, max_v=0.4) # Subtle brows
-    mouth_ctrl = NoiseGen(speed=0.1, min_v=0.0, max_v=0.3) # Subtle smile
-    head_sway = NoiseGen(speed=0.3, min_v=-0.5, max_v=0.5)
+    motion = IdleMotion()
     
-    last_loop = time.time()
+    # Frames on a fixed grid: the rate does not drift with the work per frame
+    scheduler = FrameScheduler(FPS)
+    next_stats = STATS_INTERVAL # Frame time of the next report (indices can be skipped)
     
     try:
-        while True:
-            now = time.time()
-            dt = now - last_loop
-            last_loop = now
-            elapsed = now - start_time
-            
-            # 1. Body Logic (Sine Waves)
-            breath = (math.sin(elapsed * 1.5) + 1.0) / 2.0
-            body_sway = math.sin(elapsed * 0.5)
-            
-            # 2. Face Logic
-            blink_val = blink_ctrl.update(dt)
-            brows_val = brows_ctrl.update(dt)
-            
-            # Exaggerate for debugging
-            # brows_val = brows_val * 2.0 
-            
-            mouth_val = mouth_ctrl.update(dt)
-            head_yaw_val = head_sway.update(dt)
-            
-            # print(f"Blink: {blink_val:.2f} | Brows: {brows_val:.2f} | Mouth: {mouth_val:.2f} | Sway: {body_sway:.2f}", end="\r")
-
-            # 3. Send Bundle
+        for frame in scheduler:
+            # Scheduled frame time and step (not wake-up times), so motion stays smooth under jitter
+            values = motion.update(frame.time, frame.dt)
 
-            # Body
-            client.send_message("/avatar/parameters/HeadYaw", head_yaw_val)
-            client.send_message("/avatar/parameters/HeadPitch", math.cos(elapsed*0.3)*0.1)
-            client.send_message("/avatar/parameters/BodySway", body_sway)
-            client.send_message("/avatar/parameters/Breath", breath)
-            
-            # Face
-            client.send_message("/avatar/parameters/EyeBlink", blink_val)
-            client.send_message("/avatar/parameters/BrowsUp", brows_val)
-            client.send_message("/avatar/parameters/MouthSmile", mouth_val)
+            # Send Bundle (one datagram per frame)
+            for key, val in values.items():
+                transport.set(f"/avatar/parameters/{key}", val)
+            transport.flush()
             
-            time.sleep(1.0 / FPS)
+            if frame.time >= next_stats:
+                print(f"[Frames] {scheduler.format_stats()}")
+                next_stats = frame.time + STATS_INTERVAL
             
     except KeyboardInterrupt:
         print("\nStopping...")
@@ -0,0 +1,235 @@
+"""
+Segmented Render Module
+Splits the composite timeline at slide boundaries, encodes the segments in parallel
+and joins them with a stream-copy concat.
+"""
+
+import os
+import time
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from render_cache import file_digest, hash_inputs, media_fingerprint
+from ffmpeg_runner import AudioPipe, concat_file_line, run_ffmpeg
+from output_profiles import build_split_graph
+
+def plan_segments(slide_events, total_duration, black_img, fps=30):
+    """
+    Splits the timeline into segments that each show a single slide.
+
+    Boundaries are snapped to the output frame grid so that the concatenated
+    segments line up frame-accurately with the single-pass render.
+
+    Returns:
+        list: dicts with index, image, start_frame and frames.
+    """
+    end_frame = int(round(total_duration * fps))
+    sorted_slides = sorted(slide_events, key=lambda x: x[0])
+
+    # (start_frame, image) boundaries; black until the first slide
+    boundaries = []
+    if not sorted_slides or int(round(sorted_slides[0][0] * fps)) > 0:
+        boundaries.append((0, black_img))
+    for t, img_path in sorted_slides:
+        if not os.path.exists(img_path):
+            img_path = black_img
+        boundaries.append((max(0, int(round(t * fps))), img_path))
+
+    segments = []
+    for i, (start_frame, img_path) in enumerate(boundaries):
+        next_frame = boundaries[i + 1][0] if i < len(boundaries) - 1 else end_frame
+        next_frame = min(next_frame, end_frame)
+        if next_frame <= start_frame:
+            continue # Zero-length (two slides on the same frame, or past the end)
+        segments.append({
+            "index": len(segments),
+            "image": img_path,
+            "start_frame": start_frame,
+            "frames": next_frame - start_frame,
+        })
+    return segments
+
+def build_segment_cmd(ffmpeg_exe, segment, obs_video, out_paths, filter_complex, outputs, fps=30, threads=0, obs_offset=0.0):
+    """
+    Builds the FFmpeg command that renders one segment (video only).
+
+    Args:
+        out_paths (list): One file per entry of `outputs`.
+        filter_complex (str): Composite graph ending in [v].
+        outputs (list): Output descriptions (see output_profiles.resolve_outputs).
+        obs_offset (float): Timeline position of the OBS file's first frame (split recordings).
+    """
+    start = segment["start_frame"] / fps - obs_offset
+    # Read one extra frame of the source so the last output frame is never starved
+    duration = (segment["frames"] + 1) / fps
+    graph, labels = build_split_graph(filter_complex, outputs)
+    cmd = [
+        ffmpeg_exe,
+        "-y", "-v", "error",
+        "-loop", "1", "-framerate", str(fps), "-i", segment["image"], # Input 0: Slide
+        "-ss", f"{start:.6f}", "-t", f"{duration:.6f}", "-i", obs_video, # Input 1: OBS (accurate seek)
+        "-filter_complex", graph,
+        "-filter_threads", str(threads),
+    ]
+    for label, out, out_path in zip(labels, outputs, out_paths):
+        cmd += [
+            "-map", f"[{label}]",
+            "-frames:v", str(segment["frames"]),
+            "-r", str(fps),
+            "-an",
+            *out["codec_args"],
+            "-threads", str(threads),
+            out_path
+        ]
+    return cmd
+
+def _run_segment(job):
+    """Pool worker: runs one segment encode."""
+    index, cmd, out_paths = job
+    subprocess.run(cmd, check=True)
+    return index, out_paths
+
+def render_segmented(ffmpeg_exe, slide_events, total_duration, obs_video, audio, outputs,
+                     segments_dir, black_img, filter_fn, fps=30, jobs=None, keep_temp=False,
+                     cache=None, progress_callback=None):
+    """
+    Renders the composite as independent per-slide segments in a process pool.
+
+    Audio is not cut per segment: the master audio is muxed once over the joined
+    video so it stays continuous across the joins.
+
+    Args:
+        audio (str or AudioPipe): Master audio file, or a pipe streaming the mix.
+        outputs (list): Output descriptions (see output_profiles.resolve_outputs).
+            Every segment is encoded once per output with identical settings so the
+            segments can be joined without re-encoding.
+        filter_fn (callable): (bg_input, obs_input) -> filter_complex string.
+        jobs (int): Number of concurrent encodes (defaults to all cores).
+        cache (RenderCache): When given, segments are looked up by a hash of their
+            inputs and only the missing (dirty) ones are encoded.
+        progress_callback (callable): Receives aggregate telemetry (same keys as
+            ffmpeg_runner.parse_progress) as segments complete, then the join's progress.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    os.makedirs(segments_dir, exist_ok=True)
+
+    segments = plan_segments(slide_events, total_duration, black_img, fps)
+    if not segments:
+        raise ValueError("Timeline is empty, nothing to render.")
+
+    # Share the cores between concurrent encodes instead of oversubscribing
+    workers = min(jobs, len(segments))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    filter_complex = filter_fn(0, 1)
+
+    # Everything except the slide and the window is shared by all segments
+    base_key = None
+    if cache:
+        base_key = {
+            "obs": media_fingerprint(obs_video),
+            "filter": filter_complex,
+            "fps": fps,
+        }
+
+    # seg_paths[output][segment]
+    seg_paths = [[None] * len(segments) for _ in outputs]
+    seg_keys = [[None] * len(outputs) for _ in segments]
+    cmds = []
+    for seg in segments:
+        index = seg["index"]
+        if cache:
+            image_digest = file_digest(seg["image"])
+            cached_all = True
+            for o, out in enumerate(outputs):
+                key = hash_inputs(
+                    image=image_digest,
+                    start_frame=seg["start_frame"],
+                    frames=seg["frames"],
+                    output_filter=out["filter"],
+                    codec=out["codec_args"],
+                    **base_key
+                )
+                seg_keys[index][o] = key
+                cached = cache.get(key)
+                if cached:
+                    seg_paths[o][index] = os.path.abspath(cached)
+                else:
+                    cached_all = False
+            if cached_all:
+                continue
+        out_paths = [
+            os.path.abspath(os.path.join(segments_dir, f"segment_{index:04d}_{out['name']}.mp4"))
+            for out in outputs
+        ]
+        cmds.append((index, build_segment_cmd(ffmpeg_exe, seg, obs_video, out_paths, filter_complex, outputs, fps, threads), out_paths))
+
+    if cache:
+        print(f"Segment cache: {len(segments) - len(cmds)}/{len(segments)} reused, {len(cmds)} to encode")
+    if cmds:
+        workers = min(workers, len(cmds))
+        print(f"Encoding {len(cmds)} segments with {workers} workers ({threads} threads each)...")
+        total_frames = sum(segments[index]["frames"] for index, _, _ in cmds)
+        done_frames = 0
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for index, out_paths in pool.map(_run_segment, cmds):
+                for o, seg_path in enumerate(out_paths):
+                    if cache:
+                        seg_path = os.path.abspath(cache.put(seg_keys[index][o], seg_path))
+                    seg_paths[o][index] = seg_path
+                if progress_callback:
+                    done_frames += segments[index]["frames"]
+                    elapsed = time.perf_counter() - t0
+                    speed = (done_frames / fps) / elapsed if elapsed > 0 else None
+                    progress_callback({
+                        "frame": done_frames,
+                        "fps": done_frames / elapsed if elapsed > 0 else None,
+                        "bitrate_kbps": None,
+                        "out_time": done_frames / fps,
+                        "speed": speed,
+                        "eta": (total_frames - done_frames) / fps / speed if speed else None,
+                        "done": done_frames == total_frames,
+                    })
+
+    join_segments(ffmpeg_exe, seg_paths, audio, outputs, total_duration, segments_dir, progress_callback)
+
+    if cache:
+        cache.evict(keep=[p for paths in seg_paths for p in paths])
+    if not keep_temp:
+        shutil.rmtree(segments_dir, ignore_errors=True)
+    return [out["path"] for out in outputs]
+
+def join_segments(ffmpeg_exe, seg_paths, audio, outputs, total_duration, list_dir, progress_callback=None):
+    """
+    Joins encoded segments into the outputs: one concat input per output,
+    stream-copied video, and the continuous master audio muxed over it.
+
+    Args:
+        seg_paths (list): seg_paths[output][segment], in timeline order.
+        audio (str or AudioPipe): Master audio file, or a pipe streaming the mix.
+    """
+    audio_pipe = audio if isinstance(audio, AudioPipe) else None
+    audio_input = audio_pipe.input_args() if audio_pipe else ["-i", audio]
+    cmd = [ffmpeg_exe, "-y"]
+    for o, out in enumerate(outputs):
+        list_file = os.path.join(list_dir, f"segments_{out['name']}.txt")
+        with open(list_file, 'w', encoding='utf-8') as f:
+            for p in seg_paths[o]:
+                f.write(concat_file_line(p) + "\n")
+        cmd += ["-f", "concat", "-safe", "0", "-i", list_file] # Input o: Segments
+    cmd += audio_input # Input N: Audio
+    audio_index = len(outputs)
+    for o, out in enumerate(outputs):
+        cmd += [
+            "-map", f"{o}:v",
+            "-map", f"{audio_index}:a",
+            "-c:v", "copy",
+            "-c:a", "copy",
+            "-t", str(total_duration),
+            out["path"]
+        ]
+    print("Joining segments:")
+    print(" ".join(cmd))
+    run_ffmpeg(cmd, audio_pipe=audio_pipe, progress_callback=progress_callback, total_duration=total_duration)
@@ -0,0 +1,129 @@
+"""
+Sync Estimator Module
+Measures the audio offset between the OBS recording and the master mix built
+from recording_log.json with FFT cross-correlation, optionally per window to
+estimate slow clock drift over long recordings.
+"""
+
+import subprocess
+import numpy as np
+
+from audio_mixer import MasterAudioMixer
+
+# Speech correlates fine at a low rate; keeps an hour of audio around 100 MB
+ANALYSIS_RATE = 8000
+
+def extract_obs_audio(ffmpeg_exe, obs_video, rate=ANALYSIS_RATE):
+    """
+    Decodes the recording's audio track as mono float32 at `rate`.
+
+    Samples start at the container's t=0: an audio stream that starts later
+    than the video is padded with leading silence (aresample first_pts=0),
+    otherwise the delay would be invisible to the correlation.
+    """
+    cmd = [
+        ffmpeg_exe, "-v", "error",
+        "-i", obs_video,
+        "-vn", "-af", "aresample=async=1:first_pts=0", "-ac", "1", "-ar", str(rate),
+        "-f", "f32le", "-"
+    ]
+    raw = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(raw, dtype=np.float32)
+
+def render_mix(audio_events, total_duration, rate=ANALYSIS_RATE):
+    """Renders the master mix (without any offset) as mono float32 at `rate`."""
+    mixer = MasterAudioMixer(samplerate=rate, channels=1, block_frames=rate * 60)
+    for start, path in audio_events:
+        mixer.add(path, start)
+    return np.concatenate([block[:, 0].copy() for block in mixer.blocks(total_duration)])
+
+def _next_pow2(n):
+    return 1 << (int(n) - 1).bit_length()
+
+def cross_correlate(reference, delayed, max_lag):
+    """
+    Finds the lag (in samples) by which `delayed` trails `reference`.
+
+    Searches lags in [-max_lag, max_lag] via FFT and refines the peak with
+    parabolic interpolation.
+
+    Returns:
+        tuple: (lag_samples, confidence) where confidence is the normalized peak (0-1).
+    """
+    n = _next_pow2(len(reference) + len(delayed))
+    spec = np.fft.rfft(delayed, n) * np.conj(np.fft.rfft(reference, n))
+    corr = np.fft.irfft(spec, n)
+    # corr[k] = sum delayed[i + k] * reference[i]; negative lags wrap to the end
+    lags = np.concatenate([corr[-max_lag:], corr[:max_lag + 1]])
+    peak = int(np.argmax(lags))
+    lag = float(peak - max_lag)
+    if 0 < peak < len(lags) - 1:
+        y0, y1, y2 = lags[peak - 1], lags[peak], lags[peak + 1]
+        denom = y0 - 2 * y1 + y2
+        if denom != 0:
+            lag += 0.5 * (y0 - y2) / denom
+
+    energy = np.sqrt(np.dot(reference, reference) * np.dot(delayed, delayed))
+    confidence = float(lags[peak] / energy) if energy > 0 else 0.0
+    return float(lag), confidence
+
+def estimate_sync(ffmpeg_exe, obs_video, audio_events, total_duration, max_offset=5.0,
+                  drift=False, window=60.0, min_confidence=0.2):
+    """
+    Estimates the --audio-offset that aligns the master mix with the OBS audio.
+
+    Args:
+        audio_events (list): (start, wav_path) from build_timeline() with zero offset.
+        max_offset (float): Largest offset searched, in seconds.
+        drift (bool): Also measure the offset per window and fit a linear drift.
+        window (float): Window length in seconds for the drift fit.
+
+    Returns:
+        dict: offset (s), confidence, drift (s per s, 0.0 unless measured) and the
+        per-window measurements.
+    """
+    rate = ANALYSIS_RATE
+    obs = extract_obs_audio(ffmpeg_exe, obs_video, rate)
+    mix = render_mix(audio_events, total_duration, rate)
+    max_lag = int(max_offset * rate)
+
+    lag, confidence = cross_correlate(mix, obs, max_lag)
+    result = {"offset": lag / rate, "confidence": confidence, "drift": 0.0, "windows": []}
+    print(f"[Sync] Measured offset: {result['offset'] * 1000:+.1f} ms (confidence {confidence:.2f})")
+
+    if drift:
+        win = int(window * rate)
+        base = int(round(lag))
+        times, offsets = [], []
+        for start in range(0, len(mix) - win + 1, win):
+            ref = mix[start:start + win]
+            if not ref.any():
+                continue # Silence carries no timing information
+            # Matching OBS span around the global offset, padded by the search range
+            lo = start + base - max_lag
+            seg = obs[max(0, lo):max(0, start + base + win + max_lag)]
+            # Zero-pad so that the expected position is always max_lag samples into seg
+            pad = max(0, -lo)
+            seg = np.concatenate([np.zeros(pad, dtype=np.float32), seg])
+            if len(seg) < win + max_lag:
+                continue
+            w_lag, w_conf = cross_correlate(ref, seg, 2 * max_lag)
+            w_lag -= max_lag # Residual relative to the global offset
+            if w_conf < min_confidence:
+                continue
+            t = (start + win / 2) / rate
+            offset = (base + w_lag) / rate
+            times.append(t)
+            offsets.append(offset)
+            result["windows"].append({"time": t, "offset": offset, "confidence": w_conf})
+
+        if len(times) >= 2:
+            slope, intercept = np.polyfit(times, offsets, 1)
+            result["offset"] = float(intercept)
+            result["drift"] = float(slope)
+            print(f"[Sync] Drift: {slope * 1e6:+.1f} ppm over {len(times)} windows "
+                  f"(offset at t=0: {intercept * 1000:+.1f} ms)")
+        else:
+            print("[Sync] Not enough confident windows for a drift fit; using the global offset.")
+
+    return result
@@ -0,0 +1,88 @@
+"""
+Live vs Offline Timeline Test
+Renders one recording_log.json through the offline timeline (build_timeline +
+segment plan) and through the live compositor (chunk encodes, FFmpeg calls
+captured instead of run) and checks that both change slides at the same output
+frames and read the same OBS file times.
+
+Usage:
+    python -m pytest Python/tests
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import soundfile as sf
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import live_compositor
+from compositor import FPS, build_timeline
+from output_profiles import resolve_outputs
+from segmented_render import plan_segments
+
+# OBS starts recording about a second before T=0 of the log (see SceneDirector._wait_for_obs)
+RECORDING_START = -1.0
+
+def _segment_calls(calls):
+    """(slide image, OBS seek time in seconds, frames) per captured segment encode."""
+    segments = []
+    for call in calls:
+        cmd = call.args[0]
+        segments.append((cmd[cmd.index("-i") + 1], round(float(cmd[cmd.index("-ss") + 1]), 6),
+                         int(cmd[cmd.index("-frames:v") + 1])))
+    return segments
+
+class LiveOfflineTimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.assets_dir = tempfile.mkdtemp(prefix="ghostless_timeline_")
+        os.makedirs(os.path.join(self.assets_dir, "images"))
+        os.makedirs(os.path.join(self.assets_dir, "voice"))
+        for name in ("slide_001.png", "slide_002.png"):
+            Image.new("RGB", (16, 9)).save(os.path.join(self.assets_dir, "images", name))
+        sf.write(os.path.join(self.assets_dir, "voice", "voice_001.wav"), np.zeros(44100 * 3, dtype=np.float32), 44100)
+        self.log = {
+            "start_time": time.time(), "elapsed": 12.0, "finished": False, "completed_scenes": 2,
+            "recordings": [{"first_scene": 0, "start": RECORDING_START, "end": 12.0, "file": None}],
+            "events": [
+                {"type": "slide", "file": "slide_001.png", "time": 0.0, "scene": 0, "recording": 0},
+                {"type": "audio", "file": "voice_001.wav", "time": 0.5, "scene": 0, "recording": 0},
+                {"type": "slide", "file": "slide_002.png", "time": 4.2, "scene": 1, "recording": 0},
+            ],
+        }
+        with open(os.path.join(self.assets_dir, "recording_log.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.log, f)
+        self.scenario = {"scenes": []}
+
+    def tearDown(self):
+        shutil.rmtree(self.assets_dir, ignore_errors=True)
+
+    def test_slide_changes_match(self):
+        black_img = os.path.join(self.assets_dir, "black.png")
+        slide_events, _, total_duration = build_timeline(self.scenario, self.assets_dir)
+        # Offline: the OBS recording is read from its start (obs_offset 0)
+        offline = [(seg["image"], round(seg["start_frame"] / FPS, 6), seg["frames"])
+                   for seg in plan_segments(slide_events, total_duration, black_img, FPS)]
+
+        workspace = tempfile.mkdtemp(dir=self.assets_dir)
+        outputs = resolve_outputs(["landscape"], os.path.join(workspace, "out.mp4"), "libx264")
+        source = live_compositor.GrowingFileSource(os.path.join(self.assets_dir, "obs.mkv"), window=total_duration)
+        live = live_compositor.LiveCompositor("ffmpeg", self.scenario, self.assets_dir, source, outputs, workspace)
+        live.wait_for_recording(poll=0)
+        with mock.patch.object(live_compositor.subprocess, "run") as run:
+            live.render_chunk({"path": source.path, "offset": 0.0, "start": 0.0, "end": None}, self.log, total_duration)
+        live_segments = [(image if os.path.basename(image) != "black.png" else black_img, seek, frames)
+                         for image, seek, frames in _segment_calls(run.call_args_list)]
+
+        # First slide at log time 0 is one second into the recording
+        self.assertEqual(slide_events[0][0], -RECORDING_START)
+        self.assertEqual(live_segments, offline)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,14 +15,23 @@ def natural_sort_key(s):
     return [int(text) if text.isdigit() else text.lower()
             for text in re.split('([0-9]+)', s)]
 
-def generate_scenario(assets_dir, project_title="Real Asset Test"):
+def generate_scenario(assets_dir, project_title="Real Asset Test", lines=None, seed=None):
+    """
+    Writes scenario.json for the WAVs in assets_dir/voice.
+
+    Args:
+        lines (list): Script lines; read from assets_dir/script.txt when omitted.
+        seed (int): Seeds the motion tag choice for reproducible scenarios (benchmarks).
+    """
     script_path = os.path.join(assets_dir, "script.txt")
     voice_dir = os.path.join(assets_dir, "voice")
     output_path = os.path.join(assets_dir, "scenario.json")
+    rng = random.Random(seed)
 
     # Read Script
-    with open(script_path, 'r', encoding='utf-8') as f:
-        lines = [l.strip() for l in f if l.strip()]
+    if lines is None:
+        with open(script_path, 'r', encoding='utf-8') as f:
+            lines = [l.strip() for l in f if l.strip()]
 
     # List Audio Files
     audio_files = [f for f in os.listdir(voice_dir) if f.lower().endswith('.wav')]
@@ -47,7 +56,7 @@ def generate_scenario(assets_dir, project_title="Real Asset Test"):
         elif i == len(lines) - 1:
             tag = "greeting"
         else:
-            tag = random.choice(MOTION_TAGS)
+            tag = rng.choice(MOTION_TAGS)
 
         scene = {
             "id": scene_id,
@@ -69,6 +78,7 @@ def generate_scenario(assets_dir, project_title="Real Asset Test"):
         json.dump(scenario, f, indent=2, ensure_ascii=False)
     
     print(f"Generated scenario at {output_path} with {len(scenes)} scenes.")
+    return scenario
 
 if __name__ == "__main__":
     generate_scenario("assets_sample_1")
@@ -7,7 +7,7 @@ import os
 import sys
 from PIL import Image, ImageDraw, ImageFont
 
-def create_slides(output_dir, count=14):
+def create_slides(output_dir, count=14, size=(1920, 1080), quiet=False):
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -23,7 +23,7 @@ def create_slides(output_dir, count=14):
         path = os.path.join(output_dir, filename)
         
         # Create image
-        img = Image.new('RGB', (1920, 1080), color=(73, 109, 137))
+        img = Image.new('RGB', size, color=(73, 109, 137))
         d = ImageDraw.Draw(img)
         
         # Draw text
@@ -34,15 +34,17 @@ def create_slides(output_dir, count=14):
         # text_w = textbox[2] - textbox[0]
         # text_h = textbox[3] - textbox[1]
         
-        d.text((800, 500), text, fill=(255, 255, 255), font=font)
+        d.text((size[0] * 5 // 12, size[1] * 25 // 54), text, fill=(255, 255, 255), font=font)
         
         img.save(path)
-        print(f"Created {path}")
+        if not quiet:
+            print(f"Created {path}")
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
         out_dir = sys.argv[1]
     else:
         out_dir = "assets_sample_1/images"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 14
         
-    create_slides(out_dir)
+    create_slides(out_dir, count)
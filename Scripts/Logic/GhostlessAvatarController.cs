@@ -30,6 +30,7 @@ namespace Ghostless
 
         // VRM 1.0 Standard Expression Keys
         private Dictionary<string, ExpressionKey> _emotionMap;
+        private ExpressionKey[] _visemeKeys;
 
         private void Start()
         {
@@ -89,6 +90,16 @@ namespace Ghostless
                 { "fun", ExpressionKey.CreateFromPreset(ExpressionPreset.relaxed) }, 
                 { "surprise", ExpressionKey.CreateFromPreset(ExpressionPreset.surprised) }
             };
+
+            // Order of the /ghostless/control/mouth viseme values
+            _visemeKeys = new[]
+            {
+                ExpressionKey.CreateFromPreset(ExpressionPreset.aa),
+                ExpressionKey.CreateFromPreset(ExpressionPreset.ih),
+                ExpressionKey.CreateFromPreset(ExpressionPreset.ou),
+                ExpressionKey.CreateFromPreset(ExpressionPreset.ee),
+                ExpressionKey.CreateFromPreset(ExpressionPreset.oh)
+            };
         }
 
         // Use LateUpdate to override VRM animations
@@ -145,6 +156,20 @@ namespace Ghostless
             if (_motionController) _motionController.SetArousal(_arousal);
         }
 
+        /// <summary>
+        /// Applies one precomputed lip-sync frame (weights 0-1) from the Director.
+        /// </summary>
+        public void SetMouth(float aa, float ih, float ou, float ee, float oh)
+        {
+            if (_vrmInstance == null || _vrmInstance.Runtime == null || _visemeKeys == null) return;
+
+            float[] weights = { aa, ih, ou, ee, oh };
+            for (int i = 0; i < _visemeKeys.Length; i++)
+            {
+                _vrmInstance.Runtime.Expression.SetWeight(_visemeKeys[i], Mathf.Clamp01(weights[i]));
+            }
+        }
+
         public void SetSpeakingState(bool isSpeaking)
         {
             _isSpeaking = isSpeaking;
@@ -44,6 +44,7 @@ namespace Ghostless.Network
             // /ghostless/state/emotion (string or int ID)
             // /ghostless/state/arousal (float)
             // /ghostless/control/speech (int/bool - 1=Speaking, 0=Silent)
+            // /ghostless/control/mouth (6 floats - open, aa, ih, ou, ee, oh; streamed per frame during a line)
 
             switch (message.address)
             {
@@ -56,6 +57,9 @@ namespace Ghostless.Network
                 case "/ghostless/control/speech":
                     HandleSpeech(message.values[0]);
                     break;
+                case "/ghostless/control/mouth":
+                    HandleMouth(message.values);
+                    break;
                 // Keep legacy or debug hooks if needed, but aim for clean cut
             }
         }
@@ -91,6 +95,15 @@ namespace Ghostless.Network
             avatarController.SetSpeakingState(isSpeaking);
         }
 
+        private void HandleMouth(object[] values)
+        {
+            if (values.Length < 6) return;
+            // values[0] is the overall openness; the viseme weights already include it
+            avatarController.SetMouth(
+                ExtractFloat(values[1]), ExtractFloat(values[2]), ExtractFloat(values[3]),
+                ExtractFloat(values[4]), ExtractFloat(values[5]));
+        }
+
         private float ExtractFloat(object val)
         {
             if (val is float f) return f;